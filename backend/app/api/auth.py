@@ -112,7 +112,7 @@ def revoke_github_token(
     response_model=TokenResponse,
     response_model_by_alias=False,
 )
-async def refresh_access_token(
+def refresh_access_token(
     response: Response,
     refresh_token: str | None = Cookie(default=None),
     db: Database = Depends(get_db),
@@ -19,7 +19,7 @@ router = APIRouter()
 
 
 @router.get("/summary", response_model=DashboardSummaryResponse)
-async def get_dashboard_summary(
+def get_dashboard_summary(
     db: Database = Depends(get_db), current_user: dict = Depends(get_current_user)
 ):
     """Return aggregated dashboard metrics derived from repository metadata."""
@@ -28,7 +28,7 @@ async def get_dashboard_summary(
 
 
 @router.get("/recent-builds", response_model=list[BuildSummary])
-async def get_recent_builds(
+def get_recent_builds(
     limit: int = 10,
     db: Database = Depends(get_db),
     current_user: dict = Depends(get_current_user),
@@ -22,7 +22,7 @@ async def health_check():
 
 
 @router.get("/health/db")
-async def database_health(db: Database = Depends(get_db)):
+def database_health(db: Database = Depends(get_db)):
     """MongoDB health check."""
     try:
         db.command("ping")
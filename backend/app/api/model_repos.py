@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, Depends, Path, Query, status
@@ -65,12 +66,15 @@ def list_repositories(
     limit: int = Query(default=20, ge=1, le=100),
     q: str | None = Query(default=None, description="Search query"),
     status: str | None = Query(default=None, description="Filter by status"),
+    after: str | None = Query(
+        default=None, description="Cursor from the previous page's next_cursor (replaces skip)"
+    ),
     db: Database = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """List tracked repositories with RBAC access control."""
     service = RepositoryService(db)
-    return service.list_repositories(current_user, skip, limit, q, status)
+    return service.list_repositories(current_user, skip, limit, q, status, after)
 
 
 @router.get("/search", response_model=RepoSearchResponse)
@@ -402,8 +406,6 @@ def export_builds_stream(
         features=feature_list,
     )
 
-    from datetime import datetime
-
     media_type = "text/csv"
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"builds_{repo_id}_{timestamp}.csv"
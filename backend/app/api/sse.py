@@ -30,7 +30,7 @@ router = APIRouter(tags=["SSE"])
 REDIS_CHANNEL_PREFIX = "enrichment:progress:"
 
 
-async def get_sse_user(request: Request, db: Database = Depends(get_db)) -> dict:
+def get_sse_user(request: Request, db: Database = Depends(get_db)) -> dict:
     """
     Custom auth for SSE that reads cookie directly from Request.
     EventSource doesn't work well with FastAPI's Cookie() dependency.
@@ -113,8 +113,10 @@ async def sse_events_generator(
 
     allowed_config_ids = set()
     if accessible_raw_repo_ids:
-        configs = repo_config_repo.find_many(
-            {"raw_repo_id": {"$in": accessible_raw_repo_ids}}
+        # Blocking PyMongo call; keep it off the event loop
+        configs = await asyncio.to_thread(
+            repo_config_repo.find_many,
+            {"raw_repo_id": {"$in": accessible_raw_repo_ids}},
         )
         allowed_config_ids = {str(c.id) for c in configs}
 
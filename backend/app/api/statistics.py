@@ -26,7 +26,7 @@ router = APIRouter(
 
 
 @router.get("", response_model=VersionStatisticsResponse)
-async def get_scenario_statistics(
+def get_scenario_statistics(
     scenario_id: str,
     db=Depends(get_db),
     current_user: dict = Depends(RequirePermission(Permission.VIEW_DATASETS)),
@@ -46,7 +46,7 @@ async def get_scenario_statistics(
 
 
 @router.get("/distributions", response_model=FeatureDistributionResponse)
-async def get_feature_distributions(
+def get_feature_distributions(
     scenario_id: str,
     features: Optional[List[str]] = Query(
         None, description="Features to analyze (defaults to all selected)"
@@ -79,7 +79,7 @@ async def get_feature_distributions(
 
 
 @router.get("/correlation", response_model=CorrelationMatrixResponse)
-async def get_correlation_matrix(
+def get_correlation_matrix(
     scenario_id: str,
     features: Optional[List[str]] = Query(
         None, description="Numeric features to include (defaults to all numeric)"
@@ -108,7 +108,7 @@ async def get_correlation_matrix(
 
 
 @router.get("/scans", response_model=ScanMetricsStatisticsResponse)
-async def get_scan_metrics_statistics(
+def get_scan_metrics_statistics(
     scenario_id: str,
     db=Depends(get_db),
     current_user: dict = Depends(RequirePermission(Permission.VIEW_DATASETS)),
@@ -39,7 +39,7 @@ async def refresh_all_tokens(
 
 
 @router.get("/", response_model=TokenListResponse)
-async def list_tokens(
+def list_tokens(
     include_disabled: bool = False,
     current_user: dict = Depends(get_current_user),
     service: TokenService = Depends(get_token_service),
@@ -53,7 +53,7 @@ async def list_tokens(
 
 
 @router.get("/status", response_model=TokenPoolStatusResponse)
-async def get_pool_status(
+def get_pool_status(
     current_user: dict = Depends(get_current_user),
     service: TokenService = Depends(get_token_service),
 ):
@@ -63,7 +63,7 @@ async def get_pool_status(
 
 
 @router.post("/", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-async def create_token(
+def create_token(
     request: TokenCreateRequest,
     current_user: dict = Depends(get_current_user),
     service: TokenService = Depends(get_token_service),
@@ -81,7 +81,7 @@ async def create_token(
 
 
 @router.get("/{token_id}", response_model=TokenResponse)
-async def get_token(
+def get_token(
     token_id: str = Path(..., description="Token ID"),
     current_user: dict = Depends(get_current_user),
     service: TokenService = Depends(get_token_service),
@@ -92,7 +92,7 @@ async def get_token(
 
 
 @router.patch("/{token_id}", response_model=TokenResponse)
-async def update_token(
+def update_token(
     token_id: str = Path(..., description="Token ID"),
     request: TokenUpdateRequest = Body(...),
     current_user: dict = Depends(get_current_user),
@@ -108,7 +108,7 @@ async def update_token(
 
 
 @router.delete("/{token_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_token(
+def delete_token(
     token_id: str = Path(..., description="Token ID"),
     current_user: dict = Depends(get_current_user),
     service: TokenService = Depends(get_token_service),
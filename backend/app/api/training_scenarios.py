@@ -330,8 +330,6 @@ def download_all_splits(
 
     zip_buffer.seek(0)
 
-    from datetime import datetime
-
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     return StreamingResponse(
@@ -357,6 +355,9 @@ def get_ingestion_builds(
         None,
         description="Filter by status: pending, ingesting, ingested, missing_resource",
     ),
+    after: Optional[str] = Query(
+        None, description="Cursor from the previous page's next_cursor (replaces skip)"
+    ),
     current_user: User = Depends(get_current_user),  # noqa: B008
     db=Depends(get_db),  # noqa: B008
 ):
@@ -372,6 +373,7 @@ def get_ingestion_builds(
         skip=skip,
         limit=limit,
         status_filter=status,
+        after=after,
     )
 
 
@@ -384,6 +386,9 @@ def get_enrichment_builds(
         None,
         description="Filter by status: pending, completed, failed, partial",
     ),
+    after: Optional[str] = Query(
+        None, description="Cursor from the previous page's next_cursor (replaces skip)"
+    ),
     current_user: User = Depends(get_current_user),  # noqa: B008
     db=Depends(get_db),  # noqa: B008
 ):
@@ -399,6 +404,7 @@ def get_enrichment_builds(
         skip=skip,
         limit=limit,
         extraction_status=extraction_status,
+        after=after,
     )
 
 
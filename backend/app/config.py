@@ -13,6 +13,14 @@ class Settings(BaseSettings):
     # Database (MongoDB)
     MONGODB_URI: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "buildguard"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    # Fail fast instead of queueing indefinitely when every pooled connection is busy
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 2000
+    # Keep a few warm connections so bursts of scan workers skip the TCP/TLS handshake
+    MONGODB_MIN_POOL_SIZE: int = 10
+    MONGODB_MAX_IDLE_TIME_MS: int = 300_000
+    # zlib ships with Python; add zstd/snappy here once their driver extras are installed
+    MONGODB_COMPRESSORS: str = "zlib"
 
     # GitHub
     GITHUB_API_URL: str = "https://api.github.com"
@@ -94,6 +102,7 @@ class Settings(BaseSettings):
     # --- Scanning Phase (Trivy, SonarQube) ---
     SCAN_BUILDS_PER_QUERY: int = 200  # Builds fetched per paginated query
     SCAN_COMMITS_PER_BATCH: int = 5  # Commits dispatched per batch task
+    SCAN_RETENTION_DAYS: int = 0  # TTL for finished Sonar commit scans; 0 keeps them all
 
     # --- Rate Limiting (GitHub API) ---
     GITHUB_API_RATE_PER_SECOND: float = 100.0  # Sustained request rate
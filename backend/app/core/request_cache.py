@@ -0,0 +1,60 @@
+"""
+Request Cache - Per-request memoization for hot repository reads.
+
+A dict is bound to the current request via contextvars by
+RequestCacheMiddleware. Outside a request (Celery tasks, scripts) no dict is
+bound and cached functions always hit the database.
+"""
+
+from contextvars import ContextVar, Token
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_request_cache: ContextVar[Optional[Dict[Hashable, Any]]] = ContextVar(
+    "request_cache", default=None
+)
+
+
+class RequestCache:
+    """Per-request key/value store backed by a context variable."""
+
+    @staticmethod
+    def start() -> Token:
+        """Bind a fresh cache to the current context."""
+        return _request_cache.set({})
+
+    @staticmethod
+    def end(token: Token) -> None:
+        """Drop the cache bound by start()."""
+        _request_cache.reset(token)
+
+    @staticmethod
+    def invalidate(key: Hashable) -> None:
+        """Remove a key so the next read goes to the database."""
+        cache = _request_cache.get()
+        if cache is not None:
+            cache.pop(key, None)
+
+
+def request_cached(key: Callable[..., Hashable]) -> Callable:
+    """
+    Memoize a function for the lifetime of the current request.
+
+    Args:
+        key: Builds the cache key from the wrapped function's arguments
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = _request_cache.get()
+            if cache is None:
+                return func(*args, **kwargs)
+            cache_key = key(*args, **kwargs)
+            if cache_key not in cache:
+                cache[cache_key] = func(*args, **kwargs)
+            return cache[cache_key]
+
+        return wrapper
+
+    return decorator
@@ -24,10 +24,19 @@ def get_client() -> MongoClient:
         from app.config import settings
 
         uri = settings.MONGODB_URI
+        _client = MongoClient(
+            uri,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            compressors=settings.MONGODB_COMPRESSORS,
+        )
+        # Logged after assignment: MongoDBLogHandler shares this client and
+        # would otherwise re-enter get_client() while handling this record
         logger.warning(
             f"=== MONGODB DEBUG === Initializing MongoClient with URI: {uri}"
         )
-        _client = MongoClient(uri)
     return _client
 
 
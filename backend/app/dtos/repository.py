@@ -80,6 +80,7 @@ class RepoListResponse(BaseModel):
     skip: int
     limit: int
     items: List[RepoResponse]
+    next_cursor: Optional[str] = None
 
 
 class RepoSuggestion(BaseModel):
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Annotated, Any, Optional
 
 from bson import ObjectId
+from bson.errors import InvalidId
 from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
 
 
+@lru_cache(maxsize=4096)
+def parse_object_id(v: str) -> ObjectId | None:
+    """Parse a hex string into an ObjectId, None if invalid (memoized; ids repeat across rows)."""
+    try:
+        return ObjectId(v)
+    except (InvalidId, TypeError):
+        return None
+
+
 def validate_object_id(v: Any) -> ObjectId | None:
     """Validate and convert to ObjectId for entity models."""
     if v is None:
@@ -14,9 +25,9 @@ def validate_object_id(v: Any) -> ObjectId | None:
     if isinstance(v, ObjectId):
         return v
     if isinstance(v, str):
-        if not ObjectId.is_valid(v):
-            raise ValueError(f"Invalid ObjectId: {v}")
-        return ObjectId(v)
+        oid = parse_object_id(v)
+        if oid is not None:
+            return oid
     raise ValueError(f"Invalid ObjectId: {v}")
 
 
@@ -26,9 +37,7 @@ def validate_object_id_str(v: Any) -> str | None:
         return None
     if isinstance(v, ObjectId):
         return str(v)
-    if isinstance(v, str):
-        if not ObjectId.is_valid(v):
-            raise ValueError(f"Invalid ObjectId: {v}")
+    if isinstance(v, str) and parse_object_id(v) is not None:
         return v
     raise ValueError(f"Invalid ObjectId: {v}")
 
@@ -34,6 +34,11 @@ class SystemLog(BaseEntity):
         description="Source component/module that generated the log",
     )
 
+    source_lc: Optional[str] = Field(
+        default=None,
+        description="Lowercased source, written alongside it for indexed filtering",
+    )
+
     message: str = Field(
         default="",
         description="Log message content",
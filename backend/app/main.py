@@ -34,6 +34,7 @@ from app.middleware.exception_handlers import (
     http_exception_handler,
     validation_exception_handler,
 )
+from app.middleware.request_cache import RequestCacheMiddleware
 from app.middleware.request_logging import RequestLoggingMiddleware
 
 # Configure logging based on ENV environment variable
@@ -79,6 +80,9 @@ app.add_middleware(
 # Trace middleware for request logging and correlation
 app.add_middleware(RequestLoggingMiddleware)
 
+# Per-request memoization of hot repository reads
+app.add_middleware(RequestCacheMiddleware)
+
 # Register global exception handlers
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -0,0 +1,20 @@
+"""Bind a per-request read cache (see app.core.request_cache)."""
+
+from __future__ import annotations
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.request_cache import RequestCache
+
+
+class RequestCacheMiddleware(BaseHTTPMiddleware):
+    """Give each request its own empty cache and discard it afterwards."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:  # type: ignore[override]
+        token = RequestCache.start()
+        try:
+            return await call_next(request)
+        finally:
+            RequestCache.end(token)
@@ -2,24 +2,102 @@
 
 from __future__ import annotations
 
+import base64
+import logging
 from abc import ABC
 from contextlib import contextmanager
-from typing import Any, Dict, Generator, Generic, List, Optional, Type, TypeVar, Union
+from datetime import datetime
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from bson import ObjectId
 from bson.errors import InvalidId
 from pydantic import BaseModel
-from pymongo import MongoClient
+from pymongo import IndexModel, MongoClient, ReturnDocument
 from pymongo.client_session import ClientSession
 from pymongo.collection import Collection
 from pymongo.database import Database
+from pymongo.errors import ConnectionFailure
+
+from app.entities.base import parse_object_id
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+# Soft cap on $in list size per query (keeps filters well under the BSON limit)
+ID_BATCH_SIZE = 1000
+
+
+# (database, collection) -> names of the indexes ensured in this process
+_ensured_indexes: Dict[Tuple[str, str], Set[str]] = {}
+
+
+def create_indexes_once(collection: Collection, indexes: List[IndexModel]) -> None:
+    """
+    Create indexes for a collection the first time any repository asks.
+
+    Repositories are constructed per request/task; without this every
+    construction pays a createIndexes round-trip.
+
+    createIndexes is all-or-nothing, so if the batch is rejected (an index
+    that already exists with different options, a unique index over legacy
+    duplicates) each index is retried on its own and only the offending one
+    is skipped and logged. Connection failures are not remembered: the next
+    repository construction tries again.
+    """
+    key = (collection.database.name, collection.name)
+    if key in _ensured_indexes:
+        return
+    built: Set[str] = set()
+    try:
+        built.update(collection.create_indexes(indexes))
+    except ConnectionFailure as e:
+        logger.warning(f"Could not create indexes on {collection.name}, will retry: {e}")
+        return
+    except Exception:
+        for index in indexes:
+            name = index.document["name"]
+            try:
+                built.update(collection.create_indexes([index]))
+            except ConnectionFailure as e:
+                logger.warning(f"Could not create index {collection.name}.{name}, will retry: {e}")
+                return
+            except Exception as e:
+                logger.warning(f"Skipping index {collection.name}.{name}: {e}")
+    _ensured_indexes[key] = built
+
+
+def index_ensured(collection: Collection, name: str) -> bool:
+    """
+    Whether create_indexes_once built (or found) the named index.
+
+    Gate hints on this: hinting an index that failed to build makes the
+    query itself fail.
+    """
+    return name in _ensured_indexes.get((collection.database.name, collection.name), ())
+
 
 class BaseRepository(ABC, Generic[T]):
     """Base repository providing common CRUD operations for MongoDB collections"""
 
+    # Build models with model_construct (no validation) on reads. Only enable for
+    # flat entities: nested models and enums are left as raw dicts/strings.
+    TRUSTED_READ: bool = False
+
     def __init__(self, db: Database, collection_name: str, model_class: Type[T]):
         self.db = db
         self.collection: Collection = db[collection_name]
@@ -33,9 +111,20 @@ class BaseRepository(ABC, Generic[T]):
         doc = self.collection.find_one({"_id": identifier})
         return self._to_model(doc)
 
-    def find_one(self, query: Dict[str, Any]) -> Optional[T]:
-        """Find a single document matching the query"""
-        doc = self.collection.find_one(query)
+    def exists(self, entity_id: str | ObjectId) -> bool:
+        """Check a document exists by ID (covered by the _id index, no FETCH)"""
+        identifier = self._to_object_id(entity_id)
+        if identifier is None:
+            return False
+        return self.collection.find_one({"_id": identifier}, {"_id": 1}) is not None
+
+    def find_one(
+        self,
+        query: Dict[str, Any],
+        sort: Optional[List[tuple]] = None,
+    ) -> Optional[T]:
+        """Find a single document matching the query (first by sort if given)"""
+        doc = self.collection.find_one(query, sort=sort)
         return self._to_model(doc)
 
     def find_many(
@@ -44,16 +133,47 @@ class BaseRepository(ABC, Generic[T]):
         sort: Optional[List[tuple]] = None,
         skip: int = 0,
         limit: int = 0,
+        projection: Optional[Dict[str, Any]] = None,
+        hint: Optional[str] = None,
     ) -> List[T]:
         """Find multiple documents matching the query"""
-        cursor = self.collection.find(query)
+        return list(
+            self.iter_many(
+                query, sort=sort, skip=skip, limit=limit, projection=projection, hint=hint
+            )
+        )
+
+    def iter_many(
+        self,
+        query: Dict[str, Any],
+        sort: Optional[List[tuple]] = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = 500,
+        projection: Optional[Dict[str, Any]] = None,
+        hint: Optional[str] = None,
+    ) -> Iterator[T]:
+        """
+        Lazily yield models for documents matching the query.
+
+        Bounded pages are fetched in a single batch (batch_size is capped at
+        limit); models are only constructed as the caller consumes them.
+        A projection must keep every required field of the model; omitted
+        optional fields come back as their defaults. `hint` pins the query
+        to an index by name for hot paths where a plan flip would hurt.
+        """
+        cursor = self.collection.find(query, projection)
+        if hint:
+            cursor = cursor.hint(hint)
         if sort:
             cursor = cursor.sort(sort)
         if skip:
             cursor = cursor.skip(skip)
         if limit:
             cursor = cursor.limit(limit)
-        return [self._to_model(doc) for doc in cursor if doc]
+            batch_size = min(limit, batch_size)
+        cursor = cursor.batch_size(batch_size)
+        return (self._to_model(doc) for doc in cursor if doc)
 
     def paginate(
         self,
@@ -61,12 +181,131 @@ class BaseRepository(ABC, Generic[T]):
         sort: Optional[List[tuple]] = None,
         skip: int = 0,
         limit: int = 0,
+        hint: Optional[str] = None,
     ) -> tuple[List[T], int]:
         """Return paginated results plus total count for the query."""
-        items = self.find_many(query, sort=sort, skip=skip, limit=limit)
+        items = self.find_many(query, sort=sort, skip=skip, limit=limit, hint=hint)
         total = self.count(query)
         return items, total
 
+    def paginate_keyset(
+        self,
+        query: Dict[str, Any],
+        sort_field: str = "created_at",
+        direction: int = 1,
+        after: Optional[str] = None,
+        limit: int = 50,
+        hint: Optional[str] = None,
+    ) -> tuple[List[T], int]:
+        """
+        Return a page plus total count, seeking past a cursor instead of skipping.
+
+        Rows are ordered by (sort_field, _id). `after` is a cursor from
+        encode_cursor() for the last row of the previous page; the seek makes
+        deep pages as cheap as the first one, unlike skip() which walks every
+        preceding index entry. The total ignores the cursor. Every row must carry
+        sort_field: documents written before it was persisted need their
+        backfill script run first (e.g. scripts/backfill_build_run_created_at.py),
+        or encode_cursor() raises on them.
+
+        Raises:
+            ValueError: If `after` is not a valid cursor
+        """
+        page_query = query
+        if after:
+            value, last_id = self.decode_cursor(after)
+            op = "$gt" if direction > 0 else "$lt"
+            page_query = {
+                "$and": [
+                    query,
+                    {
+                        "$or": [
+                            {sort_field: {op: value}},
+                            {sort_field: value, "_id": {op: last_id}},
+                        ]
+                    },
+                ]
+            }
+
+        items = self.find_many(
+            page_query,
+            sort=[(sort_field, direction), ("_id", direction)],
+            limit=limit,
+            hint=hint,
+        )
+        return items, self.count(query)
+
+    @staticmethod
+    def encode_cursor(model: BaseModel, sort_field: str = "created_at") -> str:
+        """
+        Build an opaque keyset cursor from the last row of a page.
+
+        Raises:
+            ValueError: If the row has no value for sort_field
+        """
+        value: Optional[datetime] = getattr(model, sort_field, None)
+        if value is None:
+            raise ValueError(
+                f"Cannot build a pagination cursor: {sort_field} is missing on {model.id}"
+            )
+        raw = f"{value.isoformat()}|{model.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+        """Parse a cursor produced by encode_cursor()."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            value, last_id = raw.split("|", 1)
+            return datetime.fromisoformat(value), ObjectId(last_id)
+        except (ValueError, InvalidId, TypeError) as e:
+            raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+    def paginate_facet(
+        self,
+        query: Dict[str, Any],
+        sort: Optional[List[tuple]] = None,
+        skip: int = 0,
+        limit: int = 0,
+        hint: Optional[str] = None,
+    ) -> tuple[List[T], int]:
+        """
+        Return a page plus total count in a single round-trip using $facet.
+
+        $sort runs before $facet so it can still walk an index; sub-pipelines
+        inside $facet cannot use indexes. The facet comes back as one document
+        (16MB cap), so unbounded requests (limit=0) fall back to paginate().
+        """
+        if not limit:
+            return self.paginate(query, sort=sort, skip=skip, hint=hint)
+
+        pipeline: List[Dict[str, Any]] = [{"$match": query}]
+        if sort:
+            pipeline.append({"$sort": dict(sort)})
+
+        page_stages: List[Dict[str, Any]] = []
+        if skip:
+            page_stages.append({"$skip": skip})
+        page_stages.append({"$limit": limit})
+
+        pipeline.append(
+            {
+                "$facet": {
+                    "items": page_stages,
+                    "total": [{"$count": "count"}],
+                }
+            }
+        )
+
+        results = self.aggregate(pipeline, hint=hint)
+        if not results:
+            return [], 0
+
+        facet = results[0]
+        items = [self._to_model(doc) for doc in facet.get("items", [])]
+        total = facet["total"][0]["count"] if facet.get("total") else 0
+        return items, total
+
     def find_by_ids(
         self,
         entity_ids: List[str | ObjectId],
@@ -93,8 +332,25 @@ class BaseRepository(ABC, Generic[T]):
         if not oids:
             return []
 
-        cursor = self.collection.find({"_id": {"$in": oids}})
-        return [self._to_model(doc) for doc in cursor if doc]
+        results = []
+        for start in range(0, len(oids), ID_BATCH_SIZE):
+            chunk = oids[start : start + ID_BATCH_SIZE]
+            cursor = self.collection.find({"_id": {"$in": chunk}})
+            results.extend(self._to_model(doc) for doc in cursor if doc)
+        return results
+
+    def find_map_by_ids(
+        self,
+        entity_ids: Iterable[str | ObjectId],
+    ) -> Dict[ObjectId, T]:
+        """
+        Load documents by ID into an {ObjectId: model} map.
+
+        Use instead of calling find_by_id in a loop; IDs are deduplicated and
+        fetched with one $in query per ID_BATCH_SIZE IDs.
+        """
+        unique_ids = list(dict.fromkeys(entity_ids))
+        return {model.id: model for model in self.find_by_ids(unique_ids)}
 
     def insert_one(self, document: Union[T, Dict[str, Any]]) -> T:
         """Insert a single document"""
@@ -104,6 +360,10 @@ class BaseRepository(ABC, Generic[T]):
             doc_dict = document
 
         result = self.collection.insert_one(doc_dict)
+        if isinstance(document, self.model_class):
+            # Already validated: attach the new id rather than re-parsing the dump.
+            # Deep copy so the caller's object and the result share no nested state.
+            return document.model_copy(update={"id": result.inserted_id}, deep=True)
         doc_dict["_id"] = result.inserted_id
         return self._to_model(doc_dict)
 
@@ -123,6 +383,11 @@ class BaseRepository(ABC, Generic[T]):
 
         models = []
         for i, doc_dict in enumerate(doc_dicts):
+            if isinstance(documents[i], self.model_class):
+                models.append(
+                    documents[i].model_copy(update={"id": result.inserted_ids[i]}, deep=True)
+                )
+                continue
             doc_dict["_id"] = result.inserted_ids[i]
             models.append(self._to_model(doc_dict))
 
@@ -144,8 +409,35 @@ class BaseRepository(ABC, Generic[T]):
         identifier = self._to_object_id(entity_id)
         if identifier is None:
             return None
-        self.collection.update_one({"_id": identifier}, {"$set": updates}, session=session)
-        return self.find_by_id(identifier)
+        doc = self.collection.find_one_and_update(
+            {"_id": identifier},
+            {"$set": updates},
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        return self._to_model(doc)
+
+    def update_by_id(
+        self,
+        entity_id: str | ObjectId,
+        updates: Dict[str, Any],
+        session: Optional[ClientSession] = None,
+    ) -> bool:
+        """Update a document by ID without reading it back.
+
+        Prefer this over update_one when the caller ignores the returned entity;
+        it skips shipping the full document back and rebuilding the model.
+
+        Returns:
+            True if a document matched the ID
+        """
+        identifier = self._to_object_id(entity_id)
+        if identifier is None:
+            return False
+        result = self.collection.update_one(
+            {"_id": identifier}, {"$set": updates}, session=session
+        )
+        return result.matched_count > 0
 
     def update_many(
         self,
@@ -194,16 +486,50 @@ class BaseRepository(ABC, Generic[T]):
         result = self.collection.delete_many(query, session=session)
         return result.deleted_count
 
-    def count(self, query: Dict[str, Any] = None) -> int:
-        """Count documents matching the query"""
-        if query is None:
+    def count(self, query: Dict[str, Any] = None, approximate: bool = False) -> int:
+        """Count documents matching the query
+
+        Args:
+            query: Filter to match documents
+            approximate: For an empty filter, read the count from collection
+                metadata instead of scanning (may drift after unclean shutdown)
+        """
+        if not query:
+            if approximate:
+                return self.collection.estimated_document_count()
             query = {}
         return self.collection.count_documents(query)
 
-    def aggregate(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Execute an aggregation pipeline"""
+    def aggregate(
+        self, pipeline: List[Dict[str, Any]], hint: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Execute an aggregation pipeline, optionally pinned to an index by name"""
+        if hint:
+            return list(self.collection.aggregate(pipeline, hint=hint))
         return list(self.collection.aggregate(pipeline))
 
+    def count_by_field(
+        self,
+        match: Dict[str, Any],
+        field: str,
+        hint: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Count documents matching `match`, grouped by the value of `field`.
+
+        The server folds the groups into a single {value: count} document
+        ($arrayToObject), so one small reply comes back however many groups
+        there are. `field` values must be non-null strings.
+        """
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$group": {"_id": None, "pairs": {"$push": {"k": "$_id", "v": "$count"}}}},
+            {"$replaceRoot": {"newRoot": {"$arrayToObject": "$pairs"}}},
+        ]
+        results = self.aggregate(pipeline, hint=hint)
+        return results[0] if results else {}
+
     def find_one_and_update(
         self,
         query: Dict[str, Any],
@@ -223,8 +549,6 @@ class BaseRepository(ABC, Generic[T]):
         Returns:
             The document (updated or original based on return_updated)
         """
-        from pymongo import ReturnDocument
-
         doc = self.collection.find_one_and_update(
             query,
             update,
@@ -288,8 +612,6 @@ class BaseRepository(ABC, Generic[T]):
         Returns:
             The upserted/updated document as model
         """
-        from pymongo import ReturnDocument
-
         # Merge query fields into data for insert case
         update_data = {**query, **data}
         doc = self.collection.find_one_and_update(
@@ -304,8 +626,14 @@ class BaseRepository(ABC, Generic[T]):
         """Convert a dictionary to a model instance"""
         if not doc:
             return None
+        if self.TRUSTED_READ:
+            return self.model_class.model_construct(**doc)
         return self.model_class.model_validate(doc)
 
+    def _hint(self, index_name: str) -> Optional[str]:
+        """`index_name` if create_indexes_once built it, else None (planner's choice)."""
+        return index_name if index_ensured(self.collection, index_name) else None
+
     @staticmethod
     def _to_object_id(value: str | ObjectId | None) -> ObjectId | None:
         """Convert a string ID to ObjectId"""
@@ -314,10 +642,7 @@ class BaseRepository(ABC, Generic[T]):
         if isinstance(value, ObjectId):
             return value
         if isinstance(value, str):
-            try:
-                return ObjectId(value)
-            except (InvalidId, TypeError):
-                return None
+            return parse_object_id(value)
         return None
 
     @staticmethod
@@ -341,8 +666,9 @@ class BaseRepository(ABC, Generic[T]):
         if isinstance(value, ObjectId):
             return value
         if isinstance(value, str):
-            if ObjectId.is_valid(value):
-                return ObjectId(value)
+            oid = parse_object_id(value)
+            if oid is not None:
+                return oid
             raise ValueError(f"Invalid ObjectId string: {value}")
         raise TypeError(f"Expected str or ObjectId, got {type(value).__name__}")
 
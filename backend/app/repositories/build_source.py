@@ -30,13 +30,13 @@ class BuildSourceRepository(BaseRepository[BuildSource]):
                 {"file_name": {"$regex": q, "$options": "i"}},
             ]
 
-        return self.paginate(
+        return self.paginate_facet(
             query,
             sort=[("updated_at", -1), ("created_at", -1)],
             skip=skip,
             limit=limit,
         )
 
-    def count_all(self) -> int:
-        """Count all build sources."""
-        return self.collection.count_documents({})
+    def count_all(self, approximate: bool = False) -> int:
+        """Count all build sources (approximate reads collection metadata)."""
+        return self.count(approximate=approximate)
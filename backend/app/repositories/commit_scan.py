@@ -0,0 +1,189 @@
+"""
+CommitScan Repository - shared base for per-commit scan records.
+
+SonarQube and Trivy both keep one document per (scenario, commit) with the same
+lifecycle: pending -> scanning -> completed | failed, and retries reset it to
+pending. The lifecycle and scenario queries live here; the tool repositories
+add their own lookups and build the entity for create_or_get_for_scenario.
+"""
+
+from datetime import datetime, timezone
+from enum import Enum
+from typing import ClassVar, List, Optional, Type
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.repositories.base import BaseRepository, T
+
+# Per-scan payloads that scan listings never render
+LIST_PROJECTION = {"metrics": 0, "scan_config": 0, "selected_metrics": 0}
+
+
+class CommitScanRepository(BaseRepository[T]):
+    """Lifecycle and scenario queries shared by the commit-scan repositories."""
+
+    # Status enum of the entity (PENDING / SCANNING / COMPLETED / FAILED)
+    status_enum: ClassVar[Type[Enum]]
+
+    @staticmethod
+    def _scan_indexes() -> List[IndexModel]:
+        """Indexes every commit-scan collection needs."""
+        return [
+            # find_by_scenario_and_commit; unique so concurrent
+            # create_or_get_for_scenario upserts can't both insert
+            IndexModel(
+                [("scenario_id", ASCENDING), ("commit_sha", ASCENDING)],
+                unique=True,
+                name="scenario_commit_unique",
+            ),
+            # list_by_scenario / count_by_scenario_and_status / get_failed_by_scenario
+            IndexModel(
+                [
+                    ("scenario_id", ASCENDING),
+                    ("status", ASCENDING),
+                    ("created_at", DESCENDING),
+                ],
+                name="scenario_status_created",
+            ),
+        ]
+
+    def mark_scanning(self, scan_id: ObjectId) -> None:
+        """Mark scan as in progress."""
+        self.collection.update_one(
+            {"_id": scan_id},
+            {
+                "$set": {
+                    "status": self.status_enum.SCANNING.value,
+                    "started_at": datetime.now(timezone.utc),
+                }
+            },
+        )
+
+    def mark_completed(
+        self,
+        scan_id: ObjectId,
+        metrics: dict,
+        builds_affected: int = 0,
+    ) -> None:
+        """Mark scan as completed with results."""
+        self.collection.update_one(
+            {"_id": scan_id},
+            {
+                "$set": {
+                    "status": self.status_enum.COMPLETED.value,
+                    "metrics": metrics,
+                    "builds_affected": builds_affected,
+                    "completed_at": datetime.now(timezone.utc),
+                    "error_message": None,
+                }
+            },
+        )
+
+    def mark_failed(self, scan_id: ObjectId, error_message: str) -> None:
+        """Mark scan as failed."""
+        self.collection.update_one(
+            {"_id": scan_id},
+            {
+                "$set": {
+                    "status": self.status_enum.FAILED.value,
+                    "error_message": error_message,
+                    "completed_at": datetime.now(timezone.utc),
+                }
+            },
+        )
+
+    def increment_retry(self, scan_id: ObjectId) -> None:
+        """Increment retry count and reset to pending."""
+        self.collection.update_one(
+            {"_id": scan_id},
+            {
+                "$inc": {"retry_count": 1},
+                "$set": {
+                    "status": self.status_enum.PENDING.value,
+                    "error_message": None,
+                    "started_at": None,
+                    "completed_at": None,
+                },
+            },
+        )
+
+    # ========================================================================
+    # Scenario-based methods (Training Scenario flow)
+    # ========================================================================
+
+    def list_by_scenario(
+        self,
+        scenario_id: ObjectId,
+        skip: int = 0,
+        limit: int = 10,
+        status: Optional[Enum] = None,
+    ) -> tuple[List[T], int]:
+        """
+        List scans for a scenario with pagination. Returns (items, total).
+
+        Items leave out the metrics/config payloads (LIST_PROJECTION).
+        """
+        query = {"scenario_id": scenario_id}
+        if status:
+            query["status"] = status.value
+        total = self.collection.count_documents(query)
+        items = self.find_many(
+            query, sort=[("created_at", -1)], skip=skip, limit=limit, projection=LIST_PROJECTION
+        )
+        return items, total
+
+    def count_by_scenario(self, scenario_id: ObjectId) -> int:
+        """Count all scans for a scenario."""
+        return self.collection.count_documents({"scenario_id": scenario_id})
+
+    def count_by_scenario_and_status(self, scenario_id: ObjectId, status: Enum) -> int:
+        """Count scans for a scenario filtered by status."""
+        return self.collection.count_documents(
+            {
+                "scenario_id": scenario_id,
+                "status": status.value,
+            }
+        )
+
+    def find_by_scenario_and_commit(
+        self,
+        scenario_id: ObjectId,
+        commit_sha: str,
+    ) -> Optional[T]:
+        """Find scan for specific scenario + commit."""
+        return self.find_one(
+            {
+                "scenario_id": scenario_id,
+                "commit_sha": commit_sha,
+            }
+        )
+
+    def _create_or_get(self, scan: T) -> T:
+        """
+        Insert `scan` for its (scenario, commit) or return the existing record.
+
+        Single atomic upsert: $setOnInsert only writes on the first call, and the
+        unique (scenario_id, commit_sha) index lets the server retry a racing
+        insert as an update, so concurrent callers get the same record back.
+        """
+        return self.find_one_and_update(
+            {"scenario_id": scan.scenario_id, "commit_sha": scan.commit_sha},
+            {"$setOnInsert": scan.to_mongo()},
+            upsert=True,
+        )
+
+    def get_failed_by_scenario(self, scenario_id: ObjectId) -> List[T]:
+        """Get all failed scans for a scenario."""
+        return self.find_many(
+            {
+                "scenario_id": scenario_id,
+                "status": self.status_enum.FAILED.value,
+            }
+        )
+
+    def delete_by_scenario(self, scenario_id: ObjectId | str, session=None) -> int:
+        """Delete all scans for a scenario."""
+        return self.delete_many(
+            {"scenario_id": self.ensure_object_id(scenario_id)}, session=session
+        )
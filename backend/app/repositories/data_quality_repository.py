@@ -2,13 +2,19 @@
 Data Quality Repository - Database operations for quality evaluation reports.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
-from app.entities.data_quality import DataQualityReport
+from app.core.request_cache import RequestCache, request_cached
+from app.entities.data_quality import DataQualityReport, QualityEvaluationStatus
 
-from .base import BaseRepository
+from .base import BaseRepository, create_indexes_once
+
+ACTIVE_STATUSES = [
+    QualityEvaluationStatus.PENDING.value,
+    QualityEvaluationStatus.RUNNING.value,
+]
 
 
 class DataQualityRepository(BaseRepository[DataQualityReport]):
@@ -16,11 +22,44 @@ class DataQualityRepository(BaseRepository[DataQualityReport]):
 
     def __init__(self, db):
         super().__init__(db, "data_quality_reports", DataQualityReport)
-
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # Latest report per scenario
+            IndexModel(
+                [("scenario_id", ASCENDING), ("created_at", DESCENDING)],
+                name="scenario_latest",
+            ),
+            # Pending/running evaluation check; only active reports are indexed
+            IndexModel(
+                [("scenario_id", ASCENDING)],
+                name="active_by_scenario",
+                partialFilterExpression={"status": {"$in": ACTIVE_STATUSES}},
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
+
+    @staticmethod
+    def _latest_cache_key(scenario_id) -> tuple:
+        return ("quality_latest", str(scenario_id))
+
+    def insert_one(
+        self, document: Union[DataQualityReport, Dict[str, Any]]
+    ) -> DataQualityReport:
+        """Insert a report and drop the cached latest report for its scenario."""
+        created = super().insert_one(document)
+        RequestCache.invalidate(self._latest_cache_key(created.scenario_id))
+        return created
+
+    @request_cached(key=lambda self, scenario_id: self._latest_cache_key(scenario_id))
     def find_by_scenario(self, scenario_id: str) -> Optional[DataQualityReport]:
         """
         Get the latest quality report for a scenario.
 
+        Memoized per HTTP request; inserts and deletes invalidate the entry.
+
         Args:
             scenario_id: Scenario ID
 
@@ -29,6 +68,7 @@ class DataQualityRepository(BaseRepository[DataQualityReport]):
         """
         return self.find_one(
             {"scenario_id": self._to_object_id(scenario_id)},
+            sort=[("created_at", DESCENDING)],
         )
 
     def delete_by_scenario(self, scenario_id: str, session=None) -> int:
@@ -43,9 +83,10 @@ class DataQualityRepository(BaseRepository[DataQualityReport]):
             Number of deleted documents
         """
         result = self.collection.delete_many(
-            {"scenario_id": ObjectId(scenario_id)},
+            {"scenario_id": self.ensure_object_id(scenario_id)},
             session=session,
         )
+        RequestCache.invalidate(self._latest_cache_key(scenario_id))
         return result.deleted_count
 
     def find_pending_or_running(self, scenario_id: str) -> Optional[DataQualityReport]:
@@ -61,6 +102,6 @@ class DataQualityRepository(BaseRepository[DataQualityReport]):
         return self.find_one(
             {
                 "scenario_id": self._to_object_id(scenario_id),
-                "status": {"$in": ["pending", "running"]},
+                "status": {"$in": ACTIVE_STATUSES},
             }
         )
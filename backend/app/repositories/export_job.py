@@ -2,23 +2,45 @@ from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, WriteConcern
 from pymongo.database import Database
 
-from app.entities.export_job import ExportJob
+from app.entities.export_job import ExportJob, ExportStatus
+from app.repositories.base import create_indexes_once
 
 
 class ExportJobRepository:
     """Repository for ExportJob entities."""
 
+    RETENTION_DAYS = 7
+
     def __init__(self, db: Database):
         self.db = db
         self.collection = db.export_jobs
+        # Unacknowledged handle for best-effort progress ticks
+        self._collection_w0 = self.collection.with_options(
+            write_concern=WriteConcern(w=0)
+        )
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # TTL: MongoDB removes jobs RETENTION_DAYS after creation
+            IndexModel(
+                [("created_at", ASCENDING)],
+                name="created_at_ttl",
+                expireAfterSeconds=self.RETENTION_DAYS * 24 * 3600,
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def create(self, job: ExportJob) -> ExportJob:
         """Create a new export job."""
+        now = datetime.now(timezone.utc)
         doc = job.model_dump(by_alias=True, exclude={"id"})
-        doc["created_at"] = datetime.now(timezone.utc)
-        doc["updated_at"] = datetime.now(timezone.utc)
+        doc["created_at"] = now
+        doc["updated_at"] = now
         result = self.collection.insert_one(doc)
         job.id = result.inserted_id
         return job
@@ -38,14 +60,19 @@ class ExportJobRepository:
         self.collection.update_one({"_id": ObjectId(job_id)}, {"$set": updates})
 
     def update_progress(self, job_id: str, processed_rows: int) -> None:
-        """Update processed row count."""
-        self.collection.update_one(
-            {"_id": ObjectId(job_id)},
+        """
+        Update processed row count (fire-and-forget, w=0).
+
+        Progress ticks are cosmetic and superseded by the final update_status,
+        so a lost write is acceptable. Unacknowledged writes may also land out
+        of order: $max keeps the count monotonic and the status filter stops a
+        late tick from touching a finished job. Status changes stay acknowledged.
+        """
+        self._collection_w0.update_one(
+            {"_id": ObjectId(job_id), "status": ExportStatus.PROCESSING.value},
             {
-                "$set": {
-                    "processed_rows": processed_rows,
-                    "updated_at": datetime.now(timezone.utc),
-                }
+                "$max": {"processed_rows": processed_rows},
+                "$set": {"updated_at": datetime.now(timezone.utc)},
             },
         )
 
@@ -67,8 +94,12 @@ class ExportJobRepository:
         )
         return [ExportJob(**doc) for doc in cursor]
 
-    def delete_old_jobs(self, days: int = 7) -> int:
-        """Delete export jobs older than specified days."""
+    def delete_old_jobs(self, days: int = RETENTION_DAYS) -> int:
+        """Delete export jobs older than specified days.
+
+        Jobs older than RETENTION_DAYS are already expired by the TTL index,
+        so the weekly cleanup task normally finds nothing to delete here.
+        """
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
         result = self.collection.delete_many({"created_at": {"$lt": cutoff}})
         return result.deleted_count
@@ -7,9 +7,9 @@ from bson import ObjectId
 from pymongo import ASCENDING, IndexModel, ReturnDocument
 from pymongo.collection import Collection
 
-from app.entities.enums import ExtractionStatus
+from app.entities.enums import ExtractionStatus, FeatureVectorScope
 from app.entities.feature_vector import FeatureVector
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, create_indexes_once
 
 
 class FeatureVectorRepository(BaseRepository[FeatureVector]):
@@ -44,11 +44,7 @@ class FeatureVectorRepository(BaseRepository[FeatureVector]):
                 name="build_run_lookup",
             ),
         ]
-        try:
-            self.collection.create_indexes(indexes)
-        except Exception:
-            # Indexes may already exist with different options
-            pass
+        create_indexes_once(self.collection, indexes)
 
     def find_by_repo_and_build(
         self,
@@ -100,6 +96,7 @@ class FeatureVectorRepository(BaseRepository[FeatureVector]):
         if config_id:
             query["config_id"] = config_id
 
+        now = datetime.utcnow()
         update_doc = {
             "features": features,
             "feature_count": len(features) if features else 0,
@@ -110,15 +107,15 @@ class FeatureVectorRepository(BaseRepository[FeatureVector]):
             "is_missing_commit": is_missing_commit,
             "missing_resources": missing_resources or [],
             "skipped_features": skipped_features or [],
-            "computed_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
+            "computed_at": now,
+            "updated_at": now,
         }
 
         # On Insert fields
         insert_doc = {
             "raw_repo_id": raw_repo_id,
             "raw_build_run_id": raw_build_run_id,
-            "created_at": datetime.utcnow(),
+            "created_at": now,
         }
         if scope:
             insert_doc["scope"] = scope
@@ -264,8 +261,6 @@ class FeatureVectorRepository(BaseRepository[FeatureVector]):
         """
         Delete all feature vectors scoped to a specific ML scenario.
         """
-        from app.entities.enums import FeatureVectorScope
-
         result = self.collection.delete_many(
             {
                 "scope": FeatureVectorScope.DATASET.value,
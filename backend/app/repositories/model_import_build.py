@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import TYPE_CHECKING, List, Optional
+from typing import List, Optional
 
 from bson import ObjectId
 from pymongo import ReturnDocument
@@ -14,8 +14,11 @@ from app.entities.model_import_build import (
 )
 from app.repositories.base import BaseRepository
 
-if TYPE_CHECKING:
-    pass
+# Ingested builds that can move on to processing (missing resources included)
+PROCESSABLE_STATUSES = [
+    ModelImportBuildStatus.INGESTED.value,
+    ModelImportBuildStatus.MISSING_RESOURCE.value,
+]
 
 
 class ModelImportBuildRepository(BaseRepository[ModelImportBuild]):
@@ -70,12 +73,7 @@ class ModelImportBuildRepository(BaseRepository[ModelImportBuild]):
 
         # Include both INGESTED and FAILED if requested (graceful failure handling)
         if include_failed:
-            query["status"] = {
-                "$in": [
-                    ModelImportBuildStatus.INGESTED.value,
-                    ModelImportBuildStatus.MISSING_RESOURCE.value,
-                ]
-            }
+            query["status"] = {"$in": PROCESSABLE_STATUSES}
         else:
             query["status"] = ModelImportBuildStatus.INGESTED.value
 
@@ -168,12 +166,7 @@ class ModelImportBuildRepository(BaseRepository[ModelImportBuild]):
         """
         query = {
             "model_repo_config_id": ObjectId(config_id),
-            "status": {
-                "$in": [
-                    ModelImportBuildStatus.INGESTED.value,
-                    ModelImportBuildStatus.MISSING_RESOURCE.value,
-                ]
-            },
+            "status": {"$in": PROCESSABLE_STATUSES},
         }
         if checkpoint_id:
             query["_id"] = {"$gt": checkpoint_id}
@@ -345,7 +338,7 @@ class ModelImportBuildRepository(BaseRepository[ModelImportBuild]):
         if not raw_build_run_ids:
             return []
 
-        oids = [ObjectId(rid) for rid in raw_build_run_ids if ObjectId.is_valid(rid)]
+        oids = [oid for oid in map(self._to_object_id, raw_build_run_ids) if oid is not None]
         if not oids:
             return []
 
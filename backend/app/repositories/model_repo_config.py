@@ -6,10 +6,14 @@ from datetime import datetime
 from typing import List, Optional
 
 from bson import ObjectId
+from pymongo import DESCENDING, IndexModel
 from pymongo.client_session import ClientSession
 
 from app.entities.model_repo_config import ModelImportStatus, ModelRepoConfig
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, create_indexes_once
+
+# Statuses that end a sync and stamp completed_at
+TERMINAL_STATUSES = [ModelImportStatus.PROCESSED.value, ModelImportStatus.FAILED.value]
 
 
 class ModelRepoConfigRepository(BaseRepository[ModelRepoConfig]):
@@ -17,6 +21,18 @@ class ModelRepoConfigRepository(BaseRepository[ModelRepoConfig]):
 
     def __init__(self, db) -> None:
         super().__init__(db, "model_repo_configs", ModelRepoConfig)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # list_with_access_control: newest first with an _id tiebreak (keyset)
+            IndexModel(
+                [("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="created_desc",
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def list_with_access_control(
         self,
@@ -27,8 +43,13 @@ class ModelRepoConfigRepository(BaseRepository[ModelRepoConfig]):
         search_query: Optional[str] = None,
         status_filter: Optional[str] = None,
         github_accessible_repos: Optional[List[str]] = None,
+        after: Optional[str] = None,
     ) -> tuple[List[ModelRepoConfig], int]:
-        """List repos with RBAC access control based on GitHub membership."""
+        """
+        List repos with RBAC access control based on GitHub membership.
+
+        Pass the previous page's cursor as `after` to seek instead of skip.
+        """
         base_query: dict = {}
 
         if search_query:
@@ -45,8 +66,11 @@ class ModelRepoConfigRepository(BaseRepository[ModelRepoConfig]):
             else:
                 base_query["full_name"] = {"$in": []}
 
-        return self.paginate(
-            base_query, sort=[("created_at", -1)], skip=skip, limit=limit
+        if after:
+            return self.paginate_keyset(base_query, direction=-1, after=after, limit=limit)
+
+        return self.paginate_facet(
+            base_query, sort=[("created_at", -1), ("_id", -1)], skip=skip, limit=limit
         )
 
     def can_user_access(
@@ -75,8 +99,10 @@ class ModelRepoConfigRepository(BaseRepository[ModelRepoConfig]):
         updates: dict,
     ) -> None:
         """Update a repository config by ID."""
-        updates["updated_at"] = datetime.utcnow()
-        self.collection.update_one({"_id": ObjectId(repo_id)}, {"$set": updates})
+        self.collection.update_one(
+            {"_id": self.ensure_object_id(repo_id)},
+            {"$set": {**updates, "updated_at": datetime.utcnow()}},
+        )
 
     def find_by_id(self, config_id: str | ObjectId) -> Optional[ModelRepoConfig]:
         """Find config by ID."""
@@ -99,86 +125,109 @@ class ModelRepoConfigRepository(BaseRepository[ModelRepoConfig]):
         status: ModelImportStatus,
         error: Optional[str] = None,
     ) -> None:
-        """Update pipeline status for a config."""
+        """
+        Update pipeline status for a config.
+
+        completed_at/last_synced_at are resolved server-side: they are stamped
+        on the first transition into a terminal status and kept as-is when an
+        already finished config is marked finished again.
+        """
+        now = datetime.utcnow()
+        status_value = status.value if hasattr(status, "value") else status
+
+        def stamp_once(field: str) -> dict:
+            return {
+                "$cond": [
+                    {"$in": ["$status", TERMINAL_STATUSES]},
+                    f"${field}",
+                    {"$cond": [{"$in": [status_value, TERMINAL_STATUSES]}, now, f"${field}"]},
+                ]
+            }
+
         update = {
-            "status": status.value if hasattr(status, "value") else status,
-            "updated_at": datetime.utcnow(),
+            "status": status_value,
+            "updated_at": now,
+            "completed_at": stamp_once("completed_at"),
+            "last_synced_at": stamp_once("last_synced_at"),
         }
         if status == ModelImportStatus.INGESTING:
-            update["started_at"] = datetime.utcnow()
-        elif status in (ModelImportStatus.PROCESSED, ModelImportStatus.FAILED):
-            update["completed_at"] = datetime.utcnow()
-            update["last_synced_at"] = datetime.utcnow()
+            update["started_at"] = now
         if error:
-            update["error_message"] = error
+            update["error_message"] = {"$literal": error}
 
         self.collection.update_one(
-            {"_id": self.ensure_object_id(config_id)}, {"$set": update}
+            {"_id": self.ensure_object_id(config_id)}, [{"$set": update}]
         )
 
-    def increment_builds_fetched(
-        self,
-        config_id: ObjectId,
-        count: int = 1,
-    ) -> Optional[ModelRepoConfig]:
-        """Increment the builds fetched count."""
-        doc = self.collection.find_one_and_update(
+    def _increment(self, config_id: ObjectId, field: str, count: int) -> bool:
+        """Atomically add count to a counter field (no document round-trip)."""
+        result = self.collection.update_one(
             {"_id": config_id},
             {
-                "$inc": {"builds_fetched": count},
+                "$inc": {field: count},
                 "$set": {"updated_at": datetime.utcnow()},
             },
-            return_document=True,
         )
-        return ModelRepoConfig(**doc) if doc else None
+        return result.modified_count > 0
+
+    def increment_counters(
+        self,
+        config_id: ObjectId,
+        *,
+        builds_fetched: int = 0,
+        builds_completed: int = 0,
+        builds_processing_failed: int = 0,
+    ) -> bool:
+        """
+        Apply several counter deltas (negative to decrement) in a single $inc.
+
+        Zero deltas are skipped; returns False without a write if all are zero.
+        """
+        deltas = {
+            "builds_fetched": builds_fetched,
+            "builds_completed": builds_completed,
+            "builds_processing_failed": builds_processing_failed,
+        }
+        inc = {field: delta for field, delta in deltas.items() if delta}
+        if not inc:
+            return False
+        result = self.collection.update_one(
+            {"_id": config_id},
+            {"$inc": inc, "$set": {"updated_at": datetime.utcnow()}},
+        )
+        return result.modified_count > 0
+
+    def increment_builds_fetched(
+        self,
+        config_id: ObjectId,
+        count: int = 1,
+    ) -> bool:
+        """Increment the builds fetched count."""
+        return self._increment(config_id, "builds_fetched", count)
 
     def increment_builds_completed(
         self,
         config_id: ObjectId,
         count: int = 1,
-    ) -> Optional[ModelRepoConfig]:
+    ) -> bool:
         """Increment the builds completed count (after prediction)."""
-        doc = self.collection.find_one_and_update(
-            {"_id": config_id},
-            {
-                "$inc": {"builds_completed": count},
-                "$set": {"updated_at": datetime.utcnow()},
-            },
-            return_document=True,
-        )
-        return ModelRepoConfig(**doc) if doc else None
+        return self._increment(config_id, "builds_completed", count)
 
     def increment_builds_processing_failed(
         self,
         config_id: ObjectId,
         count: int = 1,
-    ) -> Optional[ModelRepoConfig]:
+    ) -> bool:
         """Increment the builds processing failed count."""
-        doc = self.collection.find_one_and_update(
-            {"_id": config_id},
-            {
-                "$inc": {"builds_processing_failed": count},
-                "$set": {"updated_at": datetime.utcnow()},
-            },
-            return_document=True,
-        )
-        return ModelRepoConfig(**doc) if doc else None
+        return self._increment(config_id, "builds_processing_failed", count)
 
     def decrement_builds_processing_failed(
         self,
         config_id: ObjectId,
         count: int = 1,
-    ) -> Optional[ModelRepoConfig]:
+    ) -> bool:
         """Decrement builds_processing_failed when retry succeeds."""
-        doc = self.collection.find_one_and_update(
-            {"_id": config_id},
-            {
-                "$inc": {"builds_processing_failed": -count},
-                "$set": {"updated_at": datetime.utcnow()},
-            },
-            return_document=True,
-        )
-        return ModelRepoConfig(**doc) if doc else None
+        return self._increment(config_id, "builds_processing_failed", -count)
 
     def hard_delete(
         self, config_id: ObjectId, session: "ClientSession | None" = None
@@ -4,17 +4,38 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, IndexModel, ReturnDocument
 from pymongo.client_session import ClientSession
 
 from app.entities.enums import ExtractionStatus, FeatureVectorScope
 from app.entities.model_training_build import ModelTrainingBuild
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, create_indexes_once
+
+# Builds with usable features (shared by export, stats and prediction queries)
+EXTRACTED_STATUSES = [ExtractionStatus.COMPLETED.value, ExtractionStatus.PARTIAL.value]
 
 
 class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
+    EXPORT_INDEX = "export_lookup"
+
     def __init__(self, db) -> None:
         super().__init__(db, "model_training_builds", ModelTrainingBuild)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # Export filter (config + status) and sort (build_created_at)
+            IndexModel(
+                [
+                    ("model_repo_config_id", ASCENDING),
+                    ("extraction_status", ASCENDING),
+                    ("build_created_at", ASCENDING),
+                ],
+                name=self.EXPORT_INDEX,
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def upsert_or_get(
         self,
@@ -95,9 +116,9 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
         )
         build = ModelTrainingBuild(**doc)
         # Check if it was newly created by comparing created_at
+        created_at = doc.get("created_at")
         was_created = (
-            doc.get("created_at") is not None
-            and (datetime.utcnow() - doc.get("created_at", datetime.utcnow())).total_seconds() < 2
+            created_at is not None and (datetime.utcnow() - created_at).total_seconds() < 2
         )
         return build, was_created
 
@@ -142,12 +163,7 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
         return self.find_many(
             {
                 "model_repo_config_id": model_repo_config_id,
-                "extraction_status": {
-                    "$in": [
-                        ExtractionStatus.COMPLETED.value,
-                        ExtractionStatus.PARTIAL.value,
-                    ]
-                },
+                "extraction_status": {"$in": EXTRACTED_STATUSES},
                 "predicted_label": None,
                 "prediction_error": None,
             }
@@ -218,12 +234,14 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
         end_date: Optional[datetime] = None,
         build_status: Optional[str] = None,
         limit: Optional[int] = None,
+        batch_size: int = 500,
     ):
         """
         Get cursor for streaming export of builds with features from FeatureVector.
 
         Uses $lookup aggregation to join with feature_vectors collection.
         Returns a cursor (not materialized list) for memory-efficient streaming.
+        Rows are yielded as raw dicts so export writers skip model construction.
 
         Args:
             model_repo_config_id: The ModelRepoConfig ID
@@ -231,18 +249,14 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
             end_date: Optional filter by build_created_at <= end_date
             build_status: Optional filter by build status
             limit: Optional limit for preview
+            batch_size: Documents fetched per getMore round-trip
 
         Returns:
             MongoDB aggregation cursor for iteration
         """
         match_query: Dict[str, Any] = {
             "model_repo_config_id": model_repo_config_id,
-            "extraction_status": {
-                "$in": [
-                    ExtractionStatus.COMPLETED.value,
-                    ExtractionStatus.PARTIAL.value,
-                ]
-            },
+            "extraction_status": {"$in": EXTRACTED_STATUSES},
         }
 
         if start_date or end_date:
@@ -297,7 +311,10 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
         if limit:
             pipeline.append({"$limit": limit})
 
-        return self.collection.aggregate(pipeline, batchSize=100)
+        hint = self._hint(self.EXPORT_INDEX)
+        if hint:
+            return self.collection.aggregate(pipeline, batchSize=batch_size, hint=hint)
+        return self.collection.aggregate(pipeline, batchSize=batch_size)
 
     def get_all_feature_keys(
         self,
@@ -322,12 +339,7 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
         """
         match_query: Dict[str, Any] = {
             "model_repo_config_id": model_repo_config_id,
-            "extraction_status": {
-                "$in": [
-                    ExtractionStatus.COMPLETED.value,
-                    ExtractionStatus.PARTIAL.value,
-                ]
-            },
+            "extraction_status": {"$in": EXTRACTED_STATUSES},
         }
 
         if start_date or end_date:
@@ -378,12 +390,7 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
         """Count builds available for export."""
         query: Dict[str, Any] = {
             "model_repo_config_id": model_repo_config_id,
-            "extraction_status": {
-                "$in": [
-                    ExtractionStatus.COMPLETED.value,
-                    ExtractionStatus.PARTIAL.value,
-                ]
-            },
+            "extraction_status": {"$in": EXTRACTED_STATUSES},
         }
 
         if start_date or end_date:
@@ -456,12 +463,7 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
             {
                 "$match": {
                     "model_repo_config_id": model_repo_config_id,
-                    "extraction_status": {
-                        "$in": [
-                            ExtractionStatus.COMPLETED.value,
-                            ExtractionStatus.PARTIAL.value,
-                        ]
-                    },
+                    "extraction_status": {"$in": EXTRACTED_STATUSES},
                 }
             },
             {
@@ -518,12 +520,7 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
         """
         query = {
             "model_repo_config_id": model_repo_config_id,
-            "extraction_status": {
-                "$in": [
-                    ExtractionStatus.COMPLETED.value,
-                    ExtractionStatus.PARTIAL.value,
-                ]
-            },
+            "extraction_status": {"$in": EXTRACTED_STATUSES},
             "predicted_label": None,
             "prediction_error": None,
         }
@@ -551,12 +548,7 @@ class ModelTrainingBuildRepository(BaseRepository[ModelTrainingBuild]):
         """
         query = {
             "model_repo_config_id": model_repo_config_id,
-            "extraction_status": {
-                "$in": [
-                    ExtractionStatus.COMPLETED.value,
-                    ExtractionStatus.PARTIAL.value,
-                ]
-            },
+            "extraction_status": {"$in": EXTRACTED_STATUSES},
             "prediction_error": {"$ne": None},
         }
         cursor = self.collection.find(query).limit(limit)
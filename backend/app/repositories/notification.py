@@ -31,12 +31,12 @@ class NotificationRepository(BaseRepository[Notification]):
 
         if cursor_id:
             try:
-                query["_id"] = {"$lt": ObjectId(cursor_id)}
+                query["_id"] = {"$lt": self.ensure_object_id(cursor_id)}
             except Exception:
                 pass  # Ignore invalid cursor
 
         # If using cursor, skip should be 0 (handled by caller usually), but we respect it if passed
-        return self.paginate(query, sort=[("_id", -1)], skip=skip, limit=limit)
+        return self.paginate_facet(query, sort=[("_id", -1)], skip=skip, limit=limit)
 
     def count_unread(self, user_id: ObjectId) -> int:
         """Count unread notifications for a user."""
@@ -3,6 +3,7 @@
 from datetime import datetime, timezone
 from typing import Optional, Tuple
 
+from bson import ObjectId
 from pymongo.database import Database
 
 from app.entities.oauth_identity import OAuthIdentity
@@ -27,20 +28,19 @@ class OAuthIdentityRepository(BaseRepository[OAuthIdentity]):
 
     def delete_by_user_id(self, user_id) -> int:
         """Delete all OAuth identities for a user."""
-        from bson import ObjectId
-
         uid = user_id if isinstance(user_id, ObjectId) else ObjectId(user_id)
         result = self.collection.delete_many({"user_id": uid})
         return result.deleted_count
 
     def mark_token_invalid(self, identity_id, reason: str = "invalid") -> None:
-        self.update_one(
+        now = datetime.now(timezone.utc)
+        self.update_by_id(
             identity_id,
             {
                 "token_status": "invalid",
                 "token_invalid_reason": reason,
-                "token_invalidated_at": datetime.now(timezone.utc),
-                "updated_at": datetime.now(timezone.utc),
+                "token_invalidated_at": now,
+                "updated_at": now,
             },
         )
 
@@ -62,7 +62,7 @@ class OAuthIdentityRepository(BaseRepository[OAuthIdentity]):
         if token_expires_at is not None:
             updates["token_expires_at"] = token_expires_at
 
-        self.update_one(identity_id, updates)
+        self.update_by_id(identity_id, updates)
 
     def upsert_github_identity(
         self,
@@ -81,25 +81,26 @@ class OAuthIdentityRepository(BaseRepository[OAuthIdentity]):
     ) -> Tuple[User, OAuthIdentity]:
         """Upsert a GitHub identity and associated user"""
         provider = "github"
-        existing_identity = self.find_by_provider_and_external_id(provider, github_user_id)
-
         now = datetime.now(timezone.utc)
 
-        if existing_identity:
-            # Update existing identity
-            identity_updates = {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "token_expires_at": token_expires_at,
-                "scopes": scopes,
-                "updated_at": now,
-                "account_login": account_login,
-                "account_name": account_name,
-                "account_avatar_url": account_avatar_url,
-                "connected_at": connected_at,
-            }
-            self.update_one(existing_identity.id, identity_updates)
+        # Look up and update an existing identity in one round-trip
+        identity_updates = {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_expires_at": token_expires_at,
+            "scopes": scopes,
+            "updated_at": now,
+            "account_login": account_login,
+            "account_name": account_name,
+            "account_avatar_url": account_avatar_url,
+            "connected_at": connected_at,
+        }
+        existing_identity = self.find_one_and_update(
+            {"provider": provider, "external_user_id": github_user_id},
+            {"$set": identity_updates},
+        )
 
+        if existing_identity:
             # Update user if needed
             user_doc = self.user_repo.find_by_id(existing_identity.user_id)
             if not user_doc:
@@ -112,11 +113,11 @@ class OAuthIdentityRepository(BaseRepository[OAuthIdentity]):
                 user_updates["name"] = name
 
             if user_updates:
-                self.user_repo.update_one(user_doc.id, user_updates)
-                user_doc = self.user_repo.find_by_id(user_doc.id)
+                user_doc = self.user_repo.find_one_and_update(
+                    {"_id": user_doc.id}, {"$set": user_updates}
+                )
 
-            identity_doc = self.find_by_id(existing_identity.id)
-            return user_doc, identity_doc
+            return user_doc, existing_identity
 
         # Create new user and identity
         user_doc = self.user_repo.create_user(email, name, role="user")
@@ -1,21 +1,86 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument, UpdateOne
+from pymongo.results import BulkWriteResult
 
 from app.entities.base import validate_object_id
 from app.entities.raw_build_run import RawBuildRun
-from app.repositories.base import BaseRepository
+from app.repositories.base import (
+    ID_BATCH_SIZE,
+    BaseRepository,
+    create_indexes_once,
+    index_ensured,
+)
+
+BUSINESS_KEY_INDEX = "repo_run_provider_unique"
+
+# Recomputed after every write that may touch either SHA: both SHAs, deduped,
+# without nulls. Lets commit-or-effective lookups use one multikey equality.
+SHA_ANY_STAGE = {
+    "$set": {"sha_any": {"$setDifference": [["$commit_sha", "$effective_sha"], [None]]}}
+}
 
 
 class RawBuildRunRepository(BaseRepository[RawBuildRun]):
     """Repository for RawBuildRun entities - shared across all flows."""
 
+    # Written only by our own ingestion; status/conclusion/provider come back as
+    # plain strings, which compare equal to their str-Enum members.
+    TRUSTED_READ = True
+
     def __init__(self, db) -> None:
         super().__init__(db, "raw_build_runs", RawBuildRun)
+        self._ensure_indexes()
+        # Several indexes lead with raw_repo_id, so the planner can race the
+        # wrong one on business-key lookups; pin the unique key when it exists
+        # (it will not if legacy duplicates blocked it).
+        self._business_key_hint = (
+            BUSINESS_KEY_INDEX if index_ensured(self.collection, BUSINESS_KEY_INDEX) else None
+        )
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # Business key for upserts; its (raw_repo_id, ci_run_id) prefix also
+            # serves find_by_build_id and find_ids_by_build_ids
+            IndexModel(
+                [
+                    ("raw_repo_id", ASCENDING),
+                    ("ci_run_id", ASCENDING),
+                    ("provider", ASCENDING),
+                ],
+                name=BUSINESS_KEY_INDEX,
+                unique=True,
+            ),
+            # find_by_commit_or_effective_sha: sha_any is multikey over both SHAs
+            IndexModel(
+                [("raw_repo_id", ASCENDING), ("sha_any", ASCENDING)],
+                name="repo_sha_any",
+            ),
+            # Commit-history walks in the code extractors
+            IndexModel(
+                [("raw_repo_id", ASCENDING), ("effective_sha", ASCENDING)],
+                name="repo_effective_sha",
+            ),
+            IndexModel(
+                [("raw_repo_id", ASCENDING), ("run_started_at", DESCENDING)],
+                name="repo_run_started_desc",
+            ),
+            # list_by_repo: newest first per repo with an _id tiebreak (keyset)
+            IndexModel(
+                [
+                    ("raw_repo_id", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ],
+                name="repo_created_desc",
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def find_by_business_key(
         self,
@@ -31,9 +96,10 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
                 "raw_repo_id": oid,
                 "ci_run_id": build_id,
                 "provider": provider,
-            }
+            },
+            hint=self._business_key_hint,
         )
-        return RawBuildRun(**doc) if doc else None
+        return self._to_model(doc)
 
     def find_by_build_id(
         self,
@@ -44,9 +110,10 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
             {
                 "raw_repo_id": raw_repo_id,
                 "ci_run_id": build_id,
-            }
+            },
+            hint=self._business_key_hint,
         )
-        return RawBuildRun(**doc) if doc else None
+        return self._to_model(doc)
 
     def find_by_repo_and_build_id(
         self,
@@ -63,15 +130,9 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
     ) -> Optional[RawBuildRun]:
         """Find a build run by repo and commit SHA or effective SHA."""
         doc = self.collection.find_one(
-            {
-                "raw_repo_id": validate_object_id(raw_repo_id),
-                "$or": [
-                    {"commit_sha": commit_sha},
-                    {"effective_sha": commit_sha},
-                ],
-            }
+            {"raw_repo_id": validate_object_id(raw_repo_id), "sha_any": commit_sha}
         )
-        return RawBuildRun(**doc) if doc else None
+        return self._to_model(doc)
 
     def list_by_repo(
         self,
@@ -79,40 +140,52 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
         skip: int = 0,
         limit: int = 100,
         since: Optional[datetime] = None,
+        after: Optional[str] = None,
     ) -> tuple[List[RawBuildRun], int]:
-        """List build runs for a repository with pagination."""
+        """
+        List build runs for a repository with pagination.
+
+        Pass the previous page's cursor as `after` to seek instead of skip.
+        """
         query: Dict[str, Any] = {"raw_repo_id": raw_repo_id}
         if since:
             query["created_at"] = {"$gte": since}
 
-        return self.paginate(query, sort=[("created_at", -1)], skip=skip, limit=limit)
+        if after:
+            return self.paginate_keyset(query, direction=-1, after=after, limit=limit)
+
+        return self.paginate_facet(
+            query, sort=[("created_at", -1), ("_id", -1)], skip=skip, limit=limit
+        )
 
     def find_ids_by_build_ids(
         self,
         raw_repo_id: ObjectId,
         build_ids: List[str],
         provider: str,
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """
         Batch query using $in to find multiple builds efficiently.
-        Returns list of dicts with _id, commit_sha, effective_sha for each found build.
-        """
-        if not build_ids:
-            return []
 
-        cursor = self.collection.find(
-            {
-                "raw_repo_id": raw_repo_id,
-                "ci_run_id": {"$in": build_ids},
-                "provider": provider,
-            },
-            {
-                "_id": 1,
-                "commit_sha": 1,
-                "effective_sha": 1,
-            },  # Projection - only needed fields
-        )
-        return list(cursor)
+        Yields dicts with _id, ci_run_id, commit_sha, effective_sha for each found build.
+        The $in list is split into ID_BATCH_SIZE chunks and results are
+        streamed, so wrap the call in list() if you need them all at once.
+        """
+        for start in range(0, len(build_ids), ID_BATCH_SIZE):
+            yield from self.collection.find(
+                {
+                    "raw_repo_id": raw_repo_id,
+                    "ci_run_id": {"$in": build_ids[start : start + ID_BATCH_SIZE]},
+                    "provider": provider,
+                },
+                {
+                    "_id": 1,
+                    "ci_run_id": 1,
+                    "commit_sha": 1,
+                    "effective_sha": 1,
+                },  # Projection - only needed fields
+                hint=self._business_key_hint,
+            ).batch_size(500)
 
     def upsert_by_business_key(
         self,
@@ -130,39 +203,82 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
 
         Auto-populates effective_sha from commit_sha if not explicitly provided,
         ensuring effective_sha is always set for downstream processing.
+
+        The business key is never rewritten: an upsert seeds it from the
+        filter, so only the mutable fields and updated_at go into the update
+        and created_at is written once on insert.
         """
         # Auto-populate effective_sha from commit_sha if not provided
         # This ensures effective_sha is always set for all builds
         if "effective_sha" not in kwargs and "commit_sha" in kwargs:
             kwargs["effective_sha"] = kwargs["commit_sha"]
 
-        update_data = {
-            "raw_repo_id": raw_repo_id,
-            "ci_run_id": build_id,
-            "provider": provider,
-            **{k: v for k, v in kwargs.items() if v is not None},
-        }
-
         doc = self.collection.find_one_and_update(
             {"raw_repo_id": raw_repo_id, "ci_run_id": build_id, "provider": provider},
-            {"$set": update_data},
+            self._upsert_pipeline(kwargs, datetime.now(timezone.utc)),
             upsert=True,
             return_document=ReturnDocument.AFTER,
+            hint=self._business_key_hint,
         )
-        return RawBuildRun(**doc)
+        return self._to_model(doc)
+
+    def bulk_upsert_by_business_key(
+        self,
+        ops: List[Tuple[ObjectId, str, str, Dict[str, Any]]],
+    ) -> Optional[BulkWriteResult]:
+        """
+        Upsert many build runs in one unordered bulk_write.
+
+        Same per-document semantics as upsert_by_business_key. Documents are
+        not returned; resolve ids afterwards with find_ids_by_build_ids.
+
+        Args:
+            ops: (raw_repo_id, build_id, provider, fields) per build run
+        """
+        if not ops:
+            return None
+        now = datetime.now(timezone.utc)
+        requests = []
+        for raw_repo_id, build_id, provider, fields in ops:
+            fields = dict(fields)
+            if "effective_sha" not in fields and "commit_sha" in fields:
+                fields["effective_sha"] = fields["commit_sha"]
+            requests.append(
+                UpdateOne(
+                    {"raw_repo_id": raw_repo_id, "ci_run_id": build_id, "provider": provider},
+                    self._upsert_pipeline(fields, now),
+                    upsert=True,
+                    hint=self._business_key_hint,
+                )
+            )
+        return self.collection.bulk_write(requests, ordered=False)
+
+    @staticmethod
+    def _upsert_pipeline(fields: Dict[str, Any], now: datetime) -> List[Dict[str, Any]]:
+        """
+        Update pipeline shared by the single and bulk upserts.
+
+        Pipeline update so sha_any is derived from the stored SHAs; values are
+        wrapped in $literal so strings starting with "$" stay strings.
+        """
+        update_data: Dict[str, Any] = {
+            k: {"$literal": v} for k, v in fields.items() if v is not None
+        }
+        update_data["updated_at"] = now
+        # Pipeline updates have no $setOnInsert; $ifNull keeps the first value
+        update_data["created_at"] = {"$ifNull": ["$created_at", now]}
+        return [{"$set": update_data}, SHA_ANY_STAGE]
 
     def get_latest_run(
         self,
         raw_repo_id: ObjectId,
     ) -> Optional[RawBuildRun]:
         """Get the most recent build run for a repository."""
-        doc = (
-            self.collection.find({"raw_repo_id": raw_repo_id})
-            .sort("created_at", -1)
-            .limit(1)
+        # Walks repo_created_desc from its head: a single index seek
+        doc = self.collection.find_one(
+            {"raw_repo_id": raw_repo_id}, sort=[("created_at", -1), ("_id", -1)]
         )
-        docs = list(doc)
-        return RawBuildRun(**docs[0]) if docs else None
+        return self._to_model(doc)
 
     def count_by_repo(self, raw_repo_id: ObjectId) -> int:
         """Count build runs for a repository."""
@@ -172,7 +288,7 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
         """Update effective_sha for a build run (used for replayed fork commits)."""
         result = self.collection.update_one(
             {"_id": build_run_id},
-            {"$set": {"effective_sha": effective_sha}},
+            [{"$set": {"effective_sha": {"$literal": effective_sha}}}, SHA_ANY_STAGE],
         )
         return result.modified_count > 0
 
@@ -198,22 +314,30 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
         if not build_run_ids:
             return {}
 
-        cursor = self.collection.find(
-            {"_id": {"$in": build_run_ids}},
-            {"_id": 1, "build_number": 1, "branch": 1, "raw_data": 1},
+        # raw_data holds the full CI payload; ship only the two fields we show
+        projection = {
+            "_id": 1,
+            "build_number": 1,
+            "branch": 1,
+            "raw_data.event": 1,
+            "raw_data.name": 1,
+        }
+        docs = (
+            doc
+            for start in range(0, len(build_run_ids), ID_BATCH_SIZE)
+            for doc in self.collection.find(
+                {"_id": {"$in": build_run_ids[start : start + ID_BATCH_SIZE]}}, projection
+            )
         )
-
-        result: Dict[str, Dict[str, Any]] = {}
-        for doc in cursor:
-            raw_data = doc.get("raw_data", {})
-            result[str(doc["_id"])] = {
+        return {
+            str(doc["_id"]): {
                 "build_number": doc.get("build_number"),
                 "branch": doc.get("branch", ""),
-                "event": raw_data.get("event", ""),
-                "workflow_name": raw_data.get("name", ""),
+                "event": doc.get("raw_data", {}).get("event", ""),
+                "workflow_name": doc.get("raw_data", {}).get("name", ""),
             }
-
-        return result
+            for doc in docs
+        }
 
     def find_with_filters(
         self,
@@ -230,7 +354,8 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
         """
         Find build runs with filters and return stats for preview.
 
-        Used by Training Scenario wizard to preview matching builds.
+        Used by Training Scenario wizard to preview matching builds. Builds come
+        back without raw_data; the preview never shows the CI payload.
 
         Returns:
             Tuple of (builds list, stats dict with total_builds, total_repos, outcome_distribution)
@@ -261,17 +386,16 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
         if repo_ids:
             query["raw_repo_id"] = {"$in": repo_ids}
 
-        # Get paginated builds
-        builds, total = self.paginate(
-            query,
-            sort=[("run_created_at", -1)],
-            skip=skip,
-            limit=limit,
-        )
+        # run_created_at has no index, so the sort lives inside the builds
+        # branch where $sort + $limit coalesce into a top-k sort and the stats
+        # branch never pays for ordering.
+        page_stages: List[Dict[str, Any]] = [{"$sort": {"run_created_at": -1}}]
+        if skip:
+            page_stages.append({"$skip": skip})
+        if limit:
+            page_stages.append({"$limit": limit})
 
-        # Get stats via aggregation
-        stats_pipeline = [
-            {"$match": query},
+        stats_stages = [
             {
                 "$group": {
                     "_id": None,
@@ -297,11 +421,23 @@ class RawBuildRunRepository(BaseRepository[RawBuildRun]):
                 }
             },
         ]
+        pipeline = [
+            {"$match": query},
+            # Drop the CI payload before either branch sees it: the page sort and
+            # the $group then handle small documents. No index-backed sort follows
+            # $match, so this projection costs no index use.
+            {"$project": {"raw_data": 0}},
+            {"$facet": {"builds": page_stages, "stats": stats_stages}},
+        ]
 
-        stats_result = list(self.collection.aggregate(stats_pipeline))
+        # Page and stats in one round-trip instead of a find plus an aggregate.
+        # No hint: provider is barely selective, and repo_ids or a tight date
+        # range are better served by repo_run_started_desc, so let the planner pick.
+        facet = self.aggregate(pipeline)[0]
+        builds = [self._to_model(doc) for doc in facet["builds"]]
         stats = (
-            stats_result[0]
-            if stats_result
+            facet["stats"][0]
+            if facet["stats"]
             else {
                 "total_builds": 0,
                 "total_repos": 0,
@@ -2,8 +2,10 @@
 
 from typing import Optional
 
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+
 from app.entities.raw_repository import RawRepository
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, create_indexes_once
 
 
 class RawRepositoryRepository(BaseRepository[RawRepository]):
@@ -11,6 +13,19 @@ class RawRepositoryRepository(BaseRepository[RawRepository]):
 
     def __init__(self, db) -> None:
         super().__init__(db, "raw_repositories", RawRepository)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # Upsert key; also makes concurrent upserts of the same repo safe
+            IndexModel(
+                [("full_name", ASCENDING)],
+                unique=True,
+                name="unique_full_name",
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def find_by_full_name(self, full_name: str) -> Optional[RawRepository]:
         """Find repository by full name (owner/repo)."""
@@ -22,15 +37,27 @@ class RawRepositoryRepository(BaseRepository[RawRepository]):
         full_name: str,
         **kwargs,
     ) -> RawRepository:
-        """Upsert a repository by full_name, updating or creating as needed."""
-        existing = self.find_by_full_name(full_name)
-        if existing:
-            # Update existing
-            update_data = {k: v for k, v in kwargs.items() if v is not None}
-            if update_data:
-                self.collection.update_one({"_id": existing.id}, {"$set": update_data})
-            return self.find_by_id(existing.id)
-        else:
-            # Create new
-            repo = RawRepository(full_name=full_name, **kwargs)
-            return self.insert_one(repo)
+        """
+        Upsert a repository by full_name, updating or creating as needed.
+
+        The entity is validated before anything is written; on insert its
+        defaults are stored alongside the given fields.
+        """
+        entity = RawRepository(full_name=full_name, **kwargs)
+        update_data = {k: v for k, v in kwargs.items() if v is not None}
+        on_insert = {
+            k: v
+            for k, v in entity.to_mongo().items()
+            if k not in update_data and k not in ("_id", "full_name")
+        }
+        update: dict = {"$setOnInsert": on_insert}
+        if update_data:
+            update["$set"] = update_data
+
+        doc = self.collection.find_one_and_update(
+            {"full_name": full_name},
+            update,
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return RawRepository(**doc)
@@ -2,32 +2,103 @@
 SonarCommitScan Repository - CRUD operations for SonarQube commit scans.
 """
 
-from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+import logging
+from typing import Optional, Set, Tuple
 
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 from pymongo.database import Database
+from pymongo.errors import ConnectionFailure
 
+from app.config import settings
 from app.entities.sonar_commit_scan import SonarCommitScan, SonarScanStatus
-from app.repositories.base import BaseRepository
+from app.repositories.base import create_indexes_once
+from app.repositories.commit_scan import CommitScanRepository
 
+logger = logging.getLogger(__name__)
 
-class SonarCommitScanRepository(BaseRepository[SonarCommitScan]):
+FINISHED_STATUSES = (SonarScanStatus.COMPLETED, SonarScanStatus.FAILED)
+FINISHED_TTL_INDEX = "finished_ttl"
+
+# (database, collection) whose finished_ttl was reconciled in this process
+_ttl_reconciled: Set[Tuple[str, str]] = set()
+
+
+class SonarCommitScanRepository(CommitScanRepository[SonarCommitScan]):
     """Repository for SonarCommitScan entities."""
 
+    status_enum = SonarScanStatus
+
     def __init__(self, db: Database):
         super().__init__(db, "sonar_commit_scans", SonarCommitScan)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = self._scan_indexes() + [
+            # find_by_component_key / find_pending_commit_sha
+            IndexModel(
+                [("component_key", ASCENDING), ("status", ASCENDING)],
+                name="component_status",
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
+        self._reconcile_finished_ttl()
+
+    def _reconcile_finished_ttl(self) -> None:
+        """
+        Bring the finished_ttl index in line with SCAN_RETENTION_DAYS (once per process).
+
+        createIndexes can't change expireAfterSeconds on an existing index, so a
+        changed setting goes through collMod, and 0 drops the index. Only
+        finished scans are in the partial filter; pending/scanning ones never expire.
+        """
+        key = (self.collection.database.name, self.collection.name)
+        if key in _ttl_reconciled:
+            return
+        expire_after = settings.SCAN_RETENTION_DAYS * 86400
+        try:
+            current = self.collection.index_information().get(FINISHED_TTL_INDEX)
+            if expire_after <= 0:
+                if current:
+                    self.collection.drop_index(FINISHED_TTL_INDEX)
+            elif current is None:
+                self.collection.create_indexes(
+                    [
+                        IndexModel(
+                            [("completed_at", ASCENDING)],
+                            name=FINISHED_TTL_INDEX,
+                            expireAfterSeconds=expire_after,
+                            partialFilterExpression={
+                                "status": {"$in": [s.value for s in FINISHED_STATUSES]}
+                            },
+                        )
+                    ]
+                )
+            elif current.get("expireAfterSeconds") != expire_after:
+                self.collection.database.command(
+                    "collMod",
+                    self.collection.name,
+                    index={"name": FINISHED_TTL_INDEX, "expireAfterSeconds": expire_after},
+                )
+        except ConnectionFailure as e:
+            logger.warning(f"Could not reconcile {FINISHED_TTL_INDEX}, will retry: {e}")
+            return
+        except Exception as e:
+            logger.warning(f"Failed to reconcile {FINISHED_TTL_INDEX}: {e}")
+        _ttl_reconciled.add(key)
 
     def find_by_component_key(self, component_key: str) -> Optional[SonarCommitScan]:
         """Find scan by component key."""
         return self.find_one({"component_key": component_key})
 
-    def find_pending_by_component_key(
-        self,
-        component_key: str,
-    ) -> Optional[SonarCommitScan]:
-        """Find only scanning (not completed) record by component key."""
-        return self.find_one(
+    def find_pending_commit_sha(self, component_key: str) -> Optional[str]:
+        """
+        Get the commit SHA of the in-flight (pending/scanning) scan for a component.
+
+        Only the SHA is fetched; the webhook just needs to know the scan is tracked.
+        """
+        doc = self.collection.find_one(
             {
                 "component_key": component_key,
                 "status": {
@@ -36,133 +107,10 @@ class SonarCommitScanRepository(BaseRepository[SonarCommitScan]):
                         SonarScanStatus.SCANNING.value,
                     ]
                 },
-            }
-        )
-
-    def mark_scanning(self, scan_id: ObjectId) -> None:
-        """Mark scan as in progress."""
-        self.collection.update_one(
-            {"_id": scan_id},
-            {
-                "$set": {
-                    "status": SonarScanStatus.SCANNING.value,
-                    "started_at": datetime.now(timezone.utc),
-                }
-            },
-        )
-
-    def mark_completed(
-        self,
-        scan_id: ObjectId,
-        metrics: dict,
-        builds_affected: int = 0,
-    ) -> None:
-        """Mark scan as completed with metrics."""
-        self.collection.update_one(
-            {"_id": scan_id},
-            {
-                "$set": {
-                    "status": SonarScanStatus.COMPLETED.value,
-                    "metrics": metrics,
-                    "builds_affected": builds_affected,
-                    "completed_at": datetime.now(timezone.utc),
-                    "error_message": None,
-                }
-            },
-        )
-
-    def mark_failed(self, scan_id: ObjectId, error_message: str) -> None:
-        """Mark scan as failed."""
-        self.collection.update_one(
-            {"_id": scan_id},
-            {
-                "$set": {
-                    "status": SonarScanStatus.FAILED.value,
-                    "error_message": error_message,
-                    "completed_at": datetime.now(timezone.utc),
-                }
-            },
-        )
-
-    def increment_retry(self, scan_id: ObjectId) -> None:
-        """Increment retry count and reset to pending."""
-        self.collection.update_one(
-            {"_id": scan_id},
-            {
-                "$inc": {"retry_count": 1},
-                "$set": {
-                    "status": SonarScanStatus.PENDING.value,
-                    "error_message": None,
-                    "started_at": None,
-                    "completed_at": None,
-                },
             },
+            {"_id": 0, "commit_sha": 1},
         )
-
-    def delete_old_scans(self, days: int = 30) -> int:
-        """Delete completed scans older than specified days."""
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        result = self.collection.delete_many(
-            {
-                "status": {
-                    "$in": [
-                        SonarScanStatus.COMPLETED.value,
-                        SonarScanStatus.FAILED.value,
-                    ]
-                },
-                "completed_at": {"$lt": cutoff},
-            }
-        )
-        return result.deleted_count
-
-    # ========================================================================
-    # Scenario-based methods (Training Scenario flow)
-    # ========================================================================
-
-    def list_by_scenario(
-        self,
-        scenario_id: ObjectId,
-        skip: int = 0,
-        limit: int = 10,
-        status: Optional[SonarScanStatus] = None,
-    ) -> tuple[List[SonarCommitScan], int]:
-        """List scans for a scenario with pagination. Returns (items, total)."""
-        query = {"scenario_id": scenario_id}
-        if status:
-            query["status"] = status.value
-        total = self.collection.count_documents(query)
-        items = list(
-            self.collection.find(query).sort("created_at", -1).skip(skip).limit(limit)
-        )
-        return [SonarCommitScan(**doc) for doc in items], total
-
-    def count_by_scenario(self, scenario_id: ObjectId) -> int:
-        """Count all scans for a scenario."""
-        return self.collection.count_documents({"scenario_id": scenario_id})
-
-    def count_by_scenario_and_status(
-        self, scenario_id: ObjectId, status: SonarScanStatus
-    ) -> int:
-        """Count scans for a scenario filtered by status."""
-        return self.collection.count_documents(
-            {
-                "scenario_id": scenario_id,
-                "status": status.value,
-            }
-        )
-
-    def find_by_scenario_and_commit(
-        self,
-        scenario_id: ObjectId,
-        commit_sha: str,
-    ) -> Optional[SonarCommitScan]:
-        """Find scan for specific scenario + commit."""
-        return self.find_one(
-            {
-                "scenario_id": scenario_id,
-                "commit_sha": commit_sha,
-            }
-        )
+        return doc["commit_sha"] if doc else None
 
     def create_or_get_for_scenario(
         self,
@@ -174,34 +122,16 @@ class SonarCommitScanRepository(BaseRepository[SonarCommitScan]):
         scan_config: Optional[dict] = None,
         selected_metrics: Optional[list] = None,
     ) -> SonarCommitScan:
-        """Create new scan record for scenario or return existing."""
-        existing = self.find_by_scenario_and_commit(scenario_id, commit_sha)
-        if existing:
-            return existing
-
-        scan = SonarCommitScan(
-            scenario_id=scenario_id,
-            commit_sha=commit_sha,
-            repo_full_name=repo_full_name,
-            raw_repo_id=raw_repo_id,
-            component_key=component_key,
-            scan_config=scan_config,
-            selected_metrics=selected_metrics,
-            status=SonarScanStatus.PENDING,
-        )
-        return self.insert_one(scan)
-
-    def get_failed_by_scenario(self, scenario_id: ObjectId) -> List[SonarCommitScan]:
-        """Get all failed scans for a scenario."""
-        return self.find_many(
-            {
-                "scenario_id": scenario_id,
-                "status": SonarScanStatus.FAILED.value,
-            }
+        """Create new scan record for scenario or return existing (one atomic upsert)."""
+        return self._create_or_get(
+            SonarCommitScan(
+                scenario_id=scenario_id,
+                commit_sha=commit_sha,
+                repo_full_name=repo_full_name,
+                raw_repo_id=raw_repo_id,
+                component_key=component_key,
+                scan_config=scan_config,
+                selected_metrics=selected_metrics,
+                status=SonarScanStatus.PENDING,
+            )
         )
-
-    def delete_by_scenario(self, scenario_id: ObjectId | str, session=None) -> int:
-        """Delete all scans for a scenario."""
-        if isinstance(scenario_id, str):
-            scenario_id = ObjectId(scenario_id)
-        return self.delete_many({"scenario_id": scenario_id}, session=session)
@@ -2,20 +2,35 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Set
 
+from pymongo import ASCENDING, IndexModel
 from pymongo.client_session import ClientSession
 from pymongo.database import Database
 
 from app.entities.source_build import SourceBuild, SourceBuildStatus
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, create_indexes_once
 
 
 class SourceBuildRepository(BaseRepository[SourceBuild]):
     """Repository for SourceBuild entity (tracks builds during source validation)."""
 
+    TRUSTED_READ = True
+
     def __init__(self, db: Database):
         super().__init__(db, "source_builds", SourceBuild)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # find_by_source / count_by_source / count_by_status (prefix)
+            IndexModel(
+                [("source_id", ASCENDING), ("status", ASCENDING)],
+                name="source_status",
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def find_by_source(
         self,
@@ -30,6 +45,15 @@ class SourceBuildRepository(BaseRepository[SourceBuild]):
             query["status"] = status.value
         return self.find_many(query, skip=skip, limit=limit)
 
+    def get_build_ids_by_source(self, source_id: str) -> Set[str]:
+        """Get the source build IDs already recorded for a source (validation resume)."""
+        # Streamed rather than distinct(), whose single result document caps at 16MB
+        cursor = self.collection.find(
+            {"source_id": self._to_object_id(source_id)},
+            {"_id": 0, "build_id_from_source": 1},
+        ).batch_size(1000)
+        return {doc["build_id_from_source"] for doc in cursor if doc.get("build_id_from_source")}
+
     def count_by_source(
         self, source_id: str, status: Optional[SourceBuildStatus] = None
     ) -> int:
@@ -55,7 +79,9 @@ class SourceBuildRepository(BaseRepository[SourceBuild]):
         if not builds:
             return 0
         docs = [b.model_dump(by_alias=True) for b in builds]
-        result = self.collection.insert_many(docs, session=session)
+        # PyMongo already splits oversized batches; unordered just keeps one bad
+        # row from aborting the rest
+        result = self.collection.insert_many(docs, ordered=False, session=session)
         return len(result.inserted_ids)
 
     def delete_by_source(
@@ -1,17 +1,49 @@
 """Repository for SystemLog entities (application logs stored in MongoDB)."""
 
+import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
 from app.entities.system_log import SystemLog
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, create_indexes_once
+
+# Fields format_log_row reads; the rest (ids, source_lc, correlation_id) never leave the cursor
+EXPORT_PROJECTION = {"_id": 0, "timestamp": 1, "level": 1, "source": 1, "message": 1, "details": 1}
+
+
+def _source_prefix(source: str) -> Dict[str, Any]:
+    """Anchored, case-folded match on source_lc; unlike an "i" regex it can use the index."""
+    return {"$regex": f"^{re.escape(source.lower())}"}
 
 
 class SystemLogRepository(BaseRepository[SystemLog]):
     """Repository for SystemLog entities - application monitoring logs."""
 
+    TRUSTED_READ = True
+
     def __init__(self, db) -> None:
         super().__init__(db, "system_logs", SystemLog)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """
+        Create indexes for the filtered log views.
+
+        The plain timestamp sort uses the TTL index MongoDBLogHandler creates.
+        """
+        indexes = [
+            IndexModel(
+                [("level", ASCENDING), ("timestamp", DESCENDING)],
+                name="level_timestamp",
+            ),
+            IndexModel(
+                [("source_lc", ASCENDING), ("timestamp", DESCENDING)],
+                name="source_lc_timestamp",
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def find_recent(
         self,
@@ -27,7 +59,7 @@ class SystemLogRepository(BaseRepository[SystemLog]):
             skip: Pagination offset
             limit: Max results to return
             level: Filter by log level (DEBUG, INFO, WARNING, ERROR)
-            source: Filter by source component (partial match)
+            source: Filter by source component (case-insensitive prefix match)
 
         Returns:
             Tuple of (logs list, total count)
@@ -36,44 +68,9 @@ class SystemLogRepository(BaseRepository[SystemLog]):
         if level:
             query["level"] = level.upper()
         if source:
-            query["source"] = {"$regex": source, "$options": "i"}
-
-        return self.paginate(query, sort=[("timestamp", -1)], skip=skip, limit=limit)
-
-    def find_for_export(
-        self,
-        level: Optional[str] = None,
-        source: Optional[str] = None,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        limit: int = 10000,
-    ) -> List[SystemLog]:
-        """
-        Find logs for export with date range filtering.
-
-        Args:
-            level: Filter by log level
-            source: Filter by source component
-            start_date: Filter by timestamp >= start_date
-            end_date: Filter by timestamp <= end_date
-            limit: Max logs to export
-
-        Returns:
-            List of SystemLog entities
-        """
-        query: Dict[str, Any] = {}
-        if level:
-            query["level"] = level.upper()
-        if source:
-            query["source"] = {"$regex": source, "$options": "i"}
-        if start_date or end_date:
-            query["timestamp"] = {}
-            if start_date:
-                query["timestamp"]["$gte"] = start_date
-            if end_date:
-                query["timestamp"]["$lte"] = end_date
+            query["source_lc"] = _source_prefix(source)
 
-        return self.find_many(query, sort=[("timestamp", -1)], limit=limit)
+        return self.paginate_facet(query, sort=[("timestamp", -1)], skip=skip, limit=limit)
 
     def get_cursor_for_export(
         self,
@@ -81,7 +78,7 @@ class SystemLogRepository(BaseRepository[SystemLog]):
         source: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        batch_size: int = 100,
+        batch_size: int = 1000,
         limit: int = 10000,
     ):
         """
@@ -102,7 +99,7 @@ class SystemLogRepository(BaseRepository[SystemLog]):
         if level:
             query["level"] = level.upper()
         if source:
-            query["source"] = {"$regex": source, "$options": "i"}
+            query["source_lc"] = _source_prefix(source)
         if start_date or end_date:
             query["timestamp"] = {}
             if start_date:
@@ -110,4 +107,9 @@ class SystemLogRepository(BaseRepository[SystemLog]):
             if end_date:
                 query["timestamp"]["$lte"] = end_date
 
-        return self.collection.find(query).sort("timestamp", -1).batch_size(batch_size).limit(limit)
+        return (
+            self.collection.find(query, projection=EXPORT_PROJECTION)
+            .sort("timestamp", -1)
+            .batch_size(batch_size)
+            .limit(limit)
+        )
@@ -5,8 +5,8 @@ Tracks generated dataset split files.
 Renamed from MLDatasetSplitRepository.
 """
 
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 from pymongo.database import Database
 
@@ -18,6 +18,8 @@ from .base import BaseRepository
 class TrainingDatasetSplitRepository(BaseRepository[TrainingDatasetSplit]):
     """MongoDB repository for dataset splits."""
 
+    TRUSTED_READ = True
+
     def __init__(self, db: Database):
         super().__init__(db, "training_dataset_splits", TrainingDatasetSplit)
 
@@ -109,27 +111,34 @@ class TrainingDatasetSplitRepository(BaseRepository[TrainingDatasetSplit]):
             feature_names=feature_names,
             generation_duration_seconds=generation_duration_seconds,
             checksum_md5=checksum_md5,
-            generated_at=datetime.utcnow(),
+            generated_at=datetime.now(timezone.utc),
         )
         return self.insert_one(split)
 
-    def get_total_records(self, scenario_id: str) -> int:
-        """Get total records across all splits for a scenario."""
+    def get_totals(self, scenario_id: str) -> Tuple[int, int]:
+        """Get (total records, total file size in bytes) across all splits in one pass."""
         pipeline = [
             {"$match": {"scenario_id": self._to_object_id(scenario_id)}},
-            {"$group": {"_id": None, "total": {"$sum": "$record_count"}}},
+            {
+                "$group": {
+                    "_id": None,
+                    "records": {"$sum": "$record_count"},
+                    "bytes": {"$sum": "$file_size_bytes"},
+                }
+            },
         ]
         results = self.aggregate(pipeline)
-        return results[0]["total"] if results else 0
+        if not results:
+            return 0, 0
+        return results[0]["records"], results[0]["bytes"]
+
+    def get_total_records(self, scenario_id: str) -> int:
+        """Get total records across all splits for a scenario."""
+        return self.get_totals(scenario_id)[0]
 
     def get_total_size_bytes(self, scenario_id: str) -> int:
         """Get total file size across all splits."""
-        pipeline = [
-            {"$match": {"scenario_id": self._to_object_id(scenario_id)}},
-            {"$group": {"_id": None, "total": {"$sum": "$file_size_bytes"}}},
-        ]
-        results = self.aggregate(pipeline)
-        return results[0]["total"] if results else 0
+        return self.get_totals(scenario_id)[1]
 
     def delete_by_scenario(self, scenario_id: str) -> int:
         """Delete all splits for a scenario."""
@@ -5,16 +5,32 @@ Tracks builds through processing and split assignment.
 Unified from DatasetEnrichmentBuildRepository and MLScenarioEnrichmentBuildRepository.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.collection import Collection
 from pymongo.database import Database
+from pymongo.errors import BulkWriteError
 
-from app.entities.enums import ExtractionStatus
+from app.entities.enums import ExtractionStatus, FeatureVectorScope
 from app.entities.training_enrichment_build import TrainingEnrichmentBuild
 
-from .base import BaseRepository
+from .base import ID_BATCH_SIZE, BaseRepository, create_indexes_once
+
+
+@dataclass(frozen=True)
+class PendingEnrichmentBuild:
+    """Ids and references of a pending enrichment build, read from the index alone."""
+
+    id: ObjectId
+    scenario_id: ObjectId
+    ingestion_build_id: Optional[ObjectId]
+    raw_repo_id: Optional[ObjectId]
+    raw_build_run_id: Optional[ObjectId]
+    created_at: Optional[datetime]
 
 
 class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild]):
@@ -22,6 +38,69 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
 
     def __init__(self, db: Database):
         super().__init__(db, "training_enrichment_builds", TrainingEnrichmentBuild)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # find_by_scenario without filters: equality, then (created_at, _id) sort
+            IndexModel(
+                [
+                    ("scenario_id", ASCENDING),
+                    ("created_at", ASCENDING),
+                    ("_id", ASCENDING),
+                ],
+                name="scenario_created",
+            ),
+            # find_by_scenario by extraction status; the trailing refs make
+            # find_pending_for_processing a covered query
+            IndexModel(
+                [
+                    ("scenario_id", ASCENDING),
+                    ("extraction_status", ASCENDING),
+                    ("created_at", ASCENDING),
+                    ("_id", ASCENDING),
+                    ("ingestion_build_id", ASCENDING),
+                    ("raw_repo_id", ASCENDING),
+                    ("raw_build_run_id", ASCENDING),
+                ],
+                name="scn_status_created_refs",
+            ),
+            # find_by_scenario by split assignment
+            IndexModel(
+                [
+                    ("scenario_id", ASCENDING),
+                    ("split_assignment", ASCENDING),
+                    ("created_at", ASCENDING),
+                    ("_id", ASCENDING),
+                ],
+                name="scn_split_created",
+            ),
+            # One enrichment build per ingestion build (upsert_for_ingestion_build)
+            IndexModel(
+                [("scenario_id", ASCENDING), ("ingestion_build_id", ASCENDING)],
+                name="unique_scenario_ingestion_build",
+                unique=True,
+            ),
+            # backfill_by_commit_in_scenario
+            IndexModel(
+                [
+                    ("scenario_id", ASCENDING),
+                    ("commit_sha", ASCENDING),
+                    ("feature_vector_id", ASCENDING),
+                ],
+                name="scn_commit_fv",
+            ),
+            # Completed builds only (export / split generation reads)
+            IndexModel(
+                [("scenario_id", ASCENDING), ("created_at", ASCENDING)],
+                name="scenario_completed",
+                partialFilterExpression={
+                    "extraction_status": ExtractionStatus.COMPLETED.value
+                },
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def find_by_scenario(
         self,
@@ -30,6 +109,7 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
         split_assignment: Optional[str] = None,
         skip: int = 0,
         limit: int = 0,
+        after: Optional[str] = None,
     ) -> tuple[list[TrainingEnrichmentBuild], int]:
         """
         Find enrichment builds for a scenario with filters.
@@ -38,8 +118,9 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
             scenario_id: Scenario ID
             extraction_status: Filter by extraction status
             split_assignment: Filter by split (train/validation/test)
-            skip: Pagination offset
+            skip: Pagination offset (ignored when `after` is given)
             limit: Max results
+            after: Keyset cursor from the previous page (see encode_cursor)
 
         Returns:
             Tuple of (enrichment_builds, total_count)
@@ -52,67 +133,132 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
         if split_assignment:
             query["split_assignment"] = split_assignment
 
-        return self.paginate(
+        # Pin the index whose equality prefix matches the filter
+        if extraction_status:
+            hint = self._hint("scn_status_created_refs")
+        elif split_assignment:
+            hint = self._hint("scn_split_created")
+        else:
+            hint = self._hint("scenario_created")
+
+        if after:
+            return self.paginate_keyset(query, after=after, limit=limit, hint=hint)
+
+        return self.paginate_facet(
             query,
-            sort=[("created_at", 1)],
+            sort=[("created_at", 1), ("_id", 1)],
             skip=skip,
             limit=limit,
+            hint=hint,
         )
 
     def find_pending_for_processing(
         self,
         scenario_id: str,
         batch_size: int = 50,
-    ) -> List[TrainingEnrichmentBuild]:
-        """Get enrichment builds ready for feature extraction."""
-        return self.find_many(
+    ) -> List[PendingEnrichmentBuild]:
+        """
+        Get the ids and references of enrichment builds ready for feature extraction.
+
+        Covered by scn_status_created_refs: no document is fetched. Load the
+        full build by id when more than the references is needed.
+        """
+        cursor = self.collection.find(
             {
                 "scenario_id": self._to_object_id(scenario_id),
                 "extraction_status": ExtractionStatus.PENDING.value,
             },
-            sort=[("created_at", 1)],
+            {
+                "_id": 1,
+                "scenario_id": 1,
+                "created_at": 1,
+                "ingestion_build_id": 1,
+                "raw_repo_id": 1,
+                "raw_build_run_id": 1,
+            },
+            sort=[("created_at", 1), ("_id", 1)],
             limit=batch_size,
         )
+        hint = self._hint("scn_status_created_refs")
+        if hint:
+            cursor = cursor.hint(hint)
+        return [
+            PendingEnrichmentBuild(
+                id=doc["_id"],
+                scenario_id=doc["scenario_id"],
+                ingestion_build_id=doc.get("ingestion_build_id"),
+                raw_repo_id=doc.get("raw_repo_id"),
+                raw_build_run_id=doc.get("raw_build_run_id"),
+                created_at=doc.get("created_at"),
+            )
+            for doc in cursor
+        ]
 
     def bulk_create_from_ingestion_builds(
         self,
         scenario_id: str,
         ingestion_build_data: List[Dict[str, Any]],
-    ) -> int:
+    ) -> Dict[str, ObjectId]:
         """
-        Bulk create enrichment builds from ingested builds.
+        Bulk create enrichment builds from ingested builds, keeping existing ones.
 
         Args:
             scenario_id: Scenario ID
             ingestion_build_data: List of dicts with ingestion build info
 
         Returns:
-            Number of enrichment builds created
+            ingestion_build_id -> enrichment build id, for created and
+            already existing builds alike
         """
         if not ingestion_build_data:
-            return 0
+            return {}
 
+        # Plain dicts skip per-row entity validation/model_dump; they must stay
+        # in the shape TrainingEnrichmentBuild.model_dump(exclude_none=True) gives.
         scenario_oid = self._to_object_id(scenario_id)
+        now = datetime.utcnow()
         documents = []
 
         for data in ingestion_build_data:
-            doc = TrainingEnrichmentBuild(
-                scenario_id=scenario_oid,
-                ingestion_build_id=data["ingestion_build_id"],
-                raw_repo_id=data["raw_repo_id"],
-                raw_build_run_id=data["raw_build_run_id"],
-                ci_run_id=data.get("ci_run_id", ""),
-                commit_sha=data.get("commit_sha", ""),
-                repo_full_name=data.get("repo_full_name", ""),
-                outcome=data.get("outcome"),
-                group_value=data.get("group_value"),
-                build_started_at=data.get("build_started_at"),
-                extraction_status=ExtractionStatus.PENDING,
-            )
+            doc: Dict[str, Any] = {
+                "scenario_id": scenario_oid,
+                "ingestion_build_id": self._to_object_id(data["ingestion_build_id"]),
+                "raw_repo_id": self._to_object_id(data["raw_repo_id"]),
+                "raw_build_run_id": self._to_object_id(data["raw_build_run_id"]),
+                "extraction_status": ExtractionStatus.PENDING.value,
+                "ci_run_id": data.get("ci_run_id", ""),
+                "commit_sha": data.get("commit_sha", ""),
+                "repo_full_name": data.get("repo_full_name", ""),
+                "created_at": now,
+            }
+            for field in ("outcome", "group_value", "build_started_at"):
+                if data.get(field) is not None:
+                    doc[field] = data[field]
             documents.append(doc)
 
-        inserted = self.insert_many(documents)
-        return len(inserted)
+        # Unordered: the server keeps inserting past a failed row (e.g. a
+        # duplicate on unique_scenario_ingestion_build left by a retried task)
+        # instead of stopping.
+        try:
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as exc:
+            if any(e.get("code") != 11000 for e in exc.details.get("writeErrors", [])):
+                raise
+
+        # Resolve ids through unique_scenario_ingestion_build, so duplicates
+        # map to the builds that already existed
+        ingestion_build_ids = [doc["ingestion_build_id"] for doc in documents]
+        ids: Dict[str, ObjectId] = {}
+        for i in range(0, len(ingestion_build_ids), ID_BATCH_SIZE):
+            for doc in self.collection.find(
+                {
+                    "scenario_id": scenario_oid,
+                    "ingestion_build_id": {"$in": ingestion_build_ids[i : i + ID_BATCH_SIZE]},
+                },
+                {"ingestion_build_id": 1},
+            ):
+                ids[str(doc["ingestion_build_id"])] = doc["_id"]
+        return ids
 
     def upsert_for_ingestion_build(
         self,
@@ -129,20 +275,15 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
         """
         Create or get existing enrichment build for an ingestion build.
 
-        Returns existing enrichment build if already created.
+        Returns existing enrichment build if already created. Single atomic
+        upsert, so concurrent workers cannot create duplicates.
         """
-        existing = self.find_one(
-            {
-                "scenario_id": self._to_object_id(scenario_id),
-                "ingestion_build_id": self._to_object_id(ingestion_build_id),
-            }
-        )
-        if existing:
-            return existing
-
+        query = {
+            "scenario_id": self._to_object_id(scenario_id),
+            "ingestion_build_id": self._to_object_id(ingestion_build_id),
+        }
         doc = TrainingEnrichmentBuild(
-            scenario_id=self._to_object_id(scenario_id),
-            ingestion_build_id=self._to_object_id(ingestion_build_id),
+            **query,
             raw_repo_id=self._to_object_id(raw_repo_id),
             raw_build_run_id=self._to_object_id(raw_build_run_id),
             ci_run_id=ci_run_id,
@@ -152,21 +293,31 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
             build_started_at=build_started_at,
             extraction_status=ExtractionStatus.PENDING,
         )
-        return self.insert_one(doc)
+        on_insert = doc.model_dump(by_alias=True, exclude_none=True, exclude=set(query))
+        result = self.collection.find_one_and_update(
+            query,
+            {"$setOnInsert": on_insert},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._to_model(result)
 
-    def aggregate_stats_by_scenario(self, scenario_id: str) -> Dict[str, int]:
+    def aggregate_stats_by_scenario(self, scenario_id: str) -> Dict[str, Any]:
         """
-        Aggregate extraction status stats for a scenario.
+        Aggregate extraction status and split stats for a scenario.
 
         Returns:
-            Dict with keys: completed, partial, failed, pending
+            Dict with keys: completed, partial, failed, pending, and splits
+            (split_assignment -> count; empty until a dataset is generated)
         """
-        status_counts = self.count_by_extraction_status(scenario_id)
+        stats = self.get_scenario_stats(scenario_id)
+        status_counts = stats["by_status"]
         return {
             "completed": status_counts.get(ExtractionStatus.COMPLETED.value, 0),
             "partial": status_counts.get(ExtractionStatus.PARTIAL.value, 0),
             "failed": status_counts.get(ExtractionStatus.FAILED.value, 0),
             "pending": status_counts.get(ExtractionStatus.PENDING.value, 0),
+            "splits": stats["by_split"],
         }
 
     def update_extraction_status(
@@ -190,6 +341,41 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
 
         return self.update_one(enrichment_build_id, updates)
 
+    def bulk_update_extraction_status(
+        self,
+        updates: List[Tuple[str | ObjectId, ExtractionStatus, Optional[str]]],
+    ) -> int:
+        """
+        Update extraction status for many enrichment builds in one round-trip.
+
+        Args:
+            updates: List of (enrichment_build_id, extraction_status, error_message)
+
+        Returns:
+            Number of builds modified
+        """
+        if not updates:
+            return 0
+
+        now = datetime.utcnow()
+        operations = []
+        for enrichment_build_id, extraction_status, error_message in updates:
+            set_fields: Dict[str, Any] = {"extraction_status": extraction_status.value}
+            if extraction_status == ExtractionStatus.COMPLETED:
+                set_fields["enriched_at"] = now
+            if error_message:
+                set_fields["extraction_error"] = error_message
+            operations.append(
+                UpdateOne(
+                    {"_id": self._to_object_id(enrichment_build_id)},
+                    {"$set": set_fields},
+                )
+            )
+
+        # Unordered: one failed op should not block the rest of the batch
+        result = self.collection.bulk_write(operations, ordered=False)
+        return result.modified_count
+
     def assign_splits(
         self,
         scenario_id: str,
@@ -206,20 +392,19 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
         Returns:
             Total number of builds updated
         """
-        total_updated = 0
-
-        for split_type, enrichment_build_ids in assignments.items():
-            if not enrichment_build_ids:
-                continue
-
-            object_ids = [self._to_object_id(bid) for bid in enrichment_build_ids]
-            result = self.collection.update_many(
-                {"_id": {"$in": object_ids}},
+        operations = [
+            UpdateMany(
+                {"_id": {"$in": [self._to_object_id(bid) for bid in enrichment_build_ids]}},
                 {"$set": {"split_assignment": split_type}},
             )
-            total_updated += result.modified_count
+            for split_type, enrichment_build_ids in assignments.items()
+            if enrichment_build_ids
+        ]
+        if not operations:
+            return 0
 
-        return total_updated
+        result = self.collection.bulk_write(operations, ordered=False)
+        return result.modified_count
 
     def get_completed_with_features(
         self,
@@ -238,24 +423,39 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
     def find_by_scenario_with_features(
         self,
         scenario_id: str,
+        feature_names: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Get all enrichment builds joined with their FeatureVector data.
 
+        Args:
+            scenario_id: Scenario ID
+            feature_names: If given (and all plain field names), only these
+                feature keys are pulled from FeatureVector (scan_metrics is omitted)
+
         Returns:
             List of dictionaries containing build data + 'features' + 'scan_metrics' from FeatureVector.
         """
+        lookup: Dict[str, Any] = {
+            "from": "feature_vectors",
+            "localField": "feature_vector_id",
+            "foreignField": "_id",
+            "as": "fv",
+        }
+        # Names come from the request; only project plain field names ("$"/"."
+        # or empty would break the pipeline), otherwise join the whole vector
+        if feature_names and all(
+            name and "." not in name and "$" not in name for name in feature_names
+        ):
+            # Trim the joined document server-side instead of shipping every feature
+            lookup["pipeline"] = [
+                {"$project": {f"features.{name}": 1 for name in feature_names}}
+            ]
+
         pipeline = [
             {"$match": {"scenario_id": self._to_object_id(scenario_id)}},
             # Only join if feature_vector_id exists
-            {
-                "$lookup": {
-                    "from": "feature_vectors",
-                    "localField": "feature_vector_id",
-                    "foreignField": "_id",
-                    "as": "fv",
-                }
-            },
+            {"$lookup": lookup},
             {"$unwind": {"path": "$fv", "preserveNullAndEmptyArrays": True}},
             {
                 "$project": {
@@ -281,27 +481,48 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
         return list(self.collection.aggregate(pipeline))
 
     def count_by_extraction_status(self, scenario_id: str) -> Dict[str, int]:
-        """Get count of builds by extraction status."""
-        pipeline = [
-            {"$match": {"scenario_id": self._to_object_id(scenario_id)}},
-            {"$group": {"_id": "$extraction_status", "count": {"$sum": 1}}},
-        ]
-        results = self.aggregate(pipeline)
-        return {r["_id"]: r["count"] for r in results}
+        """
+        Get count of builds by extraction status.
+
+        Pinned to scn_status_created_refs: both fields are its leading keys,
+        so the group is answered from the index without fetching documents.
+        """
+        return self.count_by_field(
+            {"scenario_id": self._to_object_id(scenario_id)},
+            "extraction_status",
+            hint=self._hint("scn_status_created_refs"),
+        )
+
+    def get_scenario_stats(self, scenario_id: str) -> Dict[str, Dict[str, int]]:
+        """
+        Get extraction status and split counts for a scenario in one aggregation.
 
-    def count_by_split(self, scenario_id: str) -> Dict[str, int]:
-        """Get count of builds by split assignment."""
+        One round-trip and one scan of the scenario's builds, instead of a
+        separate group per field.
+
+        Returns:
+            Dict with "by_status" and "by_split" count maps
+        """
         pipeline = [
+            {"$match": {"scenario_id": self._to_object_id(scenario_id)}},
             {
-                "$match": {
-                    "scenario_id": self._to_object_id(scenario_id),
-                    "split_assignment": {"$ne": None},
+                "$facet": {
+                    "by_status": [
+                        {"$group": {"_id": "$extraction_status", "count": {"$sum": 1}}},
+                    ],
+                    "by_split": [
+                        {"$match": {"split_assignment": {"$ne": None}}},
+                        {"$group": {"_id": "$split_assignment", "count": {"$sum": 1}}},
+                    ],
                 }
             },
-            {"$group": {"_id": "$split_assignment", "count": {"$sum": 1}}},
         ]
         results = self.aggregate(pipeline)
-        return {r["_id"]: r["count"] for r in results}
+        facet = results[0] if results else {}
+        return {
+            name: {r["_id"]: r["count"] for r in facet.get(name, [])}
+            for name in ("by_status", "by_split")
+        }
 
     def delete_by_scenario(self, scenario_id: str) -> int:
         """Delete all enrichment builds for a scenario."""
@@ -329,50 +550,52 @@ class TrainingEnrichmentBuildRepository(BaseRepository[TrainingEnrichmentBuild])
         Returns:
             Number of FeatureVector documents updated.
         """
-        from app.entities.enums import FeatureVectorScope
+        # Write to FeatureVector.scan_metrics with prefix; built once and shared
+        # by every chunk's update_many
+        set_ops = {f"scan_metrics.{prefix}{k}": v for k, v in scan_features.items()}
+        set_ops["updated_at"] = datetime.utcnow()
 
-        # Find all enrichment builds in this scenario with matching commit
-        # and get their feature_vector_id
-        pipeline = [
-            {"$match": {"scenario_id": scenario_id, "commit_sha": commit_sha}},
-            {"$match": {"feature_vector_id": {"$ne": None}}},
-            # Verify feature vector is in TRAINING_SCENARIO scope
+        # Feature vectors of builds in this scenario sharing the commit, streamed
+        # from the scn_commit_fv index (covered, no document fetch) so memory
+        # stays bounded by ID_BATCH_SIZE however many builds share the commit
+        cursor = self.collection.find(
             {
-                "$lookup": {
-                    "from": "feature_vectors",
-                    "localField": "feature_vector_id",
-                    "foreignField": "_id",
-                    "as": "fv",
-                }
-            },
-            {"$unwind": "$fv"},
-            {
-                "$match": {
-                    "fv.scope": FeatureVectorScope.DATASET.value,
-                    "fv.config_id": scenario_id,
-                }
+                "scenario_id": scenario_id,
+                "commit_sha": commit_sha,
+                "feature_vector_id": {"$ne": None},
             },
-            {"$project": {"feature_vector_id": 1}},
-        ]
-
-        matching_docs = list(self.collection.aggregate(pipeline))
-        feature_vector_ids = [
-            doc["feature_vector_id"]
-            for doc in matching_docs
-            if doc.get("feature_vector_id")
-        ]
-
-        if not feature_vector_ids:
-            return 0
+            {"_id": 0, "feature_vector_id": 1},
+        ).batch_size(ID_BATCH_SIZE)
+
+        # Scope/config check in the filter replaces the former $lookup verification
+        fv_collection = self.db["feature_vectors"]
+        modified = 0
+        chunk: List[ObjectId] = []
+        for doc in cursor:
+            chunk.append(doc["feature_vector_id"])
+            if len(chunk) < ID_BATCH_SIZE:
+                continue
+            modified += self._set_scan_metrics(fv_collection, chunk, scenario_id, set_ops)
+            chunk = []
+        if chunk:
+            modified += self._set_scan_metrics(fv_collection, chunk, scenario_id, set_ops)
 
-        # Write to FeatureVector.scan_metrics with prefix
-        set_ops = {f"scan_metrics.{prefix}{k}": v for k, v in scan_features.items()}
-        set_ops["updated_at"] = datetime.utcnow()
+        return modified
 
-        feature_vectors_collection = self.db["feature_vectors"]
-        result = feature_vectors_collection.update_many(
-            {"_id": {"$in": feature_vector_ids}},
+    @staticmethod
+    def _set_scan_metrics(
+        fv_collection: Collection,
+        feature_vector_ids: List[ObjectId],
+        scenario_id: ObjectId,
+        set_ops: Dict[str, Any],
+    ) -> int:
+        """Apply one backfill chunk to the scenario's dataset-scoped feature vectors."""
+        result = fv_collection.update_many(
+            {
+                "_id": {"$in": feature_vector_ids},
+                "scope": FeatureVectorScope.DATASET.value,
+                "config_id": scenario_id,
+            },
             {"$set": set_ops},
         )
-
         return result.modified_count
@@ -5,9 +5,12 @@ Tracks builds through the training pipeline ingestion phase.
 Unified from DatasetImportBuildRepository and MLScenarioImportBuildRepository.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 from pymongo.database import Database
 
 from app.entities.training_ingestion_build import (
@@ -16,7 +19,18 @@ from app.entities.training_ingestion_build import (
     TrainingIngestionBuild,
 )
 
-from .base import BaseRepository
+from .base import BaseRepository, create_indexes_once
+
+
+@dataclass(frozen=True)
+class PendingIngestionBuild:
+    """Ids and references of a pending ingestion build, read from the index alone."""
+
+    id: ObjectId
+    scenario_id: ObjectId
+    raw_repo_id: Optional[ObjectId]
+    raw_build_run_id: Optional[ObjectId]
+    created_at: Optional[datetime]
 
 
 class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
@@ -24,6 +38,35 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
 
     def __init__(self, db: Database):
         super().__init__(db, "training_ingestion_builds", TrainingIngestionBuild)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # find_by_scenario without filters: equality, then (created_at, _id) sort
+            IndexModel(
+                [
+                    ("scenario_id", ASCENDING),
+                    ("created_at", ASCENDING),
+                    ("_id", ASCENDING),
+                ],
+                name="scenario_created",
+            ),
+            # find_by_scenario by status; the trailing refs make
+            # find_pending_for_ingestion a covered query
+            IndexModel(
+                [
+                    ("scenario_id", ASCENDING),
+                    ("status", ASCENDING),
+                    ("created_at", ASCENDING),
+                    ("_id", ASCENDING),
+                    ("raw_repo_id", ASCENDING),
+                    ("raw_build_run_id", ASCENDING),
+                ],
+                name="scn_status_created_refs",
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def find_by_scenario(
         self,
@@ -31,6 +74,7 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
         status_filter: Optional[IngestionStatus] = None,
         skip: int = 0,
         limit: int = 0,
+        after: Optional[str] = None,
     ) -> tuple[list[TrainingIngestionBuild], int]:
         """
         Find all ingestion builds for a scenario.
@@ -38,8 +82,9 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
         Args:
             scenario_id: Scenario ID to filter by
             status_filter: Optional status filter
-            skip: Pagination offset
+            skip: Pagination offset (ignored when `after` is given)
             limit: Max results
+            after: Keyset cursor from the previous page (see encode_cursor)
 
         Returns:
             Tuple of (ingestion_builds, total_count)
@@ -50,76 +95,104 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
         if status_filter:
             query["status"] = status_filter.value
 
-        return self.paginate(
+        hint = self._hint("scn_status_created_refs" if status_filter else "scenario_created")
+
+        if after:
+            return self.paginate_keyset(query, after=after, limit=limit, hint=hint)
+
+        return self.paginate_facet(
             query,
-            sort=[("created_at", 1)],
+            sort=[("created_at", 1), ("_id", 1)],
             skip=skip,
             limit=limit,
+            hint=hint,
         )
 
     def find_pending_for_ingestion(
         self,
         scenario_id: str,
         batch_size: int = 50,
-    ) -> List[TrainingIngestionBuild]:
+    ) -> List[PendingIngestionBuild]:
         """
-        Get builds ready for ingestion (status=PENDING).
+        Get the ids and references of ingestion builds ready for ingestion.
 
-        Args:
-            scenario_id: Scenario ID
-            batch_size: Max builds to return
-
-        Returns:
-            List of pending ingestion builds
+        Covered by scn_status_created_refs: no document is fetched. Load the
+        full build by id when more than the references is needed.
         """
-        return self.find_many(
+        cursor = self.collection.find(
             {
                 "scenario_id": self._to_object_id(scenario_id),
                 "status": IngestionStatus.PENDING.value,
             },
-            sort=[("created_at", 1)],
+            {
+                "_id": 1,
+                "scenario_id": 1,
+                "created_at": 1,
+                "raw_repo_id": 1,
+                "raw_build_run_id": 1,
+            },
+            sort=[("created_at", 1), ("_id", 1)],
             limit=batch_size,
         )
+        hint = self._hint("scn_status_created_refs")
+        if hint:
+            cursor = cursor.hint(hint)
+        return [
+            PendingIngestionBuild(
+                id=doc["_id"],
+                scenario_id=doc["scenario_id"],
+                raw_repo_id=doc.get("raw_repo_id"),
+                raw_build_run_id=doc.get("raw_build_run_id"),
+                created_at=doc.get("created_at"),
+            )
+            for doc in cursor
+        ]
 
     def bulk_create_from_raw_builds(
         self,
         scenario_id: str,
         raw_build_data: List[Dict[str, Any]],
-    ) -> int:
+    ) -> List[ObjectId]:
         """
         Bulk create ingestion builds from raw build run data.
 
         Args:
             scenario_id: Scenario ID
             raw_build_data: List of dicts with raw_repo_id, raw_build_run_id,
-                           ci_run_id, commit_sha, repo_full_name, github_repo_id
+                           ci_run_id, commit_sha, repo_full_name, github_repo_id,
+                           required_resources
 
         Returns:
-            Number of builds created
+            Ids of the created builds, in input order
         """
         if not raw_build_data:
-            return 0
+            return []
 
+        # Plain dicts skip per-row entity validation/model_dump; they must stay
+        # in the shape TrainingIngestionBuild.model_dump(exclude_none=True) gives.
         scenario_oid = self._to_object_id(scenario_id)
+        now = datetime.utcnow()
         documents = []
 
         for build_data in raw_build_data:
-            doc = TrainingIngestionBuild(
-                scenario_id=scenario_oid,
-                raw_repo_id=build_data["raw_repo_id"],
-                raw_build_run_id=build_data["raw_build_run_id"],
-                ci_run_id=build_data.get("ci_run_id", ""),
-                commit_sha=build_data.get("commit_sha", ""),
-                repo_full_name=build_data.get("repo_full_name", ""),
-                github_repo_id=build_data.get("github_repo_id"),
-                status=IngestionStatus.PENDING,
-                resource_status={},
-                required_resources=build_data.get("required_resources", []),
-            )
+            doc: Dict[str, Any] = {
+                "scenario_id": scenario_oid,
+                "raw_repo_id": self._to_object_id(build_data["raw_repo_id"]),
+                "raw_build_run_id": self._to_object_id(build_data["raw_build_run_id"]),
+                "status": IngestionStatus.PENDING.value,
+                "resource_status": {},
+                "required_resources": build_data.get("required_resources", []),
+                "ci_run_id": build_data.get("ci_run_id", ""),
+                "commit_sha": build_data.get("commit_sha", ""),
+                "repo_full_name": build_data.get("repo_full_name", ""),
+                "created_at": now,
+            }
+            if build_data.get("github_repo_id") is not None:
+                doc["github_repo_id"] = build_data["github_repo_id"]
             documents.append(doc)
 
-        inserted = self.insert_many(documents)
-        return len(inserted)
+        result = self.collection.insert_many(documents, ordered=False)
+        return result.inserted_ids
 
     def update_status(
         self,
@@ -128,12 +201,13 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
         error_message: Optional[str] = None,
     ) -> Optional[TrainingIngestionBuild]:
         """Update ingestion build status."""
+        now = datetime.utcnow()
         updates: Dict[str, Any] = {"status": status.value}
 
         if status == IngestionStatus.INGESTING:
-            updates["ingestion_started_at"] = datetime.utcnow()
+            updates["ingestion_started_at"] = now
         elif status == IngestionStatus.INGESTED:
-            updates["ingested_at"] = datetime.utcnow()
+            updates["ingested_at"] = now
 
         if error_message is not None:
             updates["ingestion_error"] = error_message
@@ -159,25 +233,118 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
         Returns:
             True if update succeeded
         """
-        now = datetime.utcnow()
+        result = self.collection.update_one(
+            {"_id": self._to_object_id(ingestion_build_id)},
+            self._resource_status_update(resource_name, resource_status, error_message),
+        )
+        return result.modified_count > 0
 
-        update_fields = {
-            f"resource_status.{resource_name}.status": resource_status.value,
-        }
+    @staticmethod
+    def _resource_status_update(
+        resource: str,
+        status: ResourceStatus,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Update document moving one resource to `status`.
 
-        if resource_status == ResourceStatus.IN_PROGRESS:
-            update_fields[f"resource_status.{resource_name}.started_at"] = now
-        elif resource_status in (ResourceStatus.COMPLETED, ResourceStatus.FAILED):
-            update_fields[f"resource_status.{resource_name}.completed_at"] = now
+        started_at/completed_at are stamped by the server ($currentDate) so
+        they stay consistent across workers regardless of local clocks.
+        """
+        prefix = f"resource_status.{resource}"
+        update: Dict[str, Any] = {"$set": {f"{prefix}.status": status.value}}
 
-        if error_message:
-            update_fields[f"resource_status.{resource_name}.error"] = error_message
+        if status == ResourceStatus.IN_PROGRESS:
+            update["$currentDate"] = {f"{prefix}.started_at": True}
+        elif status in (ResourceStatus.COMPLETED, ResourceStatus.FAILED):
+            update["$currentDate"] = {f"{prefix}.completed_at": True}
 
-        result = self.collection.update_one(
-            {"_id": self._to_object_id(ingestion_build_id)},
-            {"$set": update_fields},
+        if error:
+            update["$set"][f"{prefix}.error"] = error
+
+        return update
+
+    def resolve_ingesting_builds(self, scenario_id: str) -> int:
+        """
+        Move every INGESTING build of a scenario to its final status.
+
+        - FAILED: git_history failed for any build (clone is shared, so all
+          builds fail), or this build's git_worktree failed (retryable)
+        - MISSING_RESOURCE: build_logs failed, i.e. logs expired (not retryable)
+        - INGESTED: all required resources completed
+
+        The per-build outcome is computed server-side from resource_status in a
+        single pipeline update, instead of one update_many per outcome.
+
+        Returns:
+            Number of builds updated
+        """
+        scenario_oid = self._to_object_id(scenario_id)
+        query = {"scenario_id": scenario_oid, "status": IngestionStatus.INGESTING.value}
+        now = datetime.utcnow()
+
+        clone_failed = self.collection.find_one(
+            {**query, "resource_status.git_history.status": ResourceStatus.FAILED.value},
+            {"_id": 1},
         )
-        return result.modified_count > 0
+        if clone_failed:
+            result = self.collection.update_many(
+                query,
+                {
+                    "$set": {
+                        "status": IngestionStatus.FAILED.value,
+                        "ingestion_error": "Clone failed",
+                        "ingested_at": now,
+                    }
+                },
+            )
+            return result.modified_count
+
+        def failed(resource: str) -> Dict[str, Any]:
+            return {"$eq": [f"$resource_status.{resource}.status", ResourceStatus.FAILED.value]}
+
+        result = self.collection.update_many(
+            query,
+            [
+                {
+                    "$set": {
+                        "status": {
+                            "$switch": {
+                                "branches": [
+                                    {
+                                        "case": failed("git_worktree"),
+                                        "then": IngestionStatus.FAILED.value,
+                                    },
+                                    {
+                                        "case": failed("build_logs"),
+                                        "then": IngestionStatus.MISSING_RESOURCE.value,
+                                    },
+                                ],
+                                "default": IngestionStatus.INGESTED.value,
+                            }
+                        },
+                        # Successful builds keep whatever error they had
+                        "ingestion_error": {
+                            "$switch": {
+                                "branches": [
+                                    {
+                                        "case": failed("git_worktree"),
+                                        "then": "Worktree creation failed",
+                                    },
+                                    {
+                                        "case": failed("build_logs"),
+                                        "then": "Log download failed or expired",
+                                    },
+                                ],
+                                "default": "$ingestion_error",
+                            }
+                        },
+                        "ingested_at": now,
+                    }
+                }
+            ],
+        )
+        return result.modified_count
 
     def count_by_status(self, scenario_id: str) -> Dict[str, int]:
         """
@@ -189,12 +356,12 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
         Returns:
             Dict mapping status -> count
         """
-        pipeline = [
-            {"$match": {"scenario_id": self._to_object_id(scenario_id)}},
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-        ]
-        results = self.aggregate(pipeline)
-        return {r["_id"]: r["count"] for r in results}
+        # Index-only: scenario_id and status lead scn_status_created_refs
+        return self.count_by_field(
+            {"scenario_id": self._to_object_id(scenario_id)},
+            "status",
+            hint=self._hint("scn_status_created_refs"),
+        )
 
     def delete_by_scenario(self, scenario_id: str) -> int:
         """Delete all ingestion builds for a scenario."""
@@ -212,25 +379,15 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
         Update resource status for all ingestion builds in a scenario/repo.
         Used when updating status for the whole batch (e.g., git_worktree checkout).
         """
-        now = datetime.utcnow()
         query = {
             "scenario_id": self._to_object_id(scenario_id),
             "raw_repo_id": raw_repo_id,
             "status": IngestionStatus.INGESTING.value,
         }
 
-        update_fields = {
-            f"resource_status.{resource}.status": status.value,
-        }
-        if status == ResourceStatus.IN_PROGRESS:
-            update_fields[f"resource_status.{resource}.started_at"] = now
-        elif status in (ResourceStatus.COMPLETED, ResourceStatus.FAILED):
-            update_fields[f"resource_status.{resource}.completed_at"] = now
-
-        if error:
-            update_fields[f"resource_status.{resource}.error"] = error
-
-        result = self.collection.update_many(query, {"$set": update_fields})
+        result = self.collection.update_many(
+            query, self._resource_status_update(resource, status, error)
+        )
         return result.modified_count
 
     def update_resource_by_commits(
@@ -246,7 +403,6 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
         if not commits:
             return 0
 
-        now = datetime.utcnow()
         query = {
             "scenario_id": self._to_object_id(scenario_id),
             "raw_repo_id": raw_repo_id,
@@ -254,18 +410,9 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
             "status": IngestionStatus.INGESTING.value,
         }
 
-        update_fields = {
-            f"resource_status.{resource}.status": status.value,
-        }
-        if status == ResourceStatus.IN_PROGRESS:
-            update_fields[f"resource_status.{resource}.started_at"] = now
-        elif status in (ResourceStatus.COMPLETED, ResourceStatus.FAILED):
-            update_fields[f"resource_status.{resource}.completed_at"] = now
-
-        if error:
-            update_fields[f"resource_status.{resource}.error"] = error
-
-        result = self.collection.update_many(query, {"$set": update_fields})
+        result = self.collection.update_many(
+            query, self._resource_status_update(resource, status, error)
+        )
         return result.modified_count
 
     def update_resource_by_ci_run_ids(
@@ -281,7 +428,6 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
         if not ci_run_ids:
             return 0
 
-        now = datetime.utcnow()
         query = {
             "scenario_id": self._to_object_id(scenario_id),
             "raw_repo_id": raw_repo_id,
@@ -289,16 +435,7 @@ class TrainingIngestionBuildRepository(BaseRepository[TrainingIngestionBuild]):
             "status": IngestionStatus.INGESTING.value,
         }
 
-        update_fields = {
-            f"resource_status.{resource}.status": status.value,
-        }
-        if status == ResourceStatus.IN_PROGRESS:
-            update_fields[f"resource_status.{resource}.started_at"] = now
-        elif status in (ResourceStatus.COMPLETED, ResourceStatus.FAILED):
-            update_fields[f"resource_status.{resource}.completed_at"] = now
-
-        if error:
-            update_fields[f"resource_status.{resource}.error"] = error
-
-        result = self.collection.update_many(query, {"$set": update_fields})
+        result = self.collection.update_many(
+            query, self._resource_status_update(resource, status, error)
+        )
         return result.modified_count
@@ -5,13 +5,32 @@ Provides CRUD and query operations for Training Scenario configurations.
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, UpdateOne
 from pymongo.database import Database
 
 from app.entities.training_scenario import TrainingScenario, ScenarioStatus
 
-from .base import BaseRepository
+from .base import BaseRepository, create_indexes_once
+
+# Statuses of scenarios with pipeline work in flight
+ACTIVE_STATUSES = [
+    ScenarioStatus.QUEUED.value,
+    ScenarioStatus.FILTERING.value,
+    ScenarioStatus.INGESTING.value,
+    ScenarioStatus.PROCESSING.value,
+    ScenarioStatus.SPLITTING.value,
+]
+
+# Counters overwritten by update_statistics / update_statistics_many
+STATISTICS_FIELDS = (
+    "builds_total",
+    "builds_ingested",
+    "builds_features_extracted",
+    "builds_missing_resource",
+    "builds_failed",
+)
 
 
 class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
@@ -19,6 +38,43 @@ class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
 
     def __init__(self, db: Database):
         super().__init__(db, "training_scenarios", TrainingScenario)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            # list_by_user: equality on owner, sorted newest-updated first
+            IndexModel(
+                [
+                    ("created_by", ASCENDING),
+                    ("updated_at", DESCENDING),
+                    ("created_at", DESCENDING),
+                ],
+                name="owner_recent",
+            ),
+            # list_all status filter with the same sort; get_active_scenarios
+            IndexModel(
+                [
+                    ("status", ASCENDING),
+                    ("updated_at", DESCENDING),
+                    ("created_at", DESCENDING),
+                ],
+                name="status_recent",
+            ),
+            # find_by_name; also enforces one scenario name per owner
+            IndexModel(
+                [("created_by", ASCENDING), ("name", ASCENDING)],
+                name="owner_name_unique",
+                unique=True,
+                partialFilterExpression={"created_by": {"$exists": True}},
+            ),
+            # q search over name/description (word match, served by $text)
+            IndexModel(
+                [("name", TEXT), ("description", TEXT)],
+                name="scenario_text",
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def list_by_user(
         self,
@@ -50,14 +106,11 @@ class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
             query["status"] = status_filter.value
 
         if q:
-            query["$or"] = [
-                {"name": {"$regex": q, "$options": "i"}},
-                {"description": {"$regex": q, "$options": "i"}},
-            ]
+            query["$text"] = {"$search": q}
 
-        return self.paginate(
+        return self.paginate_facet(
             query,
-            sort=[("updated_at", -1), ("created_at", -1)],
+            sort=self._list_sort(q),
             skip=skip,
             limit=limit,
         )
@@ -76,18 +129,23 @@ class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
             query["status"] = status_filter.value
 
         if q:
-            query["$or"] = [
-                {"name": {"$regex": q, "$options": "i"}},
-                {"description": {"$regex": q, "$options": "i"}},
-            ]
+            query["$text"] = {"$search": q}
 
-        return self.paginate(
+        return self.paginate_facet(
             query,
-            sort=[("updated_at", -1), ("created_at", -1)],
+            sort=self._list_sort(q),
             skip=skip,
             limit=limit,
         )
 
+    @staticmethod
+    def _list_sort(q: Optional[str]) -> List[tuple]:
+        """Newest-updated first; text matches are ranked by relevance first."""
+        sort: List[tuple] = [("updated_at", -1), ("created_at", -1)]
+        if q:
+            sort.insert(0, ("score", {"$meta": "textScore"}))
+        return sort
+
     def find_by_name(
         self, name: str, user_id: Optional[str] = None
     ) -> Optional[TrainingScenario]:
@@ -99,15 +157,8 @@ class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
 
     def get_active_scenarios(self) -> List[TrainingScenario]:
         """Get scenarios currently being processed (not completed/failed)."""
-        active_statuses = [
-            ScenarioStatus.QUEUED.value,
-            ScenarioStatus.FILTERING.value,
-            ScenarioStatus.INGESTING.value,
-            ScenarioStatus.PROCESSING.value,
-            ScenarioStatus.SPLITTING.value,
-        ]
         return self.find_many(
-            {"status": {"$in": active_statuses}},
+            {"status": {"$in": ACTIVE_STATUSES}},
             sort=[("created_at", 1)],
         )
 
@@ -139,22 +190,59 @@ class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
         builds_missing_resource: Optional[int] = None,
         builds_failed: Optional[int] = None,
     ) -> Optional[TrainingScenario]:
-        """Update scenario statistics counters."""
-        updates: Dict[str, Any] = {"updated_at": datetime.utcnow()}
-
-        if builds_total is not None:
-            updates["builds_total"] = builds_total
-        if builds_ingested is not None:
-            updates["builds_ingested"] = builds_ingested
-        if builds_features_extracted is not None:
-            updates["builds_features_extracted"] = builds_features_extracted
-        if builds_missing_resource is not None:
-            updates["builds_missing_resource"] = builds_missing_resource
-        if builds_failed is not None:
-            updates["builds_failed"] = builds_failed
+        """
+        Overwrite scenario statistics counters with absolute values.
 
+        Use for initialization and final reconciliation only; per-build
+        progress should go through add_build_progress so concurrent workers
+        don't overwrite each other's totals.
+        """
+        updates = self._statistics_set(
+            {
+                "builds_total": builds_total,
+                "builds_ingested": builds_ingested,
+                "builds_features_extracted": builds_features_extracted,
+                "builds_missing_resource": builds_missing_resource,
+                "builds_failed": builds_failed,
+            },
+            datetime.utcnow(),
+        )
         return self.update_one(scenario_id, updates)
 
+    def update_statistics_many(
+        self,
+        updates: List[Tuple[str, Dict[str, Optional[int]]]],
+    ) -> int:
+        """
+        Overwrite statistics counters for several scenarios in one bulk_write.
+
+        Args:
+            updates: List of (scenario_id, stats), where stats takes the same
+                keyword names as update_statistics; None values are skipped
+
+        Returns:
+            Number of scenarios modified
+        """
+        now = datetime.utcnow()
+        return self.flush(
+            [
+                UpdateOne(
+                    {"_id": self._to_object_id(scenario_id)},
+                    {"$set": self._statistics_set(stats, now)},
+                )
+                for scenario_id, stats in updates
+            ]
+        )
+
+    @staticmethod
+    def _statistics_set(stats: Dict[str, Optional[int]], now: datetime) -> Dict[str, Any]:
+        """$set document for the given statistics, dropping None values."""
+        updates: Dict[str, Any] = {"updated_at": now}
+        for field in STATISTICS_FIELDS:
+            if stats.get(field) is not None:
+                updates[field] = stats[field]
+        return updates
+
     def update_split_counts(
         self,
         scenario_id: str,
@@ -171,6 +259,67 @@ class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
         }
         return self.update_one(scenario_id, updates)
 
+    def apply_updates(
+        self,
+        scenario_id: str,
+        ops: List[Dict[str, Dict[str, Any]]],
+    ) -> bool:
+        """
+        Merge several update documents into a single update_one call.
+
+        Args:
+            scenario_id: Scenario ID
+            ops: Update documents, e.g. [{"$inc": {...}}, {"$set": {...}}].
+                Keys of the same operator are merged; later ops win on conflict.
+
+        Returns:
+            True if the scenario was modified
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        for op in ops:
+            for operator, fields in op.items():
+                merged.setdefault(operator, {}).update(fields)
+        if not merged:
+            return False
+
+        result = self.collection.update_one(
+            {"_id": self._to_object_id(scenario_id)}, merged
+        )
+        return result.modified_count > 0
+
+    def flush(self, requests: List[UpdateOne]) -> int:
+        """
+        Execute queued write operations (from the *_op builders) in one bulk_write.
+
+        Returns:
+            Number of scenarios modified
+        """
+        if not requests:
+            return 0
+        result = self.collection.bulk_write(requests, ordered=False)
+        return result.modified_count
+
+    def increment_counter_op(
+        self,
+        scenario_id: str,
+        counter_field: str,
+        increment_by: int = 1,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> UpdateOne:
+        """
+        Build (without executing) an atomic counter increment.
+
+        Args:
+            where: Extra filter conditions; the increment is skipped if they don't match
+        """
+        return UpdateOne(
+            {"_id": self._to_object_id(scenario_id), **(where or {})},
+            {
+                "$inc": {counter_field: increment_by},
+                "$set": {"updated_at": datetime.utcnow()},
+            },
+        )
+
     def increment_counter(
         self,
         scenario_id: str,
@@ -178,26 +327,81 @@ class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
         increment_by: int = 1,
     ) -> bool:
         """Atomically increment a counter field."""
-        result = self.collection.update_one(
+        return self.flush(
+            [self.increment_counter_op(scenario_id, counter_field, increment_by)]
+        ) > 0
+
+    def increment_counters_op(
+        self,
+        scenario_id: str,
+        *,
+        scans_completed: int = 0,
+        scans_failed: int = 0,
+        builds_features_extracted: int = 0,
+        builds_failed: int = 0,
+    ) -> UpdateOne:
+        """Build (without executing) one $inc covering every non-zero counter delta."""
+        deltas = {
+            "scans_completed": scans_completed,
+            "scans_failed": scans_failed,
+            "builds_features_extracted": builds_features_extracted,
+            "builds_failed": builds_failed,
+        }
+        return UpdateOne(
             {"_id": self._to_object_id(scenario_id)},
             {
-                "$inc": {counter_field: increment_by},
+                "$inc": {field: delta for field, delta in deltas.items() if delta},
                 "$set": {"updated_at": datetime.utcnow()},
             },
         )
-        return result.modified_count > 0
+
+    def increment_counters(
+        self,
+        scenario_id: str,
+        *,
+        scans_completed: int = 0,
+        scans_failed: int = 0,
+        builds_features_extracted: int = 0,
+        builds_failed: int = 0,
+    ) -> bool:
+        """
+        Atomically apply several counter deltas in a single update.
+
+        Zero deltas are skipped; returns False without a write if all are zero.
+        """
+        if not (scans_completed or scans_failed or builds_features_extracted or builds_failed):
+            return False
+        op = self.increment_counters_op(
+            scenario_id,
+            scans_completed=scans_completed,
+            scans_failed=scans_failed,
+            builds_features_extracted=builds_features_extracted,
+            builds_failed=builds_failed,
+        )
+        return self.flush([op]) > 0
+
+    def add_build_progress(
+        self,
+        scenario_id: str,
+        extracted: int = 0,
+        failed: int = 0,
+    ) -> bool:
+        """Atomically add a batch of extracted/failed builds to the scenario counters."""
+        return self.increment_counters(
+            scenario_id, builds_features_extracted=extracted, builds_failed=failed
+        )
 
     def increment_scans_completed(self, scenario_id: str, count: int = 1) -> bool:
         """Increment scans_completed counter atomically."""
-        return self.increment_counter(scenario_id, "scans_completed", count)
+        return self.increment_counters(scenario_id, scans_completed=count)
 
     def increment_scans_failed(self, scenario_id: str, count: int = 1) -> bool:
         """Increment scans_failed counter atomically."""
-        return self.increment_counter(scenario_id, "scans_failed", count)
+        return self.increment_counters(scenario_id, scans_failed=count)
 
-    def mark_feature_extraction_completed(self, scenario_id: str) -> bool:
-        """Mark feature extraction as completed."""
-        result = self.collection.update_one(
+    def mark_feature_extraction_completed_op(self, scenario_id: str) -> UpdateOne:
+        """Build (without executing) the feature-extraction-completed update."""
+        return UpdateOne(
             {"_id": self._to_object_id(scenario_id)},
             {
                 "$set": {
@@ -206,11 +410,14 @@ class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
                 }
             },
         )
-        return result.modified_count > 0
 
-    def mark_scan_extraction_completed(self, scenario_id: str) -> bool:
-        """Mark scan extraction as completed (all scans done)."""
-        result = self.collection.update_one(
+    def mark_feature_extraction_completed(self, scenario_id: str) -> bool:
+        """Mark feature extraction as completed."""
+        return self.flush([self.mark_feature_extraction_completed_op(scenario_id)]) > 0
+
+    def mark_scan_extraction_completed_op(self, scenario_id: str) -> UpdateOne:
+        """Build (without executing) the scan-extraction-completed update."""
+        return UpdateOne(
             {"_id": self._to_object_id(scenario_id)},
             {
                 "$set": {
@@ -219,7 +426,29 @@ class TrainingScenarioRepository(BaseRepository[TrainingScenario]):
                 }
             },
         )
-        return result.modified_count > 0
+
+    def mark_scan_extraction_completed(self, scenario_id: str) -> bool:
+        """Mark scan extraction as completed (all scans done)."""
+        return self.flush([self.mark_scan_extraction_completed_op(scenario_id)]) > 0
+
+    def get_scan_progress(self, scenario_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read only the scan counters for a scenario.
+
+        Returns:
+            Dict with scans_total, scans_completed, scans_failed and
+            scan_extraction_completed, or None if the scenario does not exist
+        """
+        return self.collection.find_one(
+            {"_id": self._to_object_id(scenario_id)},
+            {
+                "_id": 0,
+                "scans_total": 1,
+                "scans_completed": 1,
+                "scans_failed": 1,
+                "scan_extraction_completed": 1,
+            },
+        )
 
     def set_scans_total(
         self, scenario_id: str, scans_total: int
@@ -3,22 +3,43 @@
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.collation import Collation
 from pymongo.database import Database
 
 from app.entities.user import User
 
-from .base import BaseRepository
+from .base import BaseRepository, create_indexes_once
 
 
 class UserRepository(BaseRepository[User]):
     """Repository for user entities"""
 
+    # Case-insensitive comparison (strength 2 ignores case, not diacritics)
+    EMAIL_COLLATION = Collation(locale="en", strength=2)
+
     def __init__(self, db: Database):
         super().__init__(db, "users", User)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes for efficient lookups."""
+        indexes = [
+            IndexModel(
+                [("email", ASCENDING)],
+                name="email_ci",
+                collation=self.EMAIL_COLLATION,
+            ),
+        ]
+        create_indexes_once(self.collection, indexes)
 
     def find_by_email(self, email: str) -> Optional[User]:
-        """Find a user by email"""
-        return self.find_one({"email": email})
+        """Find a user by email (case-insensitive, served by the email_ci index)"""
+        doc = self.collection.find_one(
+            {"email": email}, collation=self.EMAIL_COLLATION
+        )
+        return self._to_model(doc)
 
     def list_all(self, search: str = None) -> List[User]:
         """List all users sorted by creation date, optionally filtered by search."""
@@ -45,11 +66,9 @@ class UserRepository(BaseRepository[User]):
 
     def update_user(self, user_id: str, updates: Dict) -> Optional[User]:
         """Update a user's profile"""
-        from bson import ObjectId
-
         updates["updated_at"] = datetime.now(timezone.utc)
         result = self.collection.find_one_and_update(
-            {"_id": ObjectId(user_id)},
+            {"_id": self.ensure_object_id(user_id)},
             {"$set": updates},
             return_document=True,
         )
@@ -57,9 +76,7 @@ class UserRepository(BaseRepository[User]):
 
     def delete_user(self, user_id: str) -> bool:
         """Delete a user by ID"""
-        from bson import ObjectId
-
-        result = self.collection.delete_one({"_id": ObjectId(user_id)})
+        result = self.collection.delete_one({"_id": self.ensure_object_id(user_id)})
         return result.deleted_count > 0
 
     def count_admins(self) -> int:
@@ -77,8 +94,6 @@ class UserRepository(BaseRepository[User]):
         Users are matched by having the repo in their github_accessible_repos list.
         This field is populated during GitHub OAuth sync based on user's GitHub access.
         """
-        from bson import ObjectId
-
         repo_oid = (
             ObjectId(raw_repo_id) if isinstance(raw_repo_id, str) else raw_repo_id
         )
@@ -88,15 +103,13 @@ class UserRepository(BaseRepository[User]):
         self, user_id: str, browser_notifications: Optional[bool] = None
     ) -> Optional[User]:
         """Update user settings (browser_notifications)."""
-        from bson import ObjectId
-
         updates: Dict = {"updated_at": datetime.now(timezone.utc)}
 
         if browser_notifications is not None:
             updates["browser_notifications"] = browser_notifications
 
         result = self.collection.find_one_and_update(
-            {"_id": ObjectId(user_id)},
+            {"_id": self.ensure_object_id(user_id)},
             {"$set": updates},
             return_document=True,
         )
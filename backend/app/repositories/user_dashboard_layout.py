@@ -1,8 +1,10 @@
 """Repository for UserDashboardLayout entities."""
 
+from datetime import datetime
 from typing import Optional
 
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 from app.entities.user_dashboard_layout import UserDashboardLayout
 from app.repositories.base import BaseRepository
@@ -25,18 +27,16 @@ class UserDashboardLayoutRepository(BaseRepository[UserDashboardLayout]):
         layout: UserDashboardLayout,
     ) -> UserDashboardLayout:
         """Upsert dashboard layout for a user."""
-        from datetime import datetime
-
-        doc_dict = layout.model_dump(by_alias=True, exclude_none=True)
+        now = datetime.utcnow()
+        # created_at is left out of $set so it can't conflict with $setOnInsert
+        doc_dict = layout.model_dump(by_alias=True, exclude_none=True, exclude={"created_at"})
         doc_dict["user_id"] = user_id
-        doc_dict["updated_at"] = datetime.utcnow()
-        # Remove created_at from $set to avoid conflict with $setOnInsert
-        doc_dict.pop("created_at", None)
+        doc_dict["updated_at"] = now
 
-        self.collection.update_one(
+        doc = self.collection.find_one_and_update(
             {"user_id": user_id},
-            {"$set": doc_dict, "$setOnInsert": {"created_at": datetime.utcnow()}},
+            {"$set": doc_dict, "$setOnInsert": {"created_at": now}},
             upsert=True,
+            return_document=ReturnDocument.AFTER,
         )
-
-        return self.find_by_user(user_id)
+        return UserDashboardLayout(**doc)
@@ -62,14 +62,15 @@ class AuthService:
 
     def revoke_github_token(self, user_id: str) -> None:
         """Remove stored GitHub access tokens for the current user."""
+        now = datetime.now(timezone.utc)
         result = self.db.oauth_identities.update_many(
             {"user_id": user_id, "provider": "github"},
             {
                 "$set": {
                     "token_status": "revoked",
                     "token_invalid_reason": "user_revoked",
-                    "token_invalidated_at": datetime.now(timezone.utc),
-                    "updated_at": datetime.now(timezone.utc),
+                    "token_invalidated_at": now,
+                    "updated_at": now,
                 },
                 "$unset": {
                     "access_token": "",
@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from typing import List, Optional
 
 from bson import ObjectId
@@ -16,7 +17,10 @@ from app.entities.user_dashboard_layout import (
     UserDashboardLayout,
     WidgetConfig,
 )
-from app.repositories.training_scenario import TrainingScenarioRepository
+from app.repositories.training_scenario import (
+    ACTIVE_STATUSES,
+    TrainingScenarioRepository,
+)
 from app.repositories.user_dashboard_layout import UserDashboardLayoutRepository
 
 
@@ -66,9 +70,9 @@ class DashboardService:
             (successful_builds / total_builds * 100) if total_builds > 0 else 0.0
         )
 
-        # 4. Average duration
+        # 4. Average duration (numeric-only so string/array values never reach $avg)
         pipeline = [
-            {"$match": {**build_filter, "tr_duration": {"$ne": None}}},
+            {"$match": {**build_filter, "tr_duration": {"$type": "number"}}},
             {"$group": {"_id": None, "avg_duration": {"$avg": "$tr_duration"}}},
         ]
         avg_duration_result = list(self.build_collection.aggregate(pipeline))
@@ -93,7 +97,8 @@ class DashboardService:
 
         # 6. Count build sources (shared resource - all users see total count)
         # Per RBAC: only admins manage build_sources, users don't have VIEW_DATASETS permission
-        dataset_count = self.db["build_sources"].count_documents({})
+        # Unfiltered dashboard totals use collection metadata instead of a scan
+        dataset_count = self.db["build_sources"].estimated_document_count()
 
         # 7. Admin extras (only for admin role)
         admin_extras = None
@@ -119,26 +124,14 @@ class DashboardService:
         scenario_collection = self.db["training_scenarios"]
         source_build_collection = self.db["source_builds"]
 
-        active_projects = scenario_collection.count_documents({})
+        active_projects = scenario_collection.estimated_document_count()
         processing_versions = scenario_collection.count_documents(
-            {
-                "status": {
-                    "$in": [
-                        "queued",
-                        "filtering",
-                        "ingesting",
-                        "processing",
-                        "splitting",
-                    ]
-                }
-            }
+            {"status": {"$in": ACTIVE_STATUSES}}
         )
-        total_enriched_builds = source_build_collection.count_documents({})
+        total_enriched_builds = source_build_collection.estimated_document_count()
 
         # Monitoring stats - queue depth and workers
         # We'll use simplified stats here, real stats come from monitoring API
-        from datetime import datetime, timedelta
-
         logs_collection = self.db["system_logs"]
         now = datetime.utcnow()
         day_ago = now - timedelta(hours=24)
@@ -149,7 +142,7 @@ class DashboardService:
 
         # Count users
         users_collection = self.db["users"]
-        total_users = users_collection.count_documents({})
+        total_users = users_collection.estimated_document_count()
 
         return AdminDashboardExtras(
             dataset_enrichment=DatasetEnrichmentStats(
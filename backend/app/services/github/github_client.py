@@ -81,8 +81,6 @@ class GitHubClient:
 
             if remaining is not None:
                 try:
-                    from datetime import datetime, timezone
-
                     self._redis_pool.update_rate_limit(
                         self._current_token_key,
                         int(remaining),
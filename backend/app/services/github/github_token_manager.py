@@ -193,14 +193,15 @@ async def get_valid_github_token(
 async def mark_github_oauth_token_invalid(
     db: Database, identity_id: ObjectId, reason: str = "invalid"
 ) -> None:
+    now = datetime.now(timezone.utc)
     db.oauth_identities.update_one(
         {"_id": identity_id},
         {
             "$set": {
                 "token_status": "invalid",
                 "token_invalid_reason": reason,
-                "token_invalidated_at": datetime.now(timezone.utc),
-                "updated_at": datetime.now(timezone.utc),
+                "token_invalidated_at": now,
+                "updated_at": now,
             }
         },
     )
@@ -12,7 +12,6 @@ from pymongo.database import Database
 from app.celery_app import celery_app
 from app.ci_providers.models import BuildConclusion, BuildStatus, CIProvider
 from app.config import settings
-from app.entities.raw_build_run import RawBuildRun
 from app.repositories.raw_build_run import RawBuildRunRepository
 from app.repositories.raw_repository import RawRepositoryRepository
 
@@ -86,16 +85,16 @@ def _handle_workflow_run_event(
     build_run_repo = RawBuildRunRepository(db)
 
     existing_run = build_run_repo.find_by_business_key(
-        repo_id, build_id, CIProvider.GITHUB
+        repo_id, build_id, CIProvider.GITHUB_ACTIONS.value
     )
 
     if existing_run:
         # Update existing run but don't reprocess (avoid duplicate processing)
         completed_at = workflow_run.get("updated_at")
-        build_run_repo.update_one(
+        build_run_repo.update_by_id(
             str(existing_run.id),
             {
-                "status": BuildStatus.COMPLETED,
+                "status": BuildStatus.COMPLETED.value,
                 "conclusion": workflow_run.get("conclusion"),
                 "completed_at": (
                     datetime.fromisoformat(completed_at.replace("Z", "+00:00"))
@@ -130,38 +129,32 @@ def _handle_workflow_run_event(
         except (ValueError, KeyError):
             conclusion = BuildConclusion.UNKNOWN
 
-        new_run = RawBuildRun(
+        # Upsert (not insert) so sha_any is derived like on every other write path
+        new_run = build_run_repo.upsert_by_business_key(
             raw_repo_id=ObjectId(repo_id),
             build_id=build_id,
+            provider=CIProvider.GITHUB_ACTIONS.value,
             build_number=workflow_run.get("run_number"),
             repo_name=full_name,
             branch=workflow_run.get("head_branch", ""),
             commit_sha=workflow_run.get("head_sha", ""),
-            commit_message=None,
-            commit_author=None,
-            status=status,
-            conclusion=conclusion,
-            created_at=(
+            status=status.value,
+            conclusion=conclusion.value,
+            run_created_at=(
                 datetime.fromisoformat(created_at.replace("Z", "+00:00"))
                 if created_at
                 else datetime.now(timezone.utc)
             ),
-            started_at=None,
-            completed_at=(
+            run_completed_at=(
                 datetime.fromisoformat(completed_at.replace("Z", "+00:00"))
                 if completed_at
                 else datetime.now(timezone.utc)
             ),
-            duration_seconds=None,
             web_url=workflow_run.get("html_url"),
-            logs_url=None,
             logs_available=False,
-            logs_path=None,
-            provider=CIProvider.GITHUB_ACTIONS,
             raw_data=workflow_run,
             is_bot_commit=is_bot,
         )
-        build_run_repo.insert_one(new_run)
 
         # Find ModelRepoConfig for this raw_repo
         from app.repositories.model_repo_config import ModelRepoConfigRepository
@@ -181,9 +174,7 @@ def _handle_workflow_run_event(
             }
 
         repo_config_id = str(repo_config.id)
-        model_repo_config_repo.update_one(
-            {"_id": ObjectId(repo_config_id)}, {"$inc": {"builds_fetched": 1}}
-        )
+        model_repo_config_repo.increment_builds_fetched(repo_config.id)
 
         # Dispatch ingestion task for this single build (webhook flow)
         # This only does ingestion (clone, worktree, logs) - no auto-processing
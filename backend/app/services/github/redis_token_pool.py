@@ -322,12 +322,18 @@ class RedisTokenPool:
         total_remaining = 0
         next_reset = None
 
-        for token_hash, score in token_hashes:
+        # One MGET for every cooldown instead of a GET per token
+        cooldowns = (
+            self._redis.mget([f"{KEY_COOLDOWN}:{token_hash}" for token_hash, _ in token_hashes])
+            if token_hashes
+            else []
+        )
+
+        for (_, score), cooldown_until in zip(token_hashes, cooldowns, strict=True):
             remaining = int(score)
             total_remaining += remaining
 
             # Check cooldown
-            cooldown_until = self._redis.get(f"{KEY_COOLDOWN}:{token_hash}")
             if cooldown_until:
                 cooldown_ts = float(cooldown_until)
                 if cooldown_ts > now_ts:
@@ -355,15 +361,21 @@ class RedisTokenPool:
 
     def get_all_tokens(self) -> List[Dict]:
         """Get all tokens with their stats for UI display."""
-        token_hashes = self._redis.zrevrange(KEY_POOL, 0, -1, withscores=True)
+        token_hashes = [
+            (token_hash.decode() if isinstance(token_hash, bytes) else token_hash, score)
+            for token_hash, score in self._redis.zrevrange(KEY_POOL, 0, -1, withscores=True)
+        ]
+
+        # Fetch every token's stats and raw value in one round trip
+        pipe = self._redis.pipeline(transaction=False)
+        for token_hash, _ in token_hashes:
+            pipe.hgetall(f"{KEY_STATS}:{token_hash}")
+            pipe.hget(KEY_RAW, token_hash)
+        replies = pipe.execute() if token_hashes else []
 
         result = []
-        for token_hash, score in token_hashes:
-            # Handle bytes from Redis
-            if isinstance(token_hash, bytes):
-                token_hash = token_hash.decode()
-
-            stats = self._redis.hgetall(f"{KEY_STATS}:{token_hash}")
+        for i, (token_hash, score) in enumerate(token_hashes):
+            stats, raw_token = replies[2 * i], replies[2 * i + 1]
             # Handle bytes in stats
             stats = {
                 k.decode() if isinstance(k, bytes) else k: (
@@ -372,7 +384,6 @@ class RedisTokenPool:
                 for k, v in stats.items()
             }
 
-            raw_token = self._redis.hget(KEY_RAW, token_hash)
             if isinstance(raw_token, bytes):
                 raw_token = raw_token.decode()
 
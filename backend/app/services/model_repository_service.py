@@ -228,26 +228,39 @@ class RepositoryService:
         limit: int,
         q: Optional[str] = None,
         status: Optional[str] = None,
+        after: Optional[str] = None,
     ) -> RepoListResponse:
-        """List tracked repositories with RBAC access control."""
+        """
+        List tracked repositories with RBAC access control.
+
+        Pass the previous response's next_cursor as `after` to page without skip.
+        """
         user_id = ObjectId(current_user["_id"])
         user_role = current_user.get("role", "user")
         github_accessible_repos = current_user.get("github_accessible_repos", [])
 
-        repos, total = self.repo_config.list_with_access_control(
-            user_id=user_id,
-            user_role=user_role,
-            skip=skip,
-            limit=limit,
-            search_query=q,
-            status_filter=status,
-            github_accessible_repos=github_accessible_repos,
-        )
+        try:
+            repos, total = self.repo_config.list_with_access_control(
+                user_id=user_id,
+                user_role=user_role,
+                skip=skip,
+                limit=limit,
+                search_query=q,
+                status_filter=status,
+                github_accessible_repos=github_accessible_repos,
+                after=after,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
         return RepoListResponse(
             total=total,
             skip=skip,
             limit=limit,
             items=[_serialize_repo(repo) for repo in repos],
+            next_cursor=(
+                self.repo_config.encode_cursor(repos[-1]) if len(repos) == limit else None
+            ),
         )
 
     def discover_repositories(
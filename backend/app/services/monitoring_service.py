@@ -3,7 +3,7 @@ Monitoring Service - Gathers system stats from Celery, Redis, MongoDB.
 """
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 import redis
@@ -226,34 +226,6 @@ class MonitoringService:
             "has_more": skip + limit < total,
         }
 
-    def get_logs_for_export(
-        self,
-        level: Optional[str] = None,
-        source: Optional[str] = None,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-    ) -> list[Dict[str, Any]]:
-        """
-        Get logs for export with optional date filtering.
-        """
-        logs = self._system_log_repo.find_for_export(
-            level=level,
-            source=source,
-            start_date=start_date,
-            end_date=end_date,
-        )
-
-        return [
-            {
-                "timestamp": log.timestamp.isoformat() if log.timestamp else None,
-                "level": log.level,
-                "source": log.source,
-                "message": log.message,
-                "details": log.details,
-            }
-            for log in logs
-        ]
-
     def stream_logs_export(
         self,
         format: str = "csv",
@@ -284,10 +256,14 @@ class MonitoringService:
             end_date=end_date,
         )
 
-        if format == "csv":
-            return stream_csv(cursor, format_log_row)
-        else:
-            return stream_json(cursor, format_log_row)
+        stream = stream_csv if format == "csv" else stream_json
+
+        def _stream():
+            # Close the server cursor as soon as the download ends or is aborted
+            with cursor:
+                yield from stream(cursor, format_log_row)
+
+        return _stream()
 
     def get_log_metrics(
         self,
@@ -306,8 +282,6 @@ class MonitoringService:
         Returns:
             Dict with time_buckets array and level_counts
         """
-        from datetime import timedelta
-
         now = datetime.now(timezone.utc)
         start_time = now - timedelta(hours=hours)
 
@@ -75,9 +75,9 @@ class SonarWebhookService:
             logger.warning(f"SonarQube task not successful: {task_status}")
 
         # Find scan record (pipeline-initiated)
-        scan_record = self.scan_repo.find_pending_by_component_key(component_key)
+        commit_sha = self.scan_repo.find_pending_commit_sha(component_key)
 
-        if scan_record:
+        if commit_sha:
             # Pipeline-initiated scan - use export_metrics_from_webhook
             from app.tasks.sonar import export_metrics_from_webhook
 
@@ -88,13 +88,13 @@ class SonarWebhookService:
 
             logger.info(
                 f"Queued metrics export for pipeline scan: {component_key}, "
-                f"commit {scan_record.commit_sha[:8]}"
+                f"commit {commit_sha[:8]}"
             )
             return {
                 "received": True,
                 "component_key": component_key,
                 "source": "pipeline",
-                "commit_sha": scan_record.commit_sha,
+                "commit_sha": commit_sha,
             }
 
         # No scan record found
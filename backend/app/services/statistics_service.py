@@ -142,8 +142,10 @@ class StatisticsService:
                 scenario_id=scenario_id, distributions={}
             )
 
-        # Get all builds with features from FeatureVector (as dicts)
-        builds = self.build_repo.find_by_scenario_with_features(scenario_id)
+        # Get all builds with the target features from FeatureVector (as dicts)
+        builds = self.build_repo.find_by_scenario_with_features(
+            scenario_id, feature_names=target_features
+        )
 
         distributions: Dict[str, Any] = {}
 
@@ -211,8 +213,10 @@ class StatisticsService:
                 scenario_id=scenario_id, features=[], matrix=[], significant_pairs=[]
             )
 
-        # Get all builds with features from FeatureVector (as dicts)
-        builds = self.build_repo.find_by_scenario_with_features(scenario_id)
+        # Get all builds with the numeric features from FeatureVector (as dicts)
+        builds = self.build_repo.find_by_scenario_with_features(
+            scenario_id, feature_names=numeric_features
+        )
 
         # Build value matrix
         feature_values: Dict[str, List[Optional[float]]] = {
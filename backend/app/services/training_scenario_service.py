@@ -15,6 +15,7 @@ import yaml
 from bson import ObjectId
 from fastapi import HTTPException, status
 from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
 
 from app import paths
 from app.dtos.training_scenario import (
@@ -117,6 +118,7 @@ class TrainingScenarioService:
         parsed_config = self._parse_yaml_config(data.yaml_config)
 
         # Create scenario entity
+        now = datetime.utcnow()
         scenario = TrainingScenario(
             name=data.name,
             description=data.description,
@@ -137,11 +139,18 @@ class TrainingScenarioService:
             output_config=self._parse_output_config(parsed_config.get("output", {})),
             status=ScenarioStatus.QUEUED,
             created_by=ObjectId(user_id),
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
 
-        created = self.scenario_repo.insert_one(scenario)
+        try:
+            created = self.scenario_repo.insert_one(scenario)
+        except DuplicateKeyError:
+            # Lost a race with a concurrent create of the same name
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Scenario with name '{data.name}' already exists",
+            ) from None
 
         # Create scenario directory
         scenario_dir = paths.get_training_scenario_dir(str(created.id))
@@ -224,7 +233,13 @@ class TrainingScenarioService:
             updates["feature_extraction_completed"] = False
             updates["scan_extraction_completed"] = False
 
-        updated = self.scenario_repo.update_one(scenario_id, updates)
+        try:
+            updated = self.scenario_repo.update_one(scenario_id, updates)
+        except DuplicateKeyError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Scenario with name '{data.name}' already exists",
+            ) from None
         return self._to_response(updated)
 
     def delete_scenario(
@@ -528,11 +543,13 @@ class TrainingScenarioService:
         skip: int = 0,
         limit: int = 20,
         status_filter: Optional[str] = None,
+        after: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         List ingestion builds for a scenario (Phase 1).
 
-        Returns TrainingIngestionBuild records with resource status.
+        Returns TrainingIngestionBuild records with resource status. Pass the
+        previous response's next_cursor as `after` to page without skip.
         """
         # Permission check
         self.get_scenario(scenario_id, user_id)
@@ -547,12 +564,18 @@ class TrainingScenarioService:
             except ValueError:
                 pass
 
-        builds, total = self.ingestion_build_repo.find_by_scenario(
-            scenario_id=scenario_id,
-            status_filter=status_enum,
-            skip=skip,
-            limit=limit,
-        )
+        try:
+            builds, total = self.ingestion_build_repo.find_by_scenario(
+                scenario_id=scenario_id,
+                status_filter=status_enum,
+                skip=skip,
+                limit=limit,
+                after=after,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
 
         items = []
         for build in builds:
@@ -584,6 +607,11 @@ class TrainingScenarioService:
             "total": total,
             "page": (skip // limit) + 1 if limit > 0 else 1,
             "size": limit,
+            "next_cursor": (
+                self.ingestion_build_repo.encode_cursor(builds[-1])
+                if limit and len(builds) == limit
+                else None
+            ),
         }
 
     def get_enrichment_build_detail(
@@ -705,11 +733,13 @@ class TrainingScenarioService:
         skip: int = 0,
         limit: int = 20,
         extraction_status: Optional[str] = None,
+        after: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         List enrichment builds for a scenario (Phase 2).
 
-        Returns TrainingEnrichmentBuild records with extraction status.
+        Returns TrainingEnrichmentBuild records with extraction status. Pass the
+        previous response's next_cursor as `after` to page without skip.
         """
         from app.entities.enums import ExtractionStatus
 
@@ -724,12 +754,18 @@ class TrainingScenarioService:
             except ValueError:
                 pass
 
-        builds, total = self.enrichment_build_repo.find_by_scenario(
-            scenario_id=scenario_id,
-            extraction_status=status_enum,
-            skip=skip,
-            limit=limit,
-        )
+        try:
+            builds, total = self.enrichment_build_repo.find_by_scenario(
+                scenario_id=scenario_id,
+                extraction_status=status_enum,
+                skip=skip,
+                limit=limit,
+                after=after,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
 
         # Get expected feature count from scenario
         expected_features = (
@@ -770,6 +806,11 @@ class TrainingScenarioService:
             "total": total,
             "page": (skip // limit) + 1 if limit > 0 else 1,
             "size": limit,
+            "next_cursor": (
+                self.enrichment_build_repo.encode_cursor(builds[-1])
+                if limit and len(builds) == limit
+                else None
+            ),
         }
 
     def get_scan_status(
@@ -51,6 +51,86 @@ from app.tasks.shared.events import publish_ingestion_build_update
 logger = logging.getLogger(__name__)
 
 
+def _raw_build_run_fields(build: Any, full_name: str) -> Dict[str, Any]:
+    """RawBuildRun fields for a fetched CI build (input to bulk_upsert_by_business_key)."""
+    now = datetime.now(timezone.utc)
+    return {
+        "build_number": build.build_number,
+        "repo_name": full_name,
+        "branch": build.branch or "",
+        "commit_sha": build.commit_sha,
+        "commit_message": build.commit_message,
+        "commit_author": build.commit_author,
+        "status": build.status,
+        "conclusion": build.conclusion,
+        "run_created_at": build.created_at or now,
+        "run_started_at": build.started_at,
+        "run_completed_at": build.completed_at or build.created_at or now,
+        "duration_seconds": build.duration_seconds,
+        "web_url": build.web_url,
+        "logs_url": None,
+        "logs_available": build.logs_available or False,
+        "logs_path": None,
+        "raw_data": build.raw_data or {},
+        "is_bot_commit": build.is_bot_commit or False,
+    }
+
+
+def _save_raw_build_runs(
+    build_run_repo: RawBuildRunRepository,
+    raw_repo_id: str,
+    provider: str,
+    builds: List[Any],
+    full_name: str,
+) -> Dict[str, ObjectId]:
+    """Bulk-upsert RawBuildRuns for fetched builds. Returns ci_run_id -> RawBuildRun id."""
+    build_run_repo.bulk_upsert_by_business_key(
+        [
+            (
+                ObjectId(raw_repo_id),
+                build.build_id,
+                provider,
+                _raw_build_run_fields(build, full_name),
+            )
+            for build in builds
+        ]
+    )
+    return {
+        doc["ci_run_id"]: doc["_id"]
+        for doc in build_run_repo.find_ids_by_build_ids(
+            ObjectId(raw_repo_id), [build.build_id for build in builds], provider
+        )
+    }
+
+
+def _is_importable_build(build: Any, log_ctx: str) -> bool:
+    """Completed build with a usable conclusion and a build_id."""
+    if build.status != BuildStatus.COMPLETED:
+        return False
+
+    # Filter out builds that were skipped/cancelled/stale
+    if build.conclusion in (
+        BuildConclusion.SKIPPED,
+        BuildConclusion.ACTION_REQUIRED,
+        BuildConclusion.STALE,
+        BuildConclusion.CANCELLED,
+    ):
+        return False
+
+    if not build.build_id:
+        logger.warning(
+            f"{log_ctx} Skipping build with null build_id: "
+            f"build_number={build.build_number}, "
+            f"status={build.status}, "
+            f"commit_sha={build.commit_sha}, "
+            f"web_url={build.web_url}, "
+            f"raw_data_keys={list(build.raw_data.keys()) if build.raw_data else []}"
+        )
+        return False
+
+    return True
+
+
 @celery_app.task(
     bind=True,
     base=PipelineTask,
@@ -362,69 +442,41 @@ def fetch_builds_until_existing(
             break
 
         # Process builds and count new ones
-        new_on_page = 0
-        existing_on_page = 0
-
-        for build in builds:
-            if build.status != BuildStatus.COMPLETED:
-                continue
-
-            if build.conclusion not in (
-                BuildConclusion.SUCCESS,
-                BuildConclusion.FAILURE,
-            ):
-                continue
-
-            if not build.build_id:
-                continue
-
-            # Check if RawBuildRun already exists - if so, skip it (already imported)
-            existing_run = build_run_repo.find_by_repo_and_build_id(
-                raw_repo_id, build.build_id
+        candidates = [
+            build
+            for build in builds
+            if build.status == BuildStatus.COMPLETED
+            and build.conclusion in (BuildConclusion.SUCCESS, BuildConclusion.FAILURE)
+            and build.build_id
+        ]
+
+        # RawBuildRuns that already exist were imported before - skip them
+        existing_run_ids = {
+            doc["ci_run_id"]
+            for doc in build_run_repo.find_ids_by_build_ids(
+                ObjectId(raw_repo_id),
+                [build.build_id for build in candidates],
+                ci_provider_enum.value,
             )
+        }
+        new_builds = [b for b in candidates if b.build_id not in existing_run_ids]
+        existing_on_page = len(candidates) - len(new_builds)
+        new_on_page = len(new_builds)
 
-            if existing_run:
-                # Build already exists in database, count as existing and skip
-                existing_on_page += 1
-                continue
-
-            # New build - save to RawBuildRun
-            raw_build_run = build_run_repo.upsert_by_business_key(
-                raw_repo_id=ObjectId(raw_repo_id),
-                build_id=build.build_id,
-                provider=ci_provider_enum.value,
-                build_number=build.build_number,
-                repo_name=full_name,
-                branch=build.branch or "",
-                commit_sha=build.commit_sha,
-                commit_message=build.commit_message,
-                commit_author=build.commit_author,
-                status=build.status,
-                conclusion=build.conclusion,
-                run_created_at=build.created_at or datetime.now(timezone.utc),
-                run_started_at=build.started_at,
-                run_completed_at=build.completed_at
-                or build.created_at
-                or datetime.now(timezone.utc),
-                duration_seconds=build.duration_seconds,
-                web_url=build.web_url,
-                logs_url=None,
-                logs_available=build.logs_available or False,
-                logs_path=None,
-                raw_data=build.raw_data or {},
-                is_bot_commit=build.is_bot_commit or False,
-            )
+        # New builds - save to RawBuildRun in one bulk write
+        run_ids = _save_raw_build_runs(
+            build_run_repo, raw_repo_id, ci_provider_enum.value, new_builds, full_name
+        )
 
+        for build in new_builds:
             # Atomic upsert ModelImportBuild
             import_build_repo.upsert_by_business_key(
                 config_id=repo_config_id,
-                raw_build_run_id=str(raw_build_run.id),
+                raw_build_run_id=str(run_ids[build.build_id]),
                 status=ModelImportBuildStatus.FETCHED,
-                ci_run_id=raw_build_run.ci_run_id,
+                ci_run_id=build.build_id,
                 commit_sha=build.commit_sha or "",
             )
-
-            new_on_page += 1
             all_commit_shas.append(build.commit_sha)
             all_ci_run_ids.append(build.build_id)
 
@@ -570,71 +622,36 @@ def fetch_builds_batch(
 
     # Save builds and create ModelImportBuild records
     import_builds_to_insert = []
+    page_builds = []
 
     for build in builds:
-        if build.status != BuildStatus.COMPLETED:
-            continue
-
-        # Filter out builds that were skipped/cancelled/stale
-        if build.conclusion in (
-            BuildConclusion.SKIPPED,
-            BuildConclusion.ACTION_REQUIRED,
-            BuildConclusion.STALE,
-            BuildConclusion.CANCELLED,
-        ):
-            continue
-
-        if not build.build_id:
-            logger.warning(
-                f"{log_ctx} Skipping build with null build_id: "
-                f"build_number={build.build_number}, "
-                f"status={build.status}, "
-                f"commit_sha={build.commit_sha}, "
-                f"web_url={build.web_url}, "
-                f"raw_data_keys={list(build.raw_data.keys()) if build.raw_data else []}"
-            )
-            continue
-
-        # Save to RawBuildRun
-        raw_build_run = build_run_repo.upsert_by_business_key(
-            raw_repo_id=ObjectId(raw_repo_id),
-            build_id=build.build_id,
-            provider=ci_provider_enum.value,
-            build_number=build.build_number,
-            repo_name=full_name,
-            branch=build.branch or "",
-            commit_sha=build.commit_sha,
-            commit_message=build.commit_message,
-            commit_author=build.commit_author,
-            status=build.status,
-            conclusion=build.conclusion,
-            run_created_at=build.created_at or datetime.now(timezone.utc),
-            run_started_at=build.started_at,
-            run_completed_at=build.completed_at
-            or build.created_at
-            or datetime.now(timezone.utc),
-            duration_seconds=build.duration_seconds,
-            web_url=build.web_url,
-            logs_url=None,
-            logs_available=build.logs_available or False,
-            logs_path=None,
-            raw_data=build.raw_data or {},
-            is_bot_commit=build.is_bot_commit or False,
-        )
+        if _is_importable_build(build, log_ctx):
+            page_builds.append(build)
 
-        # Check if ModelImportBuild already exists
-        existing = import_build_repo.find_by_business_key(
-            repo_config_id, str(raw_build_run.id)
+    # Save to RawBuildRun in one bulk write, then resolve ids in one query
+    run_ids = _save_raw_build_runs(
+        build_run_repo, raw_repo_id, ci_provider_enum.value, page_builds, full_name
+    )
+
+    # Skip builds whose ModelImportBuild already exists
+    existing = {
+        str(import_build.raw_build_run_id)
+        for import_build in import_build_repo.find_by_raw_build_run_ids(
+            repo_config_id, [str(run_id) for run_id in run_ids.values()]
         )
-        if existing:
+    }
+
+    for build in page_builds:
+        run_id = run_ids[build.build_id]
+        if str(run_id) in existing:
             continue  # Already created
 
         # Create ModelImportBuild
         import_build = ModelImportBuild(
             model_repo_config_id=ObjectId(repo_config_id),
-            raw_build_run_id=raw_build_run.id,
+            raw_build_run_id=run_id,
             status=ModelImportBuildStatus.FETCHED,
-            ci_run_id=raw_build_run.ci_run_id,
+            ci_run_id=build.build_id,
             commit_sha=build.commit_sha or "",
         )
         import_builds_to_insert.append(import_build)
@@ -1282,7 +1299,7 @@ def reingest_failed_builds(
     reset_count = 0
     for import_build in failed_builds:
         try:
-            import_build_repo.update_one(
+            import_build_repo.update_by_id(
                 str(import_build.id),
                 {
                     "status": ModelImportBuildStatus.FETCHED.value,
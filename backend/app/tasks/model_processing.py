@@ -639,7 +639,7 @@ def process_workflow_run(
 
     raw_build_run = raw_build_run_repo.find_by_id(model_build.raw_build_run_id)
     if not raw_build_run:
-        model_build_repo.update_one(
+        model_build_repo.update_by_id(
             model_build_id,
             {
                 "extraction_status": ExtractionStatus.FAILED.value,
@@ -660,7 +660,7 @@ def process_workflow_run(
 
     def _mark_failed(exc: Exception) -> None:
         """Mark build as FAILED and update stats."""
-        model_build_repo.update_one(
+        model_build_repo.update_by_id(
             build_id,
             {
                 "extraction_status": ExtractionStatus.FAILED.value,
@@ -677,7 +677,7 @@ def process_workflow_run(
         """Feature extraction work function."""
         if state.phase == "START":
             # Mark as IN_PROGRESS
-            model_build_repo.update_one(
+            model_build_repo.update_by_id(
                 build_id, {"extraction_status": ExtractionStatus.IN_PROGRESS.value}
             )
             publish_build_update(
@@ -723,7 +723,7 @@ def process_workflow_run(
         elif result.get("warnings"):
             updates["extraction_error"] = "Warning: " + "; ".join(result["warnings"])
 
-        model_build_repo.update_one(build_id, updates)
+        model_build_repo.update_by_id(build_id, updates)
 
         # Update stats
         if (
@@ -834,7 +834,7 @@ def retry_failed_builds(self: PipelineTask, repo_config_id: str) -> Dict[str, An
     extraction_build_ids = []
     for build in extraction_failed_builds:
         try:
-            model_build_repo.update_one(
+            model_build_repo.update_by_id(
                 str(build.id),
                 {
                     "extraction_status": ExtractionStatus.PENDING.value,
@@ -849,7 +849,7 @@ def retry_failed_builds(self: PipelineTask, repo_config_id: str) -> Dict[str, An
     prediction_only_ids = []
     for build in prediction_failed_builds:
         try:
-            model_build_repo.update_one(
+            model_build_repo.update_by_id(
                 str(build.id),
                 {
                     "prediction_status": ExtractionStatus.PENDING.value,
@@ -970,7 +970,7 @@ def handle_processing_chain_error(
 
     failed_count = 0
     for build in in_progress_builds:
-        model_build_repo.update_one(
+        model_build_repo.update_by_id(
             str(build.id),
             {
                 "extraction_status": ExtractionStatus.FAILED.value,
@@ -1126,7 +1126,7 @@ def predict_builds_batch(
                     continue  # Already predicted
 
                 if not model_build.feature_vector_id:
-                    model_build_repo.update_one(
+                    model_build_repo.update_by_id(
                         build_id,
                         {
                             "prediction_status": ExtractionStatus.FAILED.value,
@@ -1139,7 +1139,7 @@ def predict_builds_batch(
                     model_build.feature_vector_id
                 )
                 if not feature_vector or not feature_vector.features:
-                    model_build_repo.update_one(
+                    model_build_repo.update_by_id(
                         build_id,
                         {
                             "prediction_status": ExtractionStatus.FAILED.value,
@@ -1198,7 +1198,7 @@ def predict_builds_batch(
             builds_to_predict = state.meta["builds_to_predict"]
 
             for build_info in builds_to_predict:
-                model_build_repo.update_one(
+                model_build_repo.update_by_id(
                     build_info["id"],
                     {"prediction_status": ExtractionStatus.IN_PROGRESS.value},
                 )
@@ -1277,24 +1277,17 @@ def predict_builds_batch(
                     if build_info.get("was_previously_failed", False):
                         retried_success_count += 1
 
-                model_build_repo.update_one(build_info["id"], updates)
+                model_build_repo.update_by_id(build_info["id"], updates)
                 publish_build_update(
                     repo_config_id, build_info["id"], updates["prediction_status"]
                 )
 
-            # Update repo config stats
-            if retried_success_count > 0:
-                repo_config_repo.decrement_builds_processing_failed(
-                    ObjectId(repo_config_id), retried_success_count
-                )
-            if new_failure_count > 0:
-                repo_config_repo.increment_builds_processing_failed(
-                    ObjectId(repo_config_id), new_failure_count
-                )
-            if succeeded > 0:
-                repo_config_repo.increment_builds_completed(
-                    ObjectId(repo_config_id), succeeded
-                )
+            # Update repo config stats (one $inc for the whole batch)
+            repo_config_repo.increment_counters(
+                ObjectId(repo_config_id),
+                builds_completed=succeeded,
+                builds_processing_failed=new_failure_count - retried_success_count,
+            )
 
             # Notify UI about repo stats changes
             if retried_success_count > 0 or new_failure_count > 0 or succeeded > 0:
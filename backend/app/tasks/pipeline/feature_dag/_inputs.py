@@ -291,6 +291,9 @@ class BuildRunInput:
         if hasattr(conclusion_value, "value"):
             conclusion_value = conclusion_value.value
         conclusion_str = str(conclusion_value) if conclusion_value else None
+        provider = build_run.provider
+        if hasattr(provider, "value"):
+            provider = provider.value
 
         return cls(
             ci_run_id=build_run.ci_run_id,
@@ -303,7 +306,7 @@ class BuildRunInput:
             completed_at=build_run.completed_at,
             duration_seconds=build_run.duration_seconds,
             raw_data=build_run.raw_data or {},
-            ci_provider=build_run.provider.value,
+            ci_provider=provider,
         )
 
 
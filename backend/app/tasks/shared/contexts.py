@@ -64,14 +64,14 @@ class ModelPipelineContext:
         from app.repositories.model_import_build import ModelImportBuildRepository
 
         repo = ModelImportBuildRepository(db)
-        repo.update_one(build_id, {"status": ModelImportBuildStatus.INGESTED.value})
+        repo.update_by_id(build_id, {"status": ModelImportBuildStatus.INGESTED.value})
 
     def mark_build_failed(self, db: Any, build_id: str, error: str) -> None:
         from app.entities.model_import_build import ModelImportBuildStatus
         from app.repositories.model_import_build import ModelImportBuildRepository
 
         repo = ModelImportBuildRepository(db)
-        repo.update_one(
+        repo.update_by_id(
             build_id,
             {
                 "status": ModelImportBuildStatus.FAILED.value,
@@ -179,7 +179,7 @@ class TrainingPipelineContext:
         )
 
         repo = TrainingIngestionBuildRepository(db)
-        repo.update_one(build_id, {"status": IngestionBuildStatus.INGESTED.value})
+        repo.update_by_id(build_id, {"status": IngestionBuildStatus.INGESTED.value})
 
     def mark_build_failed(self, db: Any, build_id: str, error: str) -> None:
         from app.entities.training_ingestion_build import IngestionBuildStatus
@@ -188,7 +188,7 @@ class TrainingPipelineContext:
         )
 
         repo = TrainingIngestionBuildRepository(db)
-        repo.update_one(
+        repo.update_by_id(
             build_id,
             {
                 "status": IngestionBuildStatus.FAILED.value,
@@ -0,0 +1,105 @@
+"""
+Batched counter increments for TrainingScenario progress fields.
+
+Workers bump scenario counters once per build. CounterBatcher accumulates
+those deltas in-process and writes them with a single unordered bulk_write
+once max_pending increments are queued or max_delay seconds have passed,
+whichever comes first.
+
+Only use it for counters that tolerate a short delay and are reconciled
+afterwards (e.g. builds_features_extracted, which finalize_scenario_processing
+overwrites). Deltas still queued when a worker is killed are lost, and
+deltas whose update no longer matches are dropped with a warning. Counters
+that are read back right after the increment, such as the scan counters
+checked by check_and_mark_scans_completed, must keep using the synchronous
+TrainingScenarioRepository methods.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo.database import Database
+
+from app.repositories.training_scenario import TrainingScenarioRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBatcher:
+    """Accumulate (scenario_id, field) -> delta and flush them in one bulk_write."""
+
+    def __init__(
+        self,
+        db: Database,
+        max_pending: int = 50,
+        max_delay: float = 2.0,
+        where: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            db: Database handle
+            max_pending: Flush once this many increments are queued
+            max_delay: Flush at most this many seconds after the first queued increment
+            where: Extra filter applied to every update; a scenario that no
+                longer matches (e.g. already finalized) silently drops its deltas
+        """
+        self._repo = TrainingScenarioRepository(db)
+        self._max_pending = max_pending
+        self._max_delay = max_delay
+        self._where = where
+        self._pending: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, scenario_id: str, field: str, count: int = 1) -> None:
+        """Queue an increment of `field` on a scenario."""
+        if not count:
+            return
+        with self._lock:
+            self._pending[(str(scenario_id), field)] += count
+            self._pending_count += 1
+            flush_now = self._pending_count >= self._max_pending
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self._max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all queued deltas now.
+
+        Returns:
+            Number of scenarios modified
+        """
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._pending_count = 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+
+        ops = [
+            self._repo.increment_counter_op(scenario_id, field, delta, where=self._where)
+            for (scenario_id, field), delta in pending.items()
+            if delta
+        ]
+        try:
+            modified = self._repo.flush(ops)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(ops)} scenario counter updates: {e}")
+            return 0
+        if modified < len(ops):
+            # Every matched update modifies (updated_at moves), so the rest missed
+            # the filter: deleted scenario or `where` no longer true
+            logger.warning(
+                f"Dropped {len(ops) - modified} of {len(ops)} scenario counter updates: "
+                f"scenario no longer matches {self._where or 'its id'}"
+            )
+        return modified
@@ -822,7 +822,7 @@ async def _download_log_for_build(
                 return result
             else:
                 logger.info(f"Log files missing for {build_id}, re-downloading...")
-                build_run_repo.update_one(
+                build_run_repo.update_by_id(
                     str(build_run.id),
                     {"logs_available": False, "logs_path": None},
                 )
@@ -836,7 +836,7 @@ async def _download_log_for_build(
 
         if not log_files:
             if build_run:
-                build_run_repo.update_one(
+                build_run_repo.update_by_id(
                     str(build_run.id),
                     {"logs_available": False, "logs_expired": True},
                 )
@@ -863,7 +863,7 @@ async def _download_log_for_build(
 
         if saved_files:
             if build_run:
-                build_run_repo.update_one(
+                build_run_repo.update_by_id(
                     str(build_run.id),
                     {"logs_path": str(build_logs_dir), "logs_available": True},
                 )
@@ -879,7 +879,7 @@ async def _download_log_for_build(
 
     except GithubLogsUnavailableError:
         if build_run:
-            build_run_repo.update_one(
+            build_run_repo.update_by_id(
                 str(build_run.id),
                 {"logs_available": False, "logs_expired": True},
             )
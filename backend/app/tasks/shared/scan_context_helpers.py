@@ -34,8 +34,7 @@ def increment_scan_completed(db: Database, context_id: str) -> bool:
     from app.repositories.training_scenario import TrainingScenarioRepository
 
     scenario_repo = TrainingScenarioRepository(db)
-    scenario = scenario_repo.find_by_id(context_id)
-    if scenario:
+    if scenario_repo.exists(context_id):
         scenario_repo.increment_scans_completed(context_id)
         return True
 
@@ -60,8 +59,7 @@ def increment_scan_failed(db: Database, context_id: str) -> bool:
     from app.repositories.training_scenario import TrainingScenarioRepository
 
     scenario_repo = TrainingScenarioRepository(db)
-    scenario = scenario_repo.find_by_id(context_id)
-    if scenario:
+    if scenario_repo.exists(context_id):
         scenario_repo.increment_scans_failed(context_id)
         return True
 
@@ -87,14 +85,14 @@ def check_and_mark_scans_completed(db: Database, context_id: str) -> bool:
     from app.repositories.training_scenario import TrainingScenarioRepository
 
     scenario_repo = TrainingScenarioRepository(db)
-    scenario = scenario_repo.find_by_id(context_id)
-    if scenario:
-        scans_total = getattr(scenario, "scans_total", 0) or 0
-        scans_completed = getattr(scenario, "scans_completed", 0) or 0
-        scans_failed = getattr(scenario, "scans_failed", 0) or 0
+    progress = scenario_repo.get_scan_progress(context_id)
+    if progress is not None:
+        scans_total = progress.get("scans_total", 0) or 0
+        scans_completed = progress.get("scans_completed", 0) or 0
+        scans_failed = progress.get("scans_failed", 0) or 0
 
         if scans_total > 0 and (scans_completed + scans_failed) >= scans_total:
-            if not getattr(scenario, "scan_extraction_completed", False):
+            if not progress.get("scan_extraction_completed", False):
                 scenario_repo.mark_scan_extraction_completed(context_id)
                 logger.info(f"TrainingScenario {context_id} scan extraction completed")
             return True
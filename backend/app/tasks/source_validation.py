@@ -225,11 +225,7 @@ def validate_build_source_task(self, source_id: str) -> Dict[str, Any]:
 
         # Resume logic: Skip already validated builds
         source_build_repo = SourceBuildRepository(db)
-        validated_builds = {
-            b.build_id_from_source
-            for b in source_build_repo.find_by_source(source_id, limit=100000)
-            if b.build_id_from_source
-        }
+        validated_builds = source_build_repo.get_build_ids_by_source(source_id)
 
         if validated_builds:
             logger.info(
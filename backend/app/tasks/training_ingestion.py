@@ -21,10 +21,7 @@ from bson import ObjectId
 from celery import chord, group
 
 from app.celery_app import celery_app
-from app.entities.training_ingestion_build import (
-    IngestionStatus,
-    TrainingIngestionBuild,
-)
+from app.entities.training_ingestion_build import IngestionStatus
 from app.entities.training_scenario import ScenarioStatus, TrainingScenario
 from app.repositories.raw_build_run import RawBuildRunRepository
 from app.repositories.raw_repository import RawRepositoryRepository
@@ -90,7 +87,7 @@ def start_scenario_ingestion(
         )
 
         if filter_result["status"] == "error":
-            scenario_repo.update_one(
+            scenario_repo.update_by_id(
                 scenario_id,
                 {
                     "status": ScenarioStatus.FAILED.value,
@@ -104,12 +101,13 @@ def start_scenario_ingestion(
         builds_by_repo = filter_result["builds_by_repo"]
 
         # Update status to INGESTING
-        scenario_repo.update_one(
+        now = datetime.utcnow()
+        scenario_repo.update_by_id(
             scenario_id,
             {
                 "status": ScenarioStatus.INGESTING.value,
-                "filtering_started_at": datetime.utcnow(),
-                "ingestion_started_at": datetime.utcnow(),
+                "filtering_started_at": now,
+                "ingestion_started_at": now,
                 "builds_total": builds_total,
                 "current_task_id": self.request.id,
                 "error_message": None,
@@ -133,7 +131,7 @@ def start_scenario_ingestion(
             for build_id in ingestion_build_ids:
                 ingestion_build_repo.update_status(build_id, IngestionStatus.INGESTED)
 
-            scenario_repo.update_one(
+            scenario_repo.update_by_id(
                 scenario_id,
                 {
                     "status": ScenarioStatus.INGESTED.value,
@@ -160,8 +158,10 @@ def start_scenario_ingestion(
         ingestion_chains = []
         repo_metadata = []
 
+        raw_repos = raw_repo_repo.find_map_by_ids(builds_by_repo.keys())
+
         for raw_repo_id, repo_builds in builds_by_repo.items():
-            raw_repo = raw_repo_repo.find_by_id(raw_repo_id)
+            raw_repo = raw_repos.get(ObjectId(raw_repo_id))
             if not raw_repo:
                 logger.warning(
                     f"[start_scenario_ingestion] Repo {raw_repo_id} not found, skipping"
@@ -215,7 +215,7 @@ def start_scenario_ingestion(
             for build_id in ingestion_build_ids:
                 ingestion_build_repo.update_status(build_id, IngestionStatus.INGESTED)
 
-            scenario_repo.update_one(
+            scenario_repo.update_by_id(
                 scenario_id,
                 {
                     "status": ScenarioStatus.INGESTED.value,
@@ -266,7 +266,7 @@ def start_scenario_ingestion(
     except Exception as exc:
         error_msg = str(exc)
         logger.error(f"Scenario ingestion start failed: {error_msg}")
-        scenario_repo.update_one(
+        scenario_repo.update_by_id(
             scenario_id,
             {
                 "status": ScenarioStatus.FAILED.value,
@@ -408,30 +408,30 @@ def _filter_builds_for_scenario(
     ingestion_build_ids = []
     required_resources = ["git_history", "git_worktree", "build_logs"]
 
+    # One unordered insert_many for every IngestionBuild, ids in build order
+    build_data = []
     for build in builds:
         repo = repo_cache.get(str(build.raw_repo_id))
-        repo_id = str(build.raw_repo_id)
-
-        # Create IngestionBuild record
-        ingestion_build = TrainingIngestionBuild(
-            scenario_id=ObjectId(scenario_id),
-            raw_repo_id=build.raw_repo_id,
-            raw_build_run_id=build.id,
-            ci_run_id=build.ci_run_id or "",
-            commit_sha=build.commit_sha or "",
-            repo_full_name=repo.full_name if repo else "",
-            github_repo_id=repo.github_repo_id if repo else None,
-            status=IngestionStatus.PENDING,
-            required_resources=required_resources,
-            resource_status={},
+        build_data.append(
+            {
+                "raw_repo_id": build.raw_repo_id,
+                "raw_build_run_id": build.id,
+                "ci_run_id": build.ci_run_id or "",
+                "commit_sha": build.commit_sha or "",
+                "repo_full_name": repo.full_name if repo else "",
+                "github_repo_id": repo.github_repo_id if repo else None,
+                "required_resources": required_resources,
+            }
         )
+    created_ids = ingestion_build_repo.bulk_create_from_raw_builds(scenario_id, build_data)
 
-        created = ingestion_build_repo.insert_one(ingestion_build)
-        ingestion_build_ids.append(str(created.id))
+    for build, created_id in zip(builds, created_ids, strict=True):
+        repo_id = str(build.raw_repo_id)
+        ingestion_build_ids.append(str(created_id))
 
         # Group for ingestion chains
         build_info = {
-            "ingestion_build_id": str(created.id),
+            "ingestion_build_id": str(created_id),
             "ci_run_id": build.ci_run_id or "",
             "commit_sha": build.commit_sha or "",
         }
@@ -483,80 +483,7 @@ def aggregate_scenario_ingestion(
     now = datetime.utcnow()
 
     # Determine per-build final status from resource_status in DB
-    # FAILED: Any required resource has status = "failed" (actual error - RETRYABLE)
-    # MISSING_RESOURCE: Logs expired (expected - NOT RETRYABLE)
-    # INGESTED: All required resources completed
-
-    # 1. Check if git_history failed (affects ALL builds)
-    git_history_failed = ingestion_build_repo.collection.count_documents(
-        {
-            "scenario_id": ObjectId(scenario_id),
-            "status": IngestionStatus.INGESTING.value,
-            "resource_status.git_history.status": "failed",
-        }
-    )
-
-    if git_history_failed > 0:
-        # Clone failed - mark all as FAILED
-        ingestion_build_repo.collection.update_many(
-            {
-                "scenario_id": ObjectId(scenario_id),
-                "status": IngestionStatus.INGESTING.value,
-            },
-            {
-                "$set": {
-                    "status": IngestionStatus.FAILED.value,
-                    "ingestion_error": "Clone failed",
-                    "ingested_at": now,
-                }
-            },
-        )
-    else:
-        # 2. Mark builds with failed git_worktree as FAILED
-        ingestion_build_repo.collection.update_many(
-            {
-                "scenario_id": ObjectId(scenario_id),
-                "status": IngestionStatus.INGESTING.value,
-                "resource_status.git_worktree.status": "failed",
-            },
-            {
-                "$set": {
-                    "status": IngestionStatus.FAILED.value,
-                    "ingestion_error": "Worktree creation failed",
-                    "ingested_at": now,
-                }
-            },
-        )
-
-        # 3. Mark builds with failed build_logs as MISSING_RESOURCE
-        ingestion_build_repo.collection.update_many(
-            {
-                "scenario_id": ObjectId(scenario_id),
-                "status": IngestionStatus.INGESTING.value,
-                "resource_status.build_logs.status": "failed",
-            },
-            {
-                "$set": {
-                    "status": IngestionStatus.MISSING_RESOURCE.value,
-                    "ingestion_error": "Log download failed or expired",
-                    "ingested_at": now,
-                }
-            },
-        )
-
-        # 4. Mark remaining INGESTING builds as INGESTED
-        ingestion_build_repo.collection.update_many(
-            {
-                "scenario_id": ObjectId(scenario_id),
-                "status": IngestionStatus.INGESTING.value,
-            },
-            {
-                "$set": {
-                    "status": IngestionStatus.INGESTED.value,
-                    "ingested_at": now,
-                }
-            },
-        )
+    ingestion_build_repo.resolve_ingesting_builds(scenario_id)
 
     # Count by status
     status_counts = ingestion_build_repo.count_by_status(scenario_id)
@@ -566,7 +493,7 @@ def aggregate_scenario_ingestion(
     total_builds = ingested + missing_resource + failed
 
     # Update scenario
-    scenario_repo.update_one(
+    scenario_repo.update_by_id(
         scenario_id,
         {
             "status": ScenarioStatus.INGESTED.value,
@@ -678,7 +605,7 @@ def handle_scenario_chord_error(
 
     if ingested_count > 0:
         # Some builds made it through
-        scenario_repo.update_one(
+        scenario_repo.update_by_id(
             scenario_id,
             {
                 "status": ScenarioStatus.INGESTED.value,
@@ -695,7 +622,7 @@ def handle_scenario_chord_error(
         )
     else:
         # No builds made it
-        scenario_repo.update_one(
+        scenario_repo.update_by_id(
             scenario_id,
             {
                 "status": ScenarioStatus.FAILED.value,
@@ -23,6 +23,7 @@ from typing import Any, Dict, List, Optional
 import pandas as pd
 from bson import ObjectId
 from celery import chain
+from celery.signals import worker_process_shutdown
 
 from app import paths
 from app.celery_app import celery_app
@@ -40,10 +41,31 @@ from app.repositories.training_enrichment_build import TrainingEnrichmentBuildRe
 from app.repositories.training_ingestion_build import TrainingIngestionBuildRepository
 from app.repositories.training_scenario import TrainingScenarioRepository
 from app.tasks.base import PipelineTask, SafeTask, TaskState
+from app.tasks.shared.counter_batcher import CounterBatcher
 from app.tasks.shared.events import publish_scenario_update
 
 logger = logging.getLogger(__name__)
 
+# Per-process batcher for builds_features_extracted / builds_failed progress.
+# Deltas only apply while the scenario is PROCESSING: finalize_scenario_processing
+# overwrites both counters, so a late flush must not land on top of its totals.
+_progress_counters: Optional[CounterBatcher] = None
+
+
+def _get_progress_counters(db) -> CounterBatcher:
+    global _progress_counters
+    if _progress_counters is None:
+        _progress_counters = CounterBatcher(
+            db, where={"status": ScenarioStatus.PROCESSING.value}
+        )
+    return _progress_counters
+
+
+@worker_process_shutdown.connect
+def _flush_progress_counters(**kwargs):
+    if _progress_counters is not None:
+        _progress_counters.flush()
+
 
 # ============================================================================
 # PHASE 2: PROCESSING (User-Triggered)
@@ -87,7 +109,7 @@ def start_scenario_processing(
         }
 
     # Update status to PROCESSING
-    scenario_repo.update_one(
+    scenario_repo.update_by_id(
         scenario_id,
         {
             "status": ScenarioStatus.PROCESSING.value,
@@ -225,7 +247,7 @@ def dispatch_enrichment_batches(
         if not all_builds:
             logger.warning(f"{corr_prefix} No builds to process")
             # No builds - mark as PROCESSED (user can still generate empty dataset)
-            scenario_repo.update_one(
+            scenario_repo.update_by_id(
                 scenario_id,
                 {
                     "status": ScenarioStatus.PROCESSED.value,
@@ -238,9 +260,8 @@ def dispatch_enrichment_batches(
         # Get raw build run data for outcome determination and temporal ordering
         raw_build_run_ids = [b.raw_build_run_id for b in all_builds]
         raw_build_runs = {
-            str(r.id): r
-            for r in [raw_build_run_repo.find_by_id(rid) for rid in raw_build_run_ids]
-            if r is not None
+            str(rid): r
+            for rid, r in raw_build_run_repo.find_map_by_ids(raw_build_run_ids).items()
         }
 
         # Sort by build creation time (oldest first) for temporal features
@@ -253,8 +274,8 @@ def dispatch_enrichment_batches(
             or datetime.utcnow()
         )
 
-        # Create EnrichmentBuild records
-        enrichment_build_ids = []
+        # Create EnrichmentBuild records in one bulk insert
+        enrichment_build_data = []
         for build in all_builds:
             raw_run = raw_build_runs.get(str(build.raw_build_run_id))
 
@@ -264,18 +285,23 @@ def dispatch_enrichment_batches(
             else:
                 outcome = 1 if "failure" in str(build.status).lower() else 0
 
-            eb = enrichment_build_repo.upsert_for_ingestion_build(
-                scenario_id=scenario_id,
-                ingestion_build_id=str(build.id),
-                raw_repo_id=str(build.raw_repo_id),
-                raw_build_run_id=str(build.raw_build_run_id),
-                ci_run_id=build.ci_run_id,
-                commit_sha=build.commit_sha,
-                repo_full_name=build.repo_full_name,
-                outcome=outcome,
-                build_started_at=raw_run.run_started_at if raw_run else None,
+            enrichment_build_data.append(
+                {
+                    "ingestion_build_id": build.id,
+                    "raw_repo_id": build.raw_repo_id,
+                    "raw_build_run_id": build.raw_build_run_id,
+                    "ci_run_id": build.ci_run_id,
+                    "commit_sha": build.commit_sha,
+                    "repo_full_name": build.repo_full_name,
+                    "outcome": outcome,
+                    "build_started_at": raw_run.run_started_at if raw_run else None,
+                }
             )
-            enrichment_build_ids.append(str(eb.id))
+        created_ids = enrichment_build_repo.bulk_create_from_ingestion_builds(
+            scenario_id, enrichment_build_data
+        )
+        # Keep the temporal order for the processing chain
+        enrichment_build_ids = [str(created_ids[str(build.id)]) for build in all_builds]
 
         logger.info(
             f"{corr_prefix} Created {len(enrichment_build_ids)} enrichment builds"
@@ -344,7 +370,7 @@ def dispatch_enrichment_batches(
     except Exception as e:
         error_msg = str(e)
         logger.error(f"{corr_prefix} Error: {error_msg}")
-        scenario_repo.update_one(
+        scenario_repo.update_by_id(
             scenario_id,
             {
                 "status": ScenarioStatus.FAILED.value,
@@ -420,7 +446,7 @@ def handle_processing_chain_error(
 
     if completed_count > 0:
         # Some builds completed - mark as PROCESSED (user triggers split manually)
-        scenario_repo.update_one(
+        scenario_repo.update_by_id(
             scenario_id,
             {
                 "status": ScenarioStatus.PROCESSED.value,
@@ -439,7 +465,7 @@ def handle_processing_chain_error(
         check_and_notify_enrichment_completed(self.db, scenario_id)
     else:
         # No builds completed - mark as FAILED and notify
-        scenario_repo.update_one(
+        scenario_repo.update_by_id(
             scenario_id,
             {
                 "status": ScenarioStatus.FAILED.value,
@@ -570,7 +596,7 @@ def process_single_enrichment(
             )
 
         # Increment processed count
-        scenario_repo.increment_counter(scenario_id, "builds_features_extracted")
+        _get_progress_counters(self.db).add(scenario_id, "builds_features_extracted")
 
         logger.info(
             f"{corr_prefix} [process_single] {enrichment_build_id}: "
@@ -591,7 +617,7 @@ def process_single_enrichment(
             ExtractionStatus.FAILED,
             error_message=error_msg,
         )
-        scenario_repo.increment_counter(scenario_id, "builds_failed")
+        _get_progress_counters(self.db).add(scenario_id, "builds_failed")
         raise
 
 
@@ -621,6 +647,10 @@ def finalize_scenario_processing(
     scenario_repo = TrainingScenarioRepository(self.db)
     enrichment_build_repo = TrainingEnrichmentBuildRepository(self.db)
 
+    # Apply this process's queued progress deltas while the scenario is still
+    # PROCESSING, so they aren't dropped by a flush after the status change
+    _flush_progress_counters()
+
     # Get stats
     stats = enrichment_build_repo.aggregate_stats_by_scenario(scenario_id)
     completed = stats.get("completed", 0)
@@ -629,7 +659,7 @@ def finalize_scenario_processing(
     total = completed + partial + failed
 
     # Update scenario - mark as PROCESSED (user triggers split manually)
-    scenario_repo.update_one(
+    scenario_repo.update_by_id(
         scenario_id,
         {
             "status": ScenarioStatus.PROCESSED.value,
@@ -668,6 +698,7 @@ def finalize_scenario_processing(
         "builds_features_extracted": completed + partial,
         "builds_failed": failed,
         "total": total,
+        "split_counts": stats.get("splits", {}),
         "next_step": "User can now generate dataset via 'Generate Dataset' button",
     }
 
@@ -708,18 +739,21 @@ def reprocess_failed_builds(
     if not failed_builds:
         return {"status": "no_failed_builds", "message": "No failed builds to retry"}
 
-    # Reset FAILED builds to PENDING
-    reset_count = 0
-    for build in failed_builds:
-        enrichment_build_repo.update_one(
-            str(build.id),
-            {
+    # Reset FAILED builds to PENDING (one round-trip for the whole set)
+    reset_result = enrichment_build_repo.collection.update_many(
+        {
+            "_id": {"$in": [build.id for build in failed_builds]},
+            "extraction_status": ExtractionStatus.FAILED.value,
+        },
+        {
+            "$set": {
                 "extraction_status": ExtractionStatus.PENDING.value,
                 "extraction_error": None,
                 "feature_vector_id": None,
-            },
-        )
-        reset_count += 1
+            }
+        },
+    )
+    reset_count = reset_result.modified_count
 
     # Get selected features from scenario
     feature_config = scenario.feature_config
@@ -812,7 +846,7 @@ def generate_scenario_dataset(
         }
 
     # Update status to SPLITTING
-    scenario_repo.update_one(
+    scenario_repo.update_by_id(
         scenario_id,
         {
             "status": ScenarioStatus.SPLITTING.value,
@@ -836,7 +870,7 @@ def generate_scenario_dataset(
 
         if not enrichment_builds:
             logger.warning(f"{corr_prefix} No completed builds to split")
-            scenario_repo.update_one(
+            scenario_repo.update_by_id(
                 scenario_id,
                 {
                     "status": ScenarioStatus.FAILED.value,
@@ -849,9 +883,7 @@ def generate_scenario_dataset(
         raw_repo_repo = RawRepositoryRepository(self.db)
         raw_repo_ids = list({str(eb.raw_repo_id) for eb in enrichment_builds})
         raw_repos = {
-            str(r.id): r
-            for r in [raw_repo_repo.find_by_id(rid) for rid in raw_repo_ids]
-            if r is not None
+            str(rid): r for rid, r in raw_repo_repo.find_map_by_ids(raw_repo_ids).items()
         }
 
         df = _build_split_dataframe(enrichment_builds, raw_repos, self.db)
@@ -945,7 +977,7 @@ def generate_scenario_dataset(
                 split_stats[split_type][fmt] = file_size
 
         # Update scenario - COMPLETED
-        scenario_repo.update_one(
+        scenario_repo.update_by_id(
             scenario_id,
             {
                 "status": ScenarioStatus.COMPLETED.value,
@@ -998,7 +1030,7 @@ def generate_scenario_dataset(
     except Exception as e:
         error_msg = str(e)
         logger.error(f"{corr_prefix} [split] Error: {error_msg}")
-        scenario_repo.update_one(
+        scenario_repo.update_by_id(
             scenario_id,
             {
                 "status": ScenarioStatus.FAILED.value,
@@ -1111,7 +1143,7 @@ def dispatch_scenario_scans(
 
     if not commits_to_scan:
         logger.info(f"{corr_prefix} No commits to scan")
-        scenario_repo.update_one(
+        scenario_repo.update_by_id(
             scenario_id, {"scans_total": 0, "scan_extraction_completed": True}
         )
         return {"status": "skipped", "reason": "No commits found"}
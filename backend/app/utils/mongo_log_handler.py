@@ -9,7 +9,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional
 
-from pymongo import MongoClient
+from pymongo import WriteConcern
 from pymongo.collection import Collection
 
 from app.config import settings
@@ -28,7 +28,6 @@ class MongoDBLogHandler(logging.Handler):
         collection_name: str = "system_logs",
     ):
         super().__init__(level)
-        self._client: Optional[MongoClient] = None
         self._collection: Optional[Collection] = None
         self.collection_name = collection_name
 
@@ -37,9 +36,14 @@ class MongoDBLogHandler(logging.Handler):
         """Lazy connection to MongoDB."""
         if self._collection is None:
             try:
-                self._client = MongoClient(settings.MONGODB_URI)
-                db = self._client[settings.MONGODB_DB_NAME]
-                self._collection = db[self.collection_name]
+                # Share the process-wide pool instead of opening a second one
+                from app.database.mongo import get_client
+
+                db = get_client()[settings.MONGODB_DB_NAME]
+                # Log lines are best-effort: ack from the primary only, no journal wait
+                self._collection = db.get_collection(
+                    self.collection_name, write_concern=WriteConcern(w=1, j=False)
+                )
 
                 # Create index on timestamp for efficient queries
                 self._collection.create_index(
@@ -64,6 +68,8 @@ class MongoDBLogHandler(logging.Handler):
                 "timestamp": datetime.now(timezone.utc),
                 "level": record.levelname,
                 "source": record.name,
+                # Indexed filter key for SystemLogRepository
+                "source_lc": record.name.lower(),
                 "message": self.format(record),
                 "correlation_id": correlation_id,
                 "details": {
@@ -158,9 +164,8 @@ class MongoDBLogHandler(logging.Handler):
             pass
 
     def close(self):
-        """Close MongoDB connection."""
-        if self._client:
-            self._client.close()
+        """Release the collection; the shared client is owned by app.database.mongo."""
+        self._collection = None
         super().close()
 
 
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+One-off backfill of raw_build_runs.created_at for build runs upserted before it was persisted.
+
+get_latest_run, list_by_repo and its keyset cursor all sort on created_at, so
+documents without it sort last and come back with a made-up timestamp. Uses the
+provider's run_created_at, falling back to the ObjectId's generation time. Safe
+to re-run: it only touches documents that still lack the field.
+
+Usage:
+    uv run python scripts/backfill_build_run_created_at.py
+"""
+
+import sys
+
+from pymongo import MongoClient
+
+# Add parent directory to path for imports
+sys.path.insert(0, ".")
+
+from app.config import settings
+
+
+def get_db():
+    """Get MongoDB database connection."""
+    client = MongoClient(settings.MONGODB_URI)
+    return client[settings.MONGODB_DB_NAME]
+
+
+def main():
+    db = get_db()
+    result = db.raw_build_runs.update_many(
+        {"created_at": None},  # missing or null
+        [{"$set": {"created_at": {"$ifNull": ["$run_created_at", {"$toDate": "$_id"}]}}}],
+    )
+    print(f"✅ Backfilled created_at on {result.modified_count} build runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+One-off backfill of raw_build_runs.sha_any for build runs written before the field existed.
+
+RawBuildRunRepository.find_by_commit_or_effective_sha matches on sha_any only,
+so older documents are invisible to it until this has run once. Safe to re-run:
+it only touches documents that still lack the field.
+
+Usage:
+    uv run python scripts/backfill_sha_any.py
+"""
+
+import sys
+
+from pymongo import MongoClient
+
+# Add parent directory to path for imports
+sys.path.insert(0, ".")
+
+from app.config import settings
+from app.repositories.raw_build_run import SHA_ANY_STAGE
+
+
+def get_db():
+    """Get MongoDB database connection."""
+    client = MongoClient(settings.MONGODB_URI)
+    return client[settings.MONGODB_DB_NAME]
+
+
+def main():
+    db = get_db()
+    result = db.raw_build_runs.update_many(
+        {"sha_any": {"$exists": False}},
+        [SHA_ANY_STAGE],
+    )
+    print(f"✅ Backfilled sha_any on {result.modified_count} build runs")
+
+
+if __name__ == "__main__":
+    main()
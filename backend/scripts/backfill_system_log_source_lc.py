@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+One-off backfill of system_logs.source_lc for log entries written before the field existed.
+
+SystemLogRepository filters by source with an anchored prefix match on source_lc,
+so older entries never match a source filter until this has run once. Safe to
+re-run: it only touches documents that still lack the field.
+
+Usage:
+    uv run python scripts/backfill_system_log_source_lc.py
+"""
+
+import sys
+
+from pymongo import MongoClient
+
+# Add parent directory to path for imports
+sys.path.insert(0, ".")
+
+from app.config import settings
+
+
+def get_db():
+    """Get MongoDB database connection."""
+    client = MongoClient(settings.MONGODB_URI)
+    return client[settings.MONGODB_DB_NAME]
+
+
+def main():
+    db = get_db()
+    result = db.system_logs.update_many(
+        {"source_lc": {"$exists": False}},
+        [{"$set": {"source_lc": {"$toLower": "$source"}}}],
+    )
+    print(f"✅ Backfilled source_lc on {result.modified_count} system logs")
+
+
+if __name__ == "__main__":
+    main()